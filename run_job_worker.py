@@ -0,0 +1,64 @@
+"""
+Run a job-queue worker node, or submit videos to the job queue.
+
+Usage:
+    python run_job_worker.py --resource-class cpu            # render-heavy node (steps 10/40/60/70)
+    python run_job_worker.py --resource-class api            # API-bound node (steps 20/30/50)
+    python run_job_worker.py --steps step_50_00_generate_audio --concurrency 8
+    python run_job_worker.py --submit <video_id> [<video_id> ...] [--pipeline render_plan]
+
+SIGINT/SIGTERM stop leasing; running steps get WORKER_SHUTDOWN_TIMEOUT seconds to finish
+and are handed back to the queue otherwise.
+"""
+
+import argparse
+import asyncio
+import signal
+
+from src.db.job_queue import JobQueue, PIPELINE_DEPENDENCIES
+from src.db.mongo_utils import get_mongodb, close_mongodb
+from src.pipeline.job_worker import JobWorker, steps_for_resource_class
+
+
+async def submit(video_ids: list, pipeline: str) -> None:
+    """Queue the runnable steps of each video"""
+    mongodb = await get_mongodb()
+    try:
+        queue = JobQueue(mongodb.db)
+        for video_id in video_ids:
+            queued = await queue.enqueue_ready_steps(video_id, pipeline)
+            print(f"[INFO] Video {video_id}: queued {queued or 'nothing'}")
+    finally:
+        await close_mongodb()
+
+
+async def work(step_names: list, concurrency: int) -> None:
+    worker = JobWorker(step_names, concurrency=concurrency)
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, worker.request_shutdown)
+
+    await worker.run()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Job-queue worker node")
+    parser.add_argument("--resource-class", choices=["cpu", "api"], help="Run the steps of a resource class")
+    parser.add_argument("--steps", help="Comma-separated step names to run")
+    parser.add_argument("--concurrency", type=int, help="Jobs to run at once (default: JOB_WORKER_CONCURRENCY)")
+    parser.add_argument("--submit", nargs="+", metavar="VIDEO_ID", help="Queue videos instead of working")
+    parser.add_argument("--pipeline", default="default", choices=sorted(PIPELINE_DEPENDENCIES),
+                        help="Dependency table of submitted videos")
+    args = parser.parse_args()
+
+    if args.submit:
+        asyncio.run(submit(args.submit, args.pipeline))
+    else:
+        if args.steps:
+            step_names = [step_name.strip() for step_name in args.steps.split(",") if step_name.strip()]
+        elif args.resource_class:
+            step_names = steps_for_resource_class(args.resource_class)
+        else:
+            parser.error("pass --resource-class, --steps or --submit")
+        asyncio.run(work(step_names, args.concurrency))
@@ -1,11 +1,21 @@
 import asyncio
 from src.orchestrator import process_submitted_video
+from src.common.services.media_executor import get_media_executor
+from src.common.services.transcription_job_manager import close_transcription_job_manager
+from src.db.mongo_utils import close_mongodb
 
 
 async def process(video_id: str):
     print(f"Processing video ID: {video_id}")
-    await process_submitted_video(video_id)
+    try:
+        await process_submitted_video(video_id)
+    finally:
+        await close_transcription_job_manager()
+        await close_mongodb()
 
 
 if __name__ == "__main__":
-    asyncio.run(process("67430d2d5ed8d665005a5361"))
+    try:
+        asyncio.run(process("67430d2d5ed8d665005a5361"))
+    finally:
+        get_media_executor().shutdown()
@@ -0,0 +1,40 @@
+"""
+Re-render a video after some of its scenes were edited.
+
+Usage:
+    python run_refresh.py <video_id>              # regenerate what the edits made stale
+    python run_refresh.py <video_id> --dry-run    # only list the stale clips, narrations and voiceovers
+
+Only the scenes whose narration or timing changed get a new narration, clip and voiceover;
+the output is then re-assembled from the per-scene voiceovers by stream copy.
+"""
+
+import argparse
+import asyncio
+import sys
+
+from src.pipeline.refresh import refresh_video
+from src.common.services.media_executor import MediaExecutor
+from src.common.services.transcription_job_manager import close_transcription_job_manager
+from src.db.mongo_utils import close_mongodb
+
+
+async def main(args: argparse.Namespace) -> int:
+    try:
+        stale = await refresh_video(args.video_id, dry_run=args.dry_run)
+    finally:
+        await close_transcription_job_manager()
+        await close_mongodb()
+    return 0 if stale is not None else 1
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-render the edited scenes of a video")
+    parser.add_argument("video_id", help="Video ID to refresh")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what is stale")
+    args = parser.parse_args()
+
+    try:
+        sys.exit(asyncio.run(main(args)))
+    finally:
+        MediaExecutor().shutdown()
@@ -0,0 +1,29 @@
+"""
+Run the change-stream watcher that advances job-queue pipelines.
+
+Usage:
+    python run_watcher.py
+
+Inserted videos are submitted to the job queue and completed steps queue their successors
+right away; the steps themselves are run by run_job_worker.py nodes. SIGINT/SIGTERM stop
+the watcher after the changes seen so far are dispatched and their resume tokens stored.
+"""
+
+import asyncio
+import signal
+
+from src.pipeline.watcher import PipelineWatcher
+
+
+async def main() -> None:
+    watcher = PipelineWatcher()
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, watcher.request_shutdown)
+
+    await watcher.run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+"""
+Run a long-lived worker that processes many videos concurrently.
+
+Usage:
+    python run_worker.py <video_id> [<video_id> ...]
+    python run_worker.py --stdin < video_ids.txt
+
+With --stdin, one video ID is read per line until end of input, so IDs can be piped in
+while the worker is running. SIGINT/SIGTERM stop intake and shut the worker down gracefully.
+"""
+
+import argparse
+import asyncio
+import signal
+import sys
+import threading
+
+from src.pipeline.worker import PipelineWorker
+
+
+def _feed_stdin(loop: asyncio.AbstractEventLoop, video_ids: asyncio.Queue) -> None:
+    """Queue one video ID per stdin line, then the end-of-input marker"""
+    try:
+        for line in sys.stdin:
+            if line.strip():
+                loop.call_soon_threadsafe(video_ids.put_nowait, line.strip())
+        loop.call_soon_threadsafe(video_ids.put_nowait, None)
+    except RuntimeError:
+        # The worker shut down and closed its loop while a line was being read
+        pass
+
+
+async def main(args: argparse.Namespace) -> int:
+    worker = PipelineWorker(max_videos=args.max_videos,
+                            cpu_slots=args.cpu_slots,
+                            api_slots=args.api_slots,
+                            streaming=args.streaming,
+                            render_plan=args.render_plan)
+
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, worker.request_shutdown)
+
+    video_ids = asyncio.Queue()
+    if args.stdin:
+        # A daemon thread, because a blocked stdin read cannot be cancelled and would keep a
+        # shutting-down worker alive until the next line (an executor thread is joined on exit)
+        threading.Thread(target=_feed_stdin, args=(loop, video_ids), name="stdin-feeder", daemon=True).start()
+    else:
+        for video_id in args.video_ids:
+            video_ids.put_nowait(video_id)
+        video_ids.put_nowait(None)
+
+    results = await worker.run(video_ids)
+
+    failed = [video_id for video_id, succeeded in results.items() if not succeeded]
+    print(f"[INFO] Processed {len(results)} videos, {len(failed)} failed")
+    for video_id in failed:
+        print(f"[WARNING] Pipeline failed for video {video_id}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process many videos concurrently")
+    parser.add_argument("video_ids", nargs="*", help="Video IDs to process")
+    parser.add_argument("--stdin", action="store_true", help="Read video IDs from stdin, one per line")
+    parser.add_argument("--max-videos", type=int, help="Pipelines to run at once (default: WORKER_MAX_VIDEOS)")
+    parser.add_argument("--cpu-slots", type=int, help="Concurrent media steps (default: WORKER_CPU_SLOTS)")
+    parser.add_argument("--api-slots", type=int, help="Concurrent API steps (default: WORKER_API_SLOTS)")
+    parser.add_argument("--streaming", action="store_true", help="Use the per-scene streaming mode")
+    parser.add_argument("--render-plan", action="store_true", help="Use the single-pass render mode")
+    args = parser.parse_args()
+
+    if not args.video_ids and not args.stdin:
+        parser.error("pass video IDs or --stdin")
+
+    sys.exit(asyncio.run(main(args)))
@@ -1,10 +1,15 @@
 from functools import wraps
-from datetime import datetime
+from datetime import datetime, timedelta
+import asyncio
+import inspect
+import os
 import pytz
 import traceback
-from typing import Optional, Dict, Any
+import uuid
+from typing import Optional, Dict, Any, List
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
+from pymongo import ReturnDocument
 
 
 class StepInProgressError(Exception):
@@ -17,23 +22,116 @@ class StepDependencyError(Exception):
     pass
 
 
+class StepLeaseLostError(Exception):
+    """Custom exception for a step whose claim expired and was taken over while it ran"""
+    pass
+
+
+# Fields returned by a successful claim; steps accepting `video_record` reuse them
+CLAIM_PROJECTION = {"steps_status": 1, "files": 1, "metadata": 1}
+
+
 class StepTracker:
     def __init__(self, db: AsyncIOMotorDatabase):
         self.db = db
         self.ist_timezone = pytz.timezone("Asia/Kolkata")
+        # A claim is renewed every third of this while its step runs; a claim not renewed
+        # in time belongs to a crashed or killed run and may be taken over
+        self.lease_seconds = float(os.getenv('STEP_LEASE_SECONDS', 120))
 
     async def _get_video_status(self, video_id: str) -> Optional[Dict[str, Any]]:
         """Fetch video processing status from database"""
-        return await self.db.videos.find_one({"_id": ObjectId(video_id)})
+        return await self.db.videos.find_one({"_id": ObjectId(video_id)}, {"steps_status": 1})
+
+    @staticmethod
+    def _get_dependencies(step_name: str) -> List[str]:
+        """Get the steps that must be completed before the given step can run"""
+        from ..static import STEP_DEPENDENCIES, STREAMING_STEP_DEPENDENCIES, RENDER_PLAN_STEP_DEPENDENCIES
 
-    async def _check_step_in_progress(self, video_id: str, step_name: str) -> None:
-        """Check if step is already in progress or completed"""
+        for dependencies in (STEP_DEPENDENCIES, STREAMING_STEP_DEPENDENCIES, RENDER_PLAN_STEP_DEPENDENCIES):
+            if step_name in dependencies:
+                return dependencies[step_name]
+        return []
+
+    def _not_running_filter(self, step_name: str, now: datetime) -> Dict[str, Any]:
+        """Filter matching videos where the step is not held by a live claim"""
+        return {
+            "$or": [
+                {f"steps_status.{step_name}_inProgress": {"$ne": True}},
+                {f"step_leases.{step_name}.expires_at": {"$lte": now}},
+                # Claims made before leases were recorded expire relative to their start time
+                {f"step_leases.{step_name}": {"$exists": False},
+                 f"timestamps.{step_name}_start_time": {"$lte": now - timedelta(seconds=self.lease_seconds)}},
+            ]
+        }
+
+    async def _claim_step(self, video_id: str, step_name: str, claim_id: str) -> Dict[str, Any]:
+        """
+        Atomically validate dependencies and mark the step as in progress.
+
+        A single conditional find_one_and_update matches the video only if the step is not
+        completed, is not held by a live claim and all dependencies are completed, so two
+        workers can never claim the same step. A claim whose lease expired (its run crashed
+        or was killed) is taken over. Only on failure is the document read again to explain why.
+
+        Args:
+            claim_id (str): Identifies this run as the owner of the claim's lease
+
+        Returns:
+            Dict[str, Any]: The claimed video document, projected to CLAIM_PROJECTION
+        """
+        now = datetime.now(self.ist_timezone)
+        claim_filter = {
+            "_id": ObjectId(video_id),
+            f"steps_status.{step_name}_completed": {"$ne": True},
+            **self._not_running_filter(step_name, now)
+        }
+        for dep_step in self._get_dependencies(step_name):
+            claim_filter[f"steps_status.{dep_step}_completed"] = True
+
+        video_record = await self.db.videos.find_one_and_update(
+            claim_filter,
+            {
+                "$set": {
+                    f"steps_status.{step_name}_inProgress": True,
+                    f"step_leases.{step_name}": {
+                        "owner": claim_id,
+                        "expires_at": now + timedelta(seconds=self.lease_seconds)
+                    },
+                    f"timestamps.{step_name}_start_time": now
+                },
+                "$unset": {
+                    f"steps_status.{step_name}_completed": "",
+                    f"steps_status.{step_name}_error": ""
+                }
+            },
+            projection=CLAIM_PROJECTION,
+            return_document=ReturnDocument.AFTER
+        )
+
+        if video_record is None:
+            await self._raise_claim_error(video_id, step_name)
+
+        return video_record
+
+    async def _raise_claim_error(self, video_id: str, step_name: str) -> None:
+        """Explain why a claim did not match"""
         video_status = await self._get_video_status(video_id)
-        if video_status:
-            steps_status = video_status.get("steps_status", {})
-            if steps_status.get(f"{step_name}_inProgress") or steps_status.get(f"{step_name}_completed"):
-                raise StepInProgressError(
-                    f"Step '{step_name}' is already in progress or completed for video {video_id}")
+        if not video_status:
+            raise StepDependencyError(f"No video found with id {video_id}")
+
+        steps_status = video_status.get("steps_status", {})
+        if steps_status.get(f"{step_name}_inProgress") or steps_status.get(f"{step_name}_completed"):
+            raise StepInProgressError(
+                f"Step '{step_name}' is already in progress or completed for video {video_id}")
+
+        for dep_step in self._get_dependencies(step_name):
+            if not steps_status.get(f"{dep_step}_completed"):
+                raise StepDependencyError(
+                    f"Dependency '{dep_step}' not completed for step '{step_name}'")
+
+        # The status changed between the claim and this read; treat it as a lost race
+        raise StepInProgressError(f"Step '{step_name}' could not be claimed for video {video_id}")
 
     async def _log_error(self, video_id: str, step_name: str, error_logs: str) -> None:
         """Log error to pipeline_errors collection"""
@@ -50,8 +148,9 @@ class StepTracker:
         step_name: str,
         status: Dict[str, bool],
         timestamp_key: str,
-        unset_status: Optional[Dict[str, bool]] = {},
-        execution_time: Optional[float] = None
+        unset_status: Optional[Dict[str, bool]] = None,
+        execution_time: Optional[float] = None,
+        clear_lease: bool = False
     ):
         """Update step status in database"""
         set_dict = {
@@ -67,8 +166,10 @@ class StepTracker:
 
         # Unset status flags
         unset_dict = {}
-        for unset_key, unset_value in unset_status.items():
+        for unset_key, unset_value in (unset_status or {}).items():
             unset_dict[f"steps_status.{unset_key}"] = unset_value
+        if clear_lease:
+            unset_dict[f"step_leases.{step_name}"] = ""
 
         update_dict = {
             "$set": set_dict
@@ -77,60 +178,144 @@ class StepTracker:
         if unset_dict:
             update_dict["$unset"] = unset_dict
 
-        if unset_dict:
-            await self.db.videos.update_one(
-                {"_id": ObjectId(video_id)},
-                update_dict,
-                upsert=True
-            )
-        # # Remove in_progress flag if step is completed
-        # if f"{step_name}_completed" in status and status[f"{step_name}_completed"]:
-        #     await self.db.videos.update_one(
-        #         {"_id": ObjectId(video_id)},
-        #         {
-        #             "$set": update_dict,
-        #             "$unset": {f"steps_status.{step_name}_inProgress": "", f"steps_status.{step_name}_error": ""}
-        #         },
-        #         upsert=True
-        #     )
-        # else:
-        #     await self.db.videos.update_one(
-        #         {"_id": ObjectId(video_id)},
-        #         {"$set": update_dict},
-        #         upsert=True
-        #     )
-
-    async def _validate_dependencies(self, video_id: str, step_name: str) -> None:
-        """Validate step dependencies before execution"""
-        from ..static import STEP_DEPENDENCIES
-
-        if step_name in STEP_DEPENDENCIES:
-            video_status = await self._get_video_status(video_id)
-            if not video_status:
+        # No upsert: a status write must never create a video document (e.g. for a mistyped
+        # video_id), which the watcher would then pick up as a new submission
+        await self.db.videos.update_one(
+            {"_id": ObjectId(video_id)},
+            update_dict
+        )
+
+    async def _renew_lease(self, video_id: str, step_name: str, claim_id: str) -> bool:
+        """Extend the lease of a claim; False if the claim was taken over"""
+        result = await self.db.videos.update_one(
+            {"_id": ObjectId(video_id), f"step_leases.{step_name}.owner": claim_id},
+            {"$set": {f"step_leases.{step_name}.expires_at":
+                      datetime.now(self.ist_timezone) + timedelta(seconds=self.lease_seconds)}}
+        )
+        return result.matched_count == 1
+
+    async def _run_with_lease(self, video_id: str, step_name: str, claim_id: str, coroutine) -> Any:
+        """
+        Run a claimed step while renewing its lease.
+
+        Raises:
+            StepLeaseLostError: If the lease expired and another run took over the claim;
+                the step is cancelled since the other run is now doing its work
+        """
+        step_task = asyncio.ensure_future(coroutine)
+        lease_lost = False
+
+        async def keep_lease():
+            nonlocal lease_lost
+            while True:
+                await asyncio.sleep(self.lease_seconds / 3)
+                try:
+                    renewed = await self._renew_lease(video_id, step_name, claim_id)
+                except Exception as e:
+                    # Keep trying; the lease only lapses if renewals fail for its whole duration
+                    print(f"[WARNING] Could not renew the lease of {step_name} for video {video_id}: {str(e)}")
+                    continue
+                if not renewed:
+                    lease_lost = True
+                    step_task.cancel()
+                    return
+
+        lease_keeper = asyncio.create_task(keep_lease())
+        try:
+            return await step_task
+        except asyncio.CancelledError:
+            if lease_lost:
+                raise StepLeaseLostError(
+                    f"Claim of step '{step_name}' expired and was taken over for video {video_id}")
+            raise
+        finally:
+            lease_keeper.cancel()
+
+    async def release_claim(self, video_id: str, step_name: str, claim_id: Optional[str] = None) -> None:
+        """
+        Clear the in-progress flag and lease of a step that is no longer running.
+
+        Args:
+            claim_id (Optional[str]): Only release the claim if this run still owns it
+        """
+        claim_filter = {"_id": ObjectId(video_id)}
+        if claim_id is not None:
+            claim_filter[f"step_leases.{step_name}.owner"] = claim_id
+        await self.db.videos.update_one(
+            claim_filter,
+            {"$unset": {f"steps_status.{step_name}_inProgress": "", f"step_leases.{step_name}": ""}}
+        )
+
+    async def is_step_completed(self, video_id: str, step_name: str) -> bool:
+        """Check whether a step is recorded as completed for a video"""
+        video_status = await self._get_video_status(video_id)
+        return bool((video_status or {}).get("steps_status", {}).get(f"{step_name}_completed"))
+
+    async def reset_steps(self, video_id: str, step_names: List[str]) -> None:
+        """
+        Mark steps as not completed so the next run of the video does them again, e.g. to
+        apply scene edits. Steps keep their per-scene checkpoints, so only stale work is redone.
+
+        Raises:
+            StepInProgressError: If any of the steps is currently running
+        """
+        now = datetime.now(self.ist_timezone)
+        unset_dict = {}
+        for step_name in step_names:
+            unset_dict[f"steps_status.{step_name}_completed"] = ""
+            unset_dict[f"steps_status.{step_name}_error"] = ""
+
+        result = await self.db.videos.update_one(
+            {"_id": ObjectId(video_id),
+             "$and": [self._not_running_filter(step_name, now) for step_name in step_names]},
+            {"$unset": unset_dict}
+        )
+        if result.matched_count == 0:
+            if not await self._get_video_status(video_id):
                 raise StepDependencyError(f"No video found with id {video_id}")
+            raise StepInProgressError(f"Steps {step_names} cannot be reset while running for video {video_id}")
 
-            for dep_step in STEP_DEPENDENCIES[step_name]:
-                if not video_status.get("steps_status", {}).get(f"{dep_step}_completed"):
-                    raise StepDependencyError(
-                        f"Dependency '{dep_step}' not completed for step '{
-                            step_name}'"
-                    )
+    async def mark_steps_completed(self, video_id: str, step_names: List[str]) -> None:
+        """Record steps whose work was done by another step (e.g. the streaming step) as completed"""
+        for step_name in step_names:
+            await self._update_step_status(
+                video_id,
+                step_name,
+                {f"{step_name}_completed": True},
+                f"{step_name}_end_time",
+                {f"{step_name}_inProgress": "", f"{step_name}_error": ""},
+                clear_lease=True
+            )
 
 
 def track_step(func):
     """
-    Decorator to track execution of video processing steps
+    Decorator to track execution of video processing steps.
+
+    Steps that declare a `video_record` parameter receive the document returned by the claim
+    (projected to CLAIM_PROJECTION) instead of fetching the video again.
+
+    The claim holds a lease that is renewed while the step runs (STEP_LEASE_SECONDS), so the
+    in-progress flag of a run that crashed or was killed expires and a re-run can take over.
+    A cancelled step releases its claim right away.
     """
+    accepts_video_record = "video_record" in inspect.signature(func).parameters
+
     @wraps(func)
     async def wrapper(video_id: str, db: AsyncIOMotorDatabase, *args, **kwargs):
         step_name = func.__name__
         tracker = StepTracker(db)
 
-        # Check if step is already in progress
+        # Claim the step: dependency check and in-progress flag in one round trip
+        start_time = datetime.now(tracker.ist_timezone)
+        claim_id = uuid.uuid4().hex
         try:
-            await tracker._check_step_in_progress(video_id, step_name)
-            await tracker._validate_dependencies(video_id, step_name)
-        except (StepInProgressError, StepDependencyError) as e:
+            video_record = await tracker._claim_step(video_id, step_name, claim_id)
+        except StepInProgressError as e:
+            # Leave the status alone, it belongs to whoever holds or completed the step
+            await tracker._log_error(video_id, step_name, str(e))
+            raise
+        except StepDependencyError as e:
             await tracker._log_error(video_id, step_name, str(e))
             await tracker._update_step_status(
                 video_id,
@@ -140,19 +325,13 @@ def track_step(func):
             )
             raise
 
-        # Set in-progress flag
-        start_time = datetime.now(tracker.ist_timezone)
-        await tracker._update_step_status(
-            video_id,
-            step_name,
-            {f"{step_name}_inProgress": True},
-            f"{step_name}_start_time",
-            {f"{step_name}_completed": "", f"{step_name}_error": ""}
-        )
+        if accepts_video_record:
+            kwargs.setdefault("video_record", video_record)
 
         try:
-            # Execute the step
-            result = await func(video_id=video_id, db=db, *args, **kwargs)
+            # Execute the step, renewing the claim's lease while it runs
+            result = await tracker._run_with_lease(
+                video_id, step_name, claim_id, func(video_id=video_id, db=db, *args, **kwargs))
 
             # Record successful completion
             end_time = datetime.now(tracker.ist_timezone)
@@ -164,11 +343,19 @@ def track_step(func):
                 {f"{step_name}_completed": True},
                 f"{step_name}_end_time",
                 {f"{step_name}_inProgress": ""},
-                execution_time=execution_time
+                execution_time=execution_time,
+                clear_lease=True
             )
 
             return result
 
+        except StepLeaseLostError as e:
+            # Leave the status alone, it belongs to the run that took over
+            await tracker._log_error(video_id, step_name, str(e))
+            raise
+        except asyncio.CancelledError:
+            await tracker.release_claim(video_id, step_name, claim_id)
+            raise
         except Exception as e:
             # Record error and log to pipeline_errors
             error_time = datetime.now(tracker.ist_timezone)
@@ -181,7 +368,8 @@ def track_step(func):
                 {f"{step_name}_completed": False, f"{step_name}_error": True},
                 f"{step_name}_error_time",
                 {f"{step_name}_inProgress": ""},
-                execution_time=(error_time - start_time).total_seconds()
+                execution_time=(error_time - start_time).total_seconds(),
+                clear_lease=True
             )
             raise
 
@@ -9,8 +9,42 @@ from typing import Dict, Any
 import google.generativeai as genai
 from dotenv import load_dotenv
 
+DEFAULT_MODEL = "gemini-1.5-flash"
+
+DEFAULT_GENERATION_CONFIG = {
+    "temperature": 1,
+    "top_p": 0.95,
+    "top_k": 64,
+    "max_output_tokens": 100000,
+    "response_mime_type": "application/json",
+}
+
+def _build_model(model: str, generation_config: Dict[str, Any]) -> genai.GenerativeModel:
+    """
+    Configure the Gemini client and build a model instance.
+
+    Raises:
+        ValueError: If API key is not provided
+    """
+    load_dotenv()
+    api_key = os.getenv('GEMINI_API_KEY')
+
+    if not api_key:
+        raise ValueError("Gemini API key not found in environment variables")
+    
+    genai.configure(api_key=api_key)
+    
+    # Set default values for generation_config if not provided
+    if not generation_config:
+        generation_config = DEFAULT_GENERATION_CONFIG
+
+    return genai.GenerativeModel(
+        model_name=model,
+        generation_config=generation_config,
+    )
+
 def generate_content(prompt: str, 
-                     model: str = "gemini-1.5-flash", 
+                     model: str = DEFAULT_MODEL, 
                      generation_config: Dict[str, Any] = None) -> str:
     """
     Generate content using Gemini AI model.
@@ -27,29 +61,32 @@ def generate_content(prompt: str,
         ValueError: If API key is not provided
         RuntimeError: If content generation fails
     """
-    load_dotenv()
-    api_key = os.getenv('GEMINI_API_KEY')
-
-    if not api_key:
-        raise ValueError("Gemini API key not found in environment variables")
-    
-    genai.configure(api_key=api_key)
-    
-    # Set default values for generation_config if not provided
-    if not generation_config:
-        generation_config = {
-            "temperature": 1,
-            "top_p": 0.95,
-            "top_k": 64,
-            "max_output_tokens": 100000,
-            "response_mime_type": "application/json",
-        }
+    gemini_model = _build_model(model, generation_config)
 
     print("Generating content using Gemini AI model...")
 
-    model = genai.GenerativeModel(
-        model_name=model,
-        generation_config=generation_config,
-    )
+    return gemini_model.generate_content(prompt)
+
+async def generate_content_async(prompt: str,
+                                 model: str = DEFAULT_MODEL,
+                                 generation_config: Dict[str, Any] = None) -> str:
+    """
+    Generate content using Gemini AI model without blocking the event loop.
+    
+    Args:
+        prompt (str): Input prompt for content generation
+        model (str): Model name to use for content generation
+        generation_config (Dict[str, Any]): Configuration for content generation
+        
+    Returns:
+        str: Generated content response
+        
+    Raises:
+        ValueError: If API key is not provided
+        RuntimeError: If content generation fails
+    """
+    gemini_model = _build_model(model, generation_config)
+
+    print("Generating content using Gemini AI model (async)...")
 
-    return model.generate_content(prompt)
+    return await gemini_model.generate_content_async(prompt)
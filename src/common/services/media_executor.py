@@ -0,0 +1,149 @@
+"""
+Service module for running blocking media operations off the asyncio event loop.
+Provides a managed process pool and awaitable wrappers around the media_manager functions.
+
+The pool size is bounded by MEDIA_WORKERS (default: number of CPUs) and every worker
+process is recycled after MEDIA_MAX_TASKS_PER_CHILD tasks (default: 20), so memory
+leaked by moviepy/ffmpeg readers does not accumulate over a long run.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+from . import media_manager
+
+
+class MediaExecutor:
+    _instance: Optional['MediaExecutor'] = None
+    _executor: Optional[ProcessPoolExecutor] = None
+    _max_workers: Optional[int] = None
+    _max_tasks_per_child: Optional[int] = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(MediaExecutor, cls).__new__(cls)
+        return cls._instance
+
+    def initialize(self,
+                   max_workers: Optional[int] = None,
+                   max_tasks_per_child: Optional[int] = None) -> None:
+        """Initialize the worker process pool"""
+        if self._executor is None:
+            load_dotenv()
+
+            self._max_workers = max_workers or int(
+                os.getenv('MEDIA_WORKERS', os.cpu_count() or 1))
+            self._max_tasks_per_child = max_tasks_per_child or int(
+                os.getenv('MEDIA_MAX_TASKS_PER_CHILD', 20))
+
+            if self._max_workers < 1:
+                raise ValueError("MEDIA_WORKERS must be at least 1")
+
+            # Worker recycling is not supported with the "fork" start method
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=self._max_tasks_per_child
+            )
+            print(f"[INFO] Media executor started with {self._max_workers} workers")
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a picklable function in the process pool and await its result.
+
+        Cancelling the awaiting task cancels the job if it has not started yet;
+        a job that is already running in a worker is left to finish.
+        """
+        if self._executor is None:
+            self.initialize()
+
+        future = self._executor.submit(partial(func, *args, **kwargs))
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self, cancel_pending: bool = True) -> None:
+        """Shut down the worker pool, optionally cancelling queued jobs"""
+        if self._executor:
+            self._executor.shutdown(wait=True, cancel_futures=cancel_pending)
+            self._executor = None
+
+    @property
+    def max_workers(self) -> int:
+        """Get the configured number of worker processes"""
+        if self._executor is None:
+            self.initialize()
+        return self._max_workers
+
+
+def get_media_executor() -> MediaExecutor:
+    """Get media executor instance"""
+    media_executor = MediaExecutor()
+    if media_executor._executor is None:
+        media_executor.initialize()
+    return media_executor
+
+
+async def extract_video_metadata_async(video_file: str) -> Dict[str, Optional[float]]:
+    """Awaitable wrapper for media_manager.extract_video_metadata"""
+    return await get_media_executor().run(media_manager.extract_video_metadata, video_file)
+
+
+async def generate_audio_from_video_async(video_file: str, audio_path: Path, mode: str = 'speech') -> Path:
+    """Awaitable wrapper for media_manager.generate_audio_from_video"""
+    return await get_media_executor().run(media_manager.generate_audio_from_video, video_file, audio_path, mode)
+
+
+async def preprocess_media_async(video_file: str,
+                                 audio_path: Path,
+                                 mode: str = 'speech') -> Tuple[Dict[str, Optional[float]], Path]:
+    """Awaitable wrapper for media_manager.preprocess_media"""
+    return await get_media_executor().run(media_manager.preprocess_media, video_file, audio_path, mode)
+
+
+async def trim_video_async(video_file: str,
+                           time_start: float,
+                           time_end: float,
+                           output_filepath: str,
+                           keyframe_index: Optional[Dict] = None) -> None:
+    """Awaitable wrapper for media_manager.trim_video"""
+    return await get_media_executor().run(
+        media_manager.trim_video, video_file, time_start, time_end, output_filepath, keyframe_index)
+
+
+async def build_keyframe_index_async(video_file: str) -> Dict:
+    """Awaitable wrapper for media_manager.build_keyframe_index"""
+    return await get_media_executor().run(media_manager.build_keyframe_index, video_file)
+
+
+async def add_audio_to_video_async(video_path: str, audio_path: str, output_path: str) -> None:
+    """Awaitable wrapper for media_manager.add_audio_to_video"""
+    return await get_media_executor().run(media_manager.add_audio_to_video, video_path, audio_path, output_path)
+
+
+async def concatenate_video_clips_async(video_clips: List[str], output_path: str) -> None:
+    """Awaitable wrapper for media_manager.concatenate_video_clips"""
+    return await get_media_executor().run(media_manager.concatenate_video_clips, video_clips, output_path)
+
+
+async def detect_silences_async(audio_file: str,
+                                noise_threshold_db: float = -35.0,
+                                min_silence_seconds: float = 0.5) -> List[Tuple[float, float]]:
+    """Awaitable wrapper for media_manager.detect_silences"""
+    return await get_media_executor().run(
+        media_manager.detect_silences, audio_file, noise_threshold_db, min_silence_seconds)
+
+
+async def split_audio_async(audio_file: str, split_points: List[float], output_dir: Path) -> List[Tuple[str, float]]:
+    """Awaitable wrapper for media_manager.split_audio"""
+    return await get_media_executor().run(media_manager.split_audio, audio_file, split_points, output_dir)
+
+
+async def render_scenes_async(video_file: str, scenes: List[Dict], output_path: str, fps: float) -> None:
+    """Awaitable wrapper for media_manager.render_scenes"""
+    return await get_media_executor().run(media_manager.render_scenes, video_file, scenes, output_path, fps)
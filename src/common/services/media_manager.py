@@ -1,36 +1,305 @@
+import bisect
+import json
+import os
+import re
+import subprocess
+import tempfile
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple
 
+from moviepy.config import get_setting
 from moviepy.editor import VideoFileClip, AudioFileClip, CompositeVideoClip
 from moviepy.editor import concatenate_videoclips
 from moviepy.video.io.ffmpeg_tools import ffmpeg_extract_subclip
 
+from .render_planner import SceneRender, build_filtergraph, scene_video_filters
+
+FFMPEG_BINARY = get_setting("FFMPEG_BINARY")
+
+def _default_ffprobe_binary() -> str:
+    """Use the ffprobe next to moviepy's ffmpeg if there is one, else ffprobe from PATH"""
+    ffmpeg_path = Path(FFMPEG_BINARY)
+    if ffmpeg_path.name.startswith('ffmpeg'):
+        sibling = ffmpeg_path.with_name(ffmpeg_path.name.replace('ffmpeg', 'ffprobe', 1))
+        if sibling.exists():
+            return str(sibling)
+    return 'ffprobe'
+
+
+FFPROBE_BINARY = os.getenv('FFPROBE_BINARY') or _default_ffprobe_binary()
+
+# Audio codecs that can be stream-copied for transcription, with their container suffix
+AUDIO_COPY_SUFFIXES = {'aac': '.m4a', 'mp3': '.mp3', 'opus': '.opus', 'flac': '.flac'}
+
+
+def probe_media(media_file: str) -> dict:
+    """
+    Read container and stream information with a single ffprobe call.
+
+    :param media_file: Path to the media file
+    :return: Parsed ffprobe JSON with "format" and "streams" entries
+    """
+    command = [FFPROBE_BINARY, '-v', 'error', '-show_format', '-show_streams', '-of', 'json', media_file]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        raise ValueError(f"Failed to probe media file: {e.stderr[-500:]}") from e
+    return json.loads(result.stdout)
+
+
+def _parse_frame_rate(rate: Optional[str]) -> Optional[float]:
+    """Convert an ffprobe rational such as "30000/1001" to a float"""
+    if not rate:
+        return None
+    numerator, _, denominator = rate.partition('/')
+    try:
+        value = float(numerator) / float(denominator or 1)
+    except (ValueError, ZeroDivisionError):
+        return None
+    return value or None
+
+
+def _first_stream(probe: dict, codec_type: str) -> Optional[dict]:
+    return next((stream for stream in probe.get('streams', []) if stream.get('codec_type') == codec_type), None)
+
+
+def _metadata_from_probe(probe: dict) -> Dict[str, Optional[float]]:
+    """Build the metadata dict (same fields as moviepy reports) from ffprobe output"""
+    video_stream = _first_stream(probe, 'video')
+    audio_stream = _first_stream(probe, 'audio')
+    if video_stream is None:
+        raise ValueError("File has no video stream")
+
+    duration = probe.get('format', {}).get('duration') or video_stream.get('duration')
+    size = [video_stream.get('width'), video_stream.get('height')]
+
+    # Like moviepy, report the displayed size of rotated (e.g. portrait phone) recordings
+    rotation = video_stream.get('tags', {}).get('rotate')
+    for side_data in video_stream.get('side_data_list', []):
+        rotation = side_data.get('rotation', rotation)
+    if rotation is not None and abs(int(float(rotation))) in (90, 270):
+        size.reverse()
+
+    return {
+        'duration': float(duration) if duration else None,
+        'fps': _parse_frame_rate(video_stream.get('avg_frame_rate')) or
+               _parse_frame_rate(video_stream.get('r_frame_rate')),
+        'size': size,
+        'audio_fps': int(audio_stream['sample_rate']) if audio_stream and audio_stream.get('sample_rate') else None,
+        'audio_nchannels': audio_stream.get('channels') if audio_stream else None
+    }
+
+
+def _extract_video_metadata_moviepy(video_file: str) -> Dict[str, Optional[float]]:
+    """Fallback for environments without ffprobe: read metadata through moviepy"""
+    with VideoFileClip(video_file) as video:
+        return {
+            'duration': video.duration,
+            'fps': video.fps,
+            'size': video.size,
+            'audio_fps': video.audio.fps if video.audio else None,
+            'audio_nchannels': video.audio.nchannels if video.audio else None
+        }
+
+
 def extract_video_metadata(video_file: str) -> Dict[str, Optional[float]]:
     """Extract basic metadata from the video file."""
     try:
-        with VideoFileClip(video_file) as video:
-            return {
-                'duration': video.duration,
-                'fps': video.fps,
-                'size': video.size,
-                'audio_fps': video.audio.fps if video.audio else None,
-                'audio_nchannels': video.audio.nchannels if video.audio else None
-            }
+        try:
+            return _metadata_from_probe(probe_media(video_file))
+        except FileNotFoundError:
+            print(f"[WARNING] {FFPROBE_BINARY} not found, reading metadata through moviepy")
+            return _extract_video_metadata_moviepy(video_file)
     except Exception as e:
         raise ValueError(f"Failed to extract video metadata: {str(e)}") from e
 
 
-def generate_audio_from_video(video_file: str, audio_path: Path) -> None:
-    """Generate audio from the given video file and save it."""
+def generate_audio_from_video(video_file: str,
+                              audio_path: Path,
+                              mode: str = 'speech',
+                              audio_codec: Optional[str] = None) -> Path:
+    """
+    Generate audio from the given video file and save it in a single ffmpeg pass.
+
+    :param video_file: Path to the video file
+    :param audio_path: Path to save the audio; in "copy" mode the suffix is replaced
+        to match the source codec's container
+    :param mode: "speech" encodes a mono 16 kHz, 48 kbit/s MP3, which is all transcription
+        needs and keeps the upload small; "copy" stream-copies the source audio track
+        when its codec is in AUDIO_COPY_SUFFIXES and falls back to "speech" otherwise
+    :param audio_codec: Codec name of the source audio track, if already probed
+    :return: Path of the written audio file
+    """
+    audio_path = Path(audio_path)
+    command = [FFMPEG_BINARY, '-y', '-hide_banner', '-loglevel', 'error',
+               '-i', video_file, '-vn', '-map', '0:a:0']
+
+    if mode == 'copy' and audio_codec in AUDIO_COPY_SUFFIXES:
+        audio_path = audio_path.with_suffix(AUDIO_COPY_SUFFIXES[audio_codec])
+        command += ['-c:a', 'copy']
+    else:
+        audio_path = audio_path.with_suffix('.mp3')
+        command += ['-ac', '1', '-ar', '16000', '-c:a', 'libmp3lame', '-b:a', '48k']
+
     try:
-        with VideoFileClip(video_file) as video:
-            if video.audio is None:
-                raise ValueError("Video has no audio track")
-            video.audio.write_audiofile(str(audio_path))
-    except Exception as e:
-        raise ValueError(f"Failed to generate audio: {str(e)}") from e
-    
-def trim_video(video_file: str, time_start: float, time_end: float, output_filepath: str) -> None:
+        subprocess.run(command + [str(audio_path)], capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        if 'matches no streams' in e.stderr:
+            raise ValueError("Failed to generate audio: Video has no audio track") from e
+        raise ValueError(f"Failed to generate audio: {e.stderr[-500:]}") from e
+    return audio_path
+
+
+def preprocess_media(video_file: str, audio_path: Path, mode: str = 'speech') -> Tuple[Dict[str, Optional[float]], Path]:
+    """
+    Extract metadata and audio with one ffprobe call and one ffmpeg pass.
+
+    :param video_file: Path to the video file
+    :param audio_path: Path to save the audio (see generate_audio_from_video)
+    :param mode: Audio extraction mode, "speech" or "copy"
+    :return: (metadata, path of the written audio file)
+    """
+    try:
+        probe = probe_media(video_file)
+    except FileNotFoundError:
+        print(f"[WARNING] {FFPROBE_BINARY} not found, reading metadata through moviepy")
+        try:
+            metadata = _extract_video_metadata_moviepy(video_file)
+        except Exception as e:
+            raise ValueError(f"Failed to extract video metadata: {str(e)}") from e
+        return metadata, generate_audio_from_video(video_file, audio_path, mode)
+
+    metadata = _metadata_from_probe(probe)
+    audio_stream = _first_stream(probe, 'audio')
+    if audio_stream is None:
+        raise ValueError("Failed to generate audio: Video has no audio track")
+    return metadata, generate_audio_from_video(video_file, audio_path, mode, audio_stream.get('codec_name'))
+
+def build_keyframe_index(video_file: str) -> Dict:
+    """
+    Index the keyframes of a video's first video stream from its packet headers.
+
+    Only packet flags are read, nothing is decoded, so indexing takes seconds even for
+    long recordings. The index is meant to be stored with the video record and reused.
+
+    :param video_file: Path to the video file
+    :return: {"video_codec", "profile", "pix_fmt", "has_audio", "keyframes": sorted keyframe times in seconds}
+    """
+    probe = probe_media(video_file)
+    video_stream = _first_stream(probe, 'video')
+    if video_stream is None:
+        raise ValueError("File has no video stream")
+
+    command = [FFPROBE_BINARY, '-v', 'error', '-select_streams', 'v:0',
+               '-show_entries', 'packet=pts_time,flags', '-of', 'csv=p=0', video_file]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        raise ValueError(f"Failed to index keyframes: {e.stderr[-500:]}") from e
+
+    keyframes = set()
+    for line in result.stdout.splitlines():
+        pts_time, _, flags = line.partition(',')
+        if 'K' in flags and pts_time not in ('', 'N/A'):
+            keyframes.add(round(float(pts_time), 6))
+
+    return {
+        'video_codec': video_stream.get('codec_name'),
+        'profile': video_stream.get('profile'),
+        'pix_fmt': video_stream.get('pix_fmt'),
+        'has_audio': _first_stream(probe, 'audio') is not None,
+        'keyframes': sorted(keyframes)
+    }
+
+
+def _run_ffmpeg(command: List[str], error_message: str) -> None:
+    try:
+        subprocess.run([FFMPEG_BINARY, '-y', '-hide_banner', '-loglevel', 'error'] + command,
+                       capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        raise ValueError(f"{error_message}: {e.stderr[-500:]}") from e
+
+
+def smart_cut(video_file: str,
+              time_start: float,
+              time_end: float,
+              output_filepath: str,
+              keyframe_index: Dict) -> None:
+    """
+    Cut a frame-accurate clip, stream-copying every whole GOP inside the range and
+    re-encoding only the partial GOPs at its boundaries.
+
+    The video is assembled from up to three MPEG-TS parts (re-encoded head, copied middle,
+    re-encoded tail), which carry their parameter sets in-band so the re-encoded and copied
+    parts can be joined. The audio of the range is re-encoded separately and muxed in.
+    Ranges without a whole GOP, and sources that are not H.264, are re-encoded entirely.
+
+    :param video_file: Path to the original video file
+    :param time_start: Start time of the clip in seconds
+    :param time_end: End time of the clip in seconds
+    :param output_filepath: Path to save the generated video clip
+    :param keyframe_index: Index built by build_keyframe_index
+    """
+    keyframes = keyframe_index.get('keyframes', [])
+    first_keyframe = bisect.bisect_left(keyframes, time_start - 1e-6)
+    last_keyframe = bisect.bisect_right(keyframes, time_end + 1e-6) - 1
+    encode_args = ['-c:v', 'libx264', '-pix_fmt', keyframe_index.get('pix_fmt') or 'yuv420p']
+    if keyframe_index.get('profile') in X264_PROFILES:
+        encode_args += ['-profile:v', X264_PROFILES[keyframe_index['profile']]]
+
+    if keyframe_index.get('video_codec') != 'h264' or first_keyframe >= last_keyframe:
+        # No whole GOP to copy: re-encode the range with accurate input seeking
+        _run_ffmpeg(['-ss', f"{time_start:.6f}", '-i', video_file, '-t', f"{time_end - time_start:.6f}",
+                     '-map', '0:v:0', '-map', '0:a:0?'] + encode_args + ['-c:a', 'aac', output_filepath],
+                    "Failed to extract video clip")
+        return
+
+    copy_start = keyframes[first_keyframe]
+    copy_end = keyframes[last_keyframe]
+
+    with tempfile.TemporaryDirectory(prefix="smart_cut_") as work_dir:
+        parts = []
+        if copy_start - time_start > 1e-3:
+            parts.append(os.path.join(work_dir, "head.ts"))
+            _run_ffmpeg(['-ss', f"{time_start:.6f}", '-i', video_file, '-t', f"{copy_start - time_start:.6f}",
+                         '-map', '0:v:0'] + encode_args + ['-f', 'mpegts', parts[-1]],
+                        "Failed to encode clip head")
+
+        parts.append(os.path.join(work_dir, "middle.ts"))
+        _run_ffmpeg(['-ss', f"{copy_start:.6f}", '-i', video_file, '-t', f"{copy_end - copy_start:.6f}",
+                     '-map', '0:v:0', '-c:v', 'copy', '-bsf:v', 'h264_mp4toannexb', '-f', 'mpegts', parts[-1]],
+                    "Failed to copy clip GOPs")
+
+        if time_end - copy_end > 1e-3:
+            parts.append(os.path.join(work_dir, "tail.ts"))
+            _run_ffmpeg(['-ss', f"{copy_end:.6f}", '-i', video_file, '-t', f"{time_end - copy_end:.6f}",
+                         '-map', '0:v:0'] + encode_args + ['-f', 'mpegts', parts[-1]],
+                        "Failed to encode clip tail")
+
+        list_path = os.path.join(work_dir, "parts.txt")
+        with open(list_path, 'w') as list_file:
+            for part in parts:
+                list_file.write(f"file '{part}'\n")
+
+        audio_path = os.path.join(work_dir, "audio.m4a")
+        has_audio = keyframe_index.get('has_audio', True)
+        if has_audio:
+            _run_ffmpeg(['-ss', f"{time_start:.6f}", '-i', video_file, '-t', f"{time_end - time_start:.6f}",
+                         '-map', '0:a:0', '-c:a', 'aac', audio_path],
+                        "Failed to extract clip audio")
+
+        command = ['-f', 'concat', '-safe', '0', '-i', list_path]
+        if has_audio:
+            command += ['-i', audio_path, '-map', '0:v:0', '-map', '1:a:0']
+        _run_ffmpeg(command + ['-c', 'copy', '-movflags', '+faststart', output_filepath],
+                    "Failed to join clip parts")
+
+
+def trim_video(video_file: str,
+               time_start: float,
+               time_end: float,
+               output_filepath: str,
+               keyframe_index: Optional[Dict] = None) -> None:
     """
     Generate a video clip from the given video file and save it.
     
@@ -38,17 +307,64 @@ def trim_video(video_file: str, time_start: float, time_end: float, output_filep
     :param time_start: Start time of the clip in seconds
     :param time_end: End time of the clip in seconds
     :param output_filepath: Path to save the generated video clip
+    :param keyframe_index: Keyframe index of the video; if given, the clip is cut
+        frame-accurately with smart_cut instead of at the nearest keyframes
     :return: Path to the generated video clip
     """
     try:
+        if keyframe_index:
+            smart_cut(video_file, time_start, time_end, output_filepath, keyframe_index)
+            return
+
         # Generate the video clip
         ffmpeg_extract_subclip(video_file, time_start, time_end, targetname=output_filepath)
     except Exception as e:
         raise ValueError(f"Failed to extract video clip: {str(e)}") from e
     
-def add_audio_to_video(video_path, audio_path, output_path):
+def add_audio_to_video(video_path, audio_path, output_path, renderer=None):
     """
     Add audio to a video clip and save the result to a new file.
+
+    If the audio is longer, the first frame of the video is held for the difference;
+    if the video is longer, it is sped up to the audio length.
+
+    :param video_path: Path to the original video file
+    :param audio_path: Path to the audio file
+    :param output_path: Path to save the video with audio
+    :param renderer: "ffmpeg" (filter-based, default) or "moviepy"; defaults to VOICEOVER_RENDERER
+    """
+    renderer = renderer or os.getenv('VOICEOVER_RENDERER', 'ffmpeg')
+    if renderer == 'moviepy':
+        return _add_audio_to_video_moviepy(video_path, audio_path, output_path)
+    if renderer != 'ffmpeg':
+        raise ValueError(f"Unknown voiceover renderer: {renderer}")
+
+    try:
+        video_metadata = _metadata_from_probe(probe_media(video_path))
+    except FileNotFoundError:
+        print(f"[WARNING] {FFPROBE_BINARY} not found, adding voiceover through moviepy")
+        return _add_audio_to_video_moviepy(video_path, audio_path, output_path)
+
+    # Same fitting as the single-pass renderer: tpad holds the first frame, setpts speeds up
+    render = SceneRender(0.0, video_metadata['duration'], audio_path, get_media_duration(audio_path))
+    video_filters = scene_video_filters(render) + [f"fps={video_metadata['fps'] or 30:.9g}", "format=yuv420p"]
+
+    command = [
+        FFMPEG_BINARY, '-y', '-hide_banner', '-loglevel', 'error',
+        '-i', video_path, '-i', audio_path,
+        '-filter_complex', f"[0:v]{','.join(video_filters)}[v]",
+        '-map', '[v]', '-map', '1:a:0',
+        '-c:v', 'libx264', '-c:a', 'aac', output_path
+    ]
+    try:
+        subprocess.run(command, capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        raise ValueError(f"Failed to add audio to video: {e.stderr[-500:]}") from e
+
+
+def _add_audio_to_video_moviepy(video_path, audio_path, output_path):
+    """
+    Add audio to a video clip through moviepy frame compositing (the original renderer).
     
     :param video_path: Path to the original video file
     :param audio_path: Path to the audio file
@@ -80,9 +396,107 @@ def add_audio_to_video(video_path, audio_path, output_path):
     audio.close()
     video_with_audio.close()
 
+# Codecs the concat fast path re-encodes non-conforming clips to
+CONCAT_VIDEO_CODEC = 'h264'
+CONCAT_AUDIO_CODEC = 'aac'
+
+# ffprobe H.264 profile names mapped to libx264 -profile:v values
+X264_PROFILES = {'Constrained Baseline': 'baseline', 'Baseline': 'baseline', 'Main': 'main',
+                 'High': 'high', 'High 10': 'high10', 'High 4:2:2': 'high422',
+                 'High 4:4:4 Predictive': 'high444'}
+
+
+def _concat_signature(probe: dict) -> Optional[Tuple]:
+    """Stream parameters that must match for clips to be joined by stream copy"""
+    video_stream = _first_stream(probe, 'video')
+    audio_stream = _first_stream(probe, 'audio')
+    if video_stream is None or audio_stream is None:
+        return None
+    return (
+        video_stream.get('codec_name'), video_stream.get('profile'), video_stream.get('pix_fmt'),
+        video_stream.get('width'), video_stream.get('height'),
+        video_stream.get('r_frame_rate'), video_stream.get('time_base'),
+        audio_stream.get('codec_name'), audio_stream.get('sample_rate'), audio_stream.get('channels')
+    )
+
+
+def _conform_clip(video_clip: str, probe: dict, reference: Tuple, output_path: str) -> None:
+    """Re-encode a clip to the stream parameters of the reference signature"""
+    _, profile, pix_fmt, width, height, frame_rate, time_base, _, sample_rate, channels = reference
+    command = [FFMPEG_BINARY, '-y', '-hide_banner', '-loglevel', 'error', '-i', video_clip]
+    if _first_stream(probe, 'audio') is None:
+        # Give silent clips a silent track so every segment has the same streams
+        command += ['-f', 'lavfi', '-i', f"anullsrc=r={sample_rate}:cl={'mono' if channels == 1 else 'stereo'}",
+                    '-shortest']
+    command += [
+        '-map', '0:v:0', '-map', '0:a:0' if _first_stream(probe, 'audio') else '1:a:0',
+        '-vf', f"scale={width}:{height},fps={frame_rate},format={pix_fmt}",
+        '-video_track_timescale', str(time_base).split('/')[-1],
+        '-c:v', 'libx264', '-c:a', 'aac', '-ar', str(sample_rate), '-ac', str(channels)
+    ]
+    if profile in X264_PROFILES:
+        command += ['-profile:v', X264_PROFILES[profile]]
+    command.append(output_path)
+    try:
+        subprocess.run(command, capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        raise ValueError(f"Failed to conform clip {video_clip}: {e.stderr[-500:]}") from e
+
+
 def concatenate_video_clips(video_clips: List[str], output_path: str) -> None:
     """
     Concatenate multiple video clips into a single video file.
+
+    Clips are probed with ffprobe; those sharing the most common codec, resolution, frame
+    rate and audio format are joined with the ffmpeg concat demuxer by stream copy, so
+    assembly time barely depends on video length. Only clips that do not conform are
+    re-encoded to match first. Without ffprobe, or if the common format cannot be joined
+    losslessly, all clips are re-encoded through moviepy.
+
+    :param video_clips: List of video clips to concatenate
+    :param output_path: Path to save the concatenated video
+    """
+    try:
+        probes = [probe_media(clip) for clip in video_clips]
+    except FileNotFoundError:
+        print(f"[WARNING] {FFPROBE_BINARY} not found, concatenating clips through moviepy")
+        return _concatenate_video_clips_moviepy(video_clips, output_path)
+
+    signatures = [_concat_signature(probe) for probe in probes]
+    candidates = [signature for signature in signatures if signature is not None]
+    reference = max(set(candidates), key=candidates.count) if candidates else None
+    if reference is None or reference[0] != CONCAT_VIDEO_CODEC or reference[7] != CONCAT_AUDIO_CODEC:
+        print("[WARNING] Clips cannot be joined by stream copy, re-encoding through moviepy")
+        return _concatenate_video_clips_moviepy(video_clips, output_path)
+
+    with tempfile.TemporaryDirectory(prefix="concat_") as work_dir:
+        segments = []
+        for index, (clip, probe, signature) in enumerate(zip(video_clips, probes, signatures)):
+            if signature != reference:
+                print(f"[INFO] Re-encoding non-conforming clip {clip}")
+                conformed_clip = os.path.join(work_dir, f"conformed_{index:04d}.mp4")
+                _conform_clip(clip, probe, reference, conformed_clip)
+                clip = conformed_clip
+            segments.append(os.path.abspath(clip))
+
+        list_path = os.path.join(work_dir, "clips.txt")
+        with open(list_path, 'w') as list_file:
+            for segment in segments:
+                escaped = segment.replace("'", "'\\''")
+                list_file.write(f"file '{escaped}'\n")
+
+        command = [FFMPEG_BINARY, '-y', '-hide_banner', '-loglevel', 'error',
+                   '-f', 'concat', '-safe', '0', '-i', list_path,
+                   '-c', 'copy', '-movflags', '+faststart', output_path]
+        try:
+            subprocess.run(command, capture_output=True, text=True, check=True)
+        except subprocess.CalledProcessError as e:
+            raise ValueError(f"Failed to concatenate video clips: {e.stderr[-500:]}") from e
+
+
+def _concatenate_video_clips_moviepy(video_clips: List[str], output_path: str) -> None:
+    """
+    Concatenate multiple video clips by decoding and re-encoding them all through moviepy.
     
     :param video_clips: List of video clips to concatenate
     :param output_path: Path to save the concatenated video
@@ -100,3 +514,108 @@ def concatenate_video_clips(video_clips: List[str], output_path: str) -> None:
     composite_video.close()
     for clip in clips:
         clip.close()
+
+def detect_silences(audio_file: str,
+                    noise_threshold_db: float = -35.0,
+                    min_silence_seconds: float = 0.5) -> List[Tuple[float, float]]:
+    """
+    Detect silent intervals in an audio file with ffmpeg's silencedetect filter.
+
+    :param audio_file: Path to the audio file
+    :param noise_threshold_db: Level below which audio counts as silence
+    :param min_silence_seconds: Minimum length of a silent interval
+    :return: List of (silence_start, silence_end) tuples in seconds
+    """
+    command = [
+        FFMPEG_BINARY, '-hide_banner', '-nostats', '-i', audio_file,
+        '-af', f'silencedetect=noise={noise_threshold_db}dB:d={min_silence_seconds}',
+        '-f', 'null', '-'
+    ]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        raise ValueError(f"Failed to detect silences: {e.stderr[-500:]}") from e
+
+    starts = [float(value) for value in re.findall(r'silence_start: (-?[\d.]+)', result.stderr)]
+    ends = [float(value) for value in re.findall(r'silence_end: (-?[\d.]+)', result.stderr)]
+    return list(zip(starts, ends))
+
+
+def split_audio(audio_file: str, split_points: List[float], output_dir: Path) -> List[Tuple[str, float]]:
+    """
+    Split an audio file at the given timestamps without re-encoding.
+
+    :param audio_file: Path to the audio file
+    :param split_points: Ascending timestamps in seconds at which to cut
+    :param output_dir: Directory for the segment files
+    :return: List of (segment_path, segment_offset_seconds) tuples
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    suffix = Path(audio_file).suffix
+    boundaries = [0.0] + list(split_points) + [None]
+
+    segments = []
+    for index, (start, end) in enumerate(zip(boundaries[:-1], boundaries[1:])):
+        segment_path = str(output_dir / f"segment_{index:03d}{suffix}")
+        command = [FFMPEG_BINARY, '-y', '-hide_banner', '-loglevel', 'error', '-ss', str(start), '-i', audio_file]
+        if end is not None:
+            command += ['-t', str(end - start)]
+        command += ['-c', 'copy', segment_path]
+        try:
+            subprocess.run(command, capture_output=True, text=True, check=True)
+        except subprocess.CalledProcessError as e:
+            raise ValueError(f"Failed to split audio: {e.stderr[-500:]}") from e
+        segments.append((segment_path, start))
+
+    return segments
+
+
+def get_media_duration(media_file: str) -> float:
+    """
+    Get the duration of a media file in seconds.
+
+    :param media_file: Path to the media file
+    :return: Duration in seconds
+    """
+    try:
+        duration = probe_media(media_file).get('format', {}).get('duration')
+        if duration is None:
+            raise ValueError(f"No duration reported for {media_file}")
+        return float(duration)
+    except FileNotFoundError:
+        with AudioFileClip(media_file) as clip:
+            return clip.duration
+
+
+def render_scenes(video_file: str, scenes: List[Dict], output_path: str, fps: float) -> None:
+    """
+    Render scenes with their narration straight from the source video in a single encode.
+
+    :param video_file: Path to the source video file
+    :param scenes: Scenes in output order with time_start, time_end and audio_file_path
+    :param output_path: Path to save the rendered video
+    :param fps: Frame rate of the output video
+    """
+    renders = [
+        SceneRender(scene['time_start'], scene['time_end'], scene['audio_file_path'],
+                    get_media_duration(scene['audio_file_path']))
+        for scene in scenes
+    ]
+
+    # Scene lists can make the graph too long for a command line, so pass it as a script
+    with tempfile.NamedTemporaryFile('w', suffix='.filtergraph', delete=False) as script:
+        script.write(build_filtergraph(renders, fps))
+
+    command = [FFMPEG_BINARY, '-y', '-hide_banner', '-loglevel', 'error', '-i', video_file]
+    for render in renders:
+        command += ['-i', render.audio_file]
+    command += ['-filter_complex_script', script.name, '-map', '[outv]', '-map', '[outa]',
+                '-c:v', 'libx264', '-c:a', 'aac', output_path]
+
+    try:
+        subprocess.run(command, capture_output=True, text=True, check=True)
+    except subprocess.CalledProcessError as e:
+        raise ValueError(f"Failed to render scenes: {e.stderr[-500:]}") from e
+    finally:
+        os.remove(script.name)
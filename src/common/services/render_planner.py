@@ -0,0 +1,74 @@
+"""
+Service module for planning single-pass scene renders.
+Turns an ordered scene list into one ffmpeg filtergraph that cuts every scene from the
+source video, fits it to its narration and concatenates the result, so the final video
+is produced in a single encode without intermediate clip files.
+
+Each scene is fitted the same way media_manager.add_audio_to_video fits a clip:
+    - narration longer than the clip: the first frame is held for the difference
+    - narration shorter than the clip: the clip is sped up to the narration length
+"""
+
+from dataclasses import dataclass
+from typing import List
+
+
+@dataclass
+class SceneRender:
+    time_start: float
+    time_end: float
+    audio_file: str
+    audio_duration: float
+
+    @property
+    def clip_duration(self) -> float:
+        return self.time_end - self.time_start
+
+
+def scene_video_filters(scene: SceneRender) -> List[str]:
+    """Build the video filter chain that cuts a scene and fits it to its narration"""
+    filters = [f"trim=start={scene.time_start:.6f}:end={scene.time_end:.6f}", "setpts=PTS-STARTPTS"]
+
+    if scene.audio_duration > scene.clip_duration:
+        # Hold the first frame until the remaining clip lines up with the narration end
+        filters.append(f"tpad=start_mode=clone:start_duration={scene.audio_duration - scene.clip_duration:.6f}")
+    elif scene.audio_duration < scene.clip_duration:
+        filters.append(f"setpts=PTS*{scene.audio_duration / scene.clip_duration:.6f}")
+
+    return filters
+
+
+def build_filtergraph(scenes: List[SceneRender], fps: float) -> str:
+    """
+    Build the filtergraph for rendering scenes from input 0 (the source video) with the
+    narration of scene k as input k + 1.
+
+    The source is decoded once and split into one branch per scene; every branch is
+    normalized to the source frame rate so the concat filter sees uniform segments.
+
+    Args:
+        scenes (List[SceneRender]): Scenes in output order
+        fps (float): Frame rate of the output
+
+    Returns:
+        str: Filtergraph with the outputs labelled [outv] and [outa]
+    """
+    if not scenes:
+        raise ValueError("Cannot build a render plan without scenes")
+    for index, scene in enumerate(scenes):
+        if scene.clip_duration <= 0 or scene.audio_duration <= 0:
+            raise ValueError(f"Scene {index} has an empty clip or narration")
+
+    branches = "".join(f"[src{index}]" for index in range(len(scenes)))
+    chains = [f"[0:v]split={len(scenes)}{branches}"]
+
+    for index, scene in enumerate(scenes):
+        video_filters = scene_video_filters(scene) + [f"fps={fps:.9g}", "format=yuv420p"]
+        chains.append(f"[src{index}]{','.join(video_filters)}[v{index}]")
+        chains.append(f"[{index + 1}:a]aresample=44100,"
+                      f"aformat=sample_fmts=fltp:channel_layouts=stereo,"
+                      f"asetpts=PTS-STARTPTS[a{index}]")
+
+    segments = "".join(f"[v{index}][a{index}]" for index in range(len(scenes)))
+    chains.append(f"{segments}concat=n={len(scenes)}:v=1:a=1[outv][outa]")
+    return ";\n".join(chains)
@@ -0,0 +1,278 @@
+"""
+Service module for tracking Rev AI transcription jobs without blocking the event loop.
+
+All outstanding jobs share a single poller task. Each job is polled with exponential
+backoff plus jitter, so short jobs finish promptly while long jobs and many concurrent
+videos cost only a handful of status requests. When REV_CALLBACK_URL is set, a small
+local HTTP receiver accepts Rev AI's job-completion callbacks and wakes the waiting
+coroutine immediately; polling then only acts as a fallback for lost callbacks.
+
+Configuration (environment variables):
+    REV_BASE_URL: Override the Rev AI API base URL (e.g. a local fake Rev endpoint)
+    REV_POLL_INITIAL_SECONDS: Delay before the first status check of a job (default: 2)
+    REV_POLL_MAX_SECONDS: Upper bound of the backoff between status checks (default: 30)
+    REV_POLL_MAX_ERRORS: Consecutive failed status checks before a job is failed (default: 5)
+    REV_CALLBACK_URL: Public URL Rev AI should call when a job finishes; enables the receiver
+    REV_CALLBACK_HOST: Interface the callback receiver binds to (default: 0.0.0.0)
+    REV_CALLBACK_PORT: Port the callback receiver listens on (default: 8091)
+"""
+
+import asyncio
+import json
+import os
+import random
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from dotenv import load_dotenv
+
+from rev_ai import apiclient
+from rev_ai.models import JobStatus
+
+from ..utils.http_utils import read_request, build_response
+
+
+def _get_client() -> apiclient.RevAiAPIClient:
+    """
+    Build a Rev AI client, pointed at REV_BASE_URL if set (e.g. a local fake Rev endpoint).
+
+    Raises:
+        ValueError: If Rev AI token is missing
+    """
+    # Load environment variables
+    load_dotenv()
+
+    # Get Rev AI access token
+    rev_access_token = os.getenv('REV_ACCESS_TOKEN')
+    if not rev_access_token:
+        raise ValueError("REV_ACCESS_TOKEN not found in environment variables")
+
+    # Initialize Rev AI client
+    client = apiclient.RevAiAPIClient(rev_access_token)
+    if os.getenv('REV_BASE_URL'):
+        client.base_url = os.getenv('REV_BASE_URL').rstrip('/') + '/'
+    return client
+
+
+@dataclass
+class _PendingJob:
+    job_id: str
+    future: asyncio.Future
+    interval: float
+    next_poll: float
+    errors: int = 0
+
+
+class TranscriptionJobManager:
+    def __init__(self,
+                 client: apiclient.RevAiAPIClient,
+                 initial_interval: float = 2.0,
+                 max_interval: float = 30.0,
+                 backoff: float = 1.5,
+                 max_errors: int = 5,
+                 callback_url: Optional[str] = None,
+                 callback_host: str = "0.0.0.0",
+                 callback_port: int = 8091):
+        self.client = client
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.max_errors = max_errors
+        self.callback_url = callback_url
+        self.callback_host = callback_host
+        self.callback_port = callback_port
+        self.status_checks = 0
+        self.callbacks_received = 0
+
+        self._loop = asyncio.get_running_loop()
+        self._jobs: Dict[str, _PendingJob] = {}
+        self._wakeup = asyncio.Event()
+        self._poller: Optional[asyncio.Task] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._server_lock = asyncio.Lock()
+
+    async def start(self) -> None:
+        """Start the callback receiver if a callback URL is configured"""
+        async with self._server_lock:
+            if self.callback_url and self._server is None:
+                self._server = await asyncio.start_server(
+                    self._handle_callback, self.callback_host, self.callback_port)
+                print(f"[INFO] Transcription callback receiver listening on "
+                      f"{self.callback_host}:{self.callback_port}")
+
+    async def submit(self, audio_file: str) -> str:
+        """Submit a local audio file and start tracking the job; returns the job ID"""
+        await self.start()
+
+        print(f"Submitting audio file for transcription: {audio_file}")
+        job = await asyncio.to_thread(
+            self.client.submit_job_local_file, audio_file, callback_url=self.callback_url)
+        print(f"Transcription job submitted. Job ID: {job.id}")
+
+        self._jobs[job.id] = _PendingJob(
+            job_id=job.id,
+            future=self._loop.create_future(),
+            interval=self.initial_interval,
+            next_poll=self._loop.time() + self.initial_interval
+        )
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll_jobs())
+        self._wakeup.set()
+        return job.id
+
+    async def wait(self, job_id: str) -> Any:
+        """
+        Wait until a tracked job is transcribed.
+
+        Returns:
+            Job details of the transcribed job
+
+        Raises:
+            ValueError: If the job fails or its status cannot be retrieved
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            raise ValueError(f"Transcription job is not tracked: {job_id}")
+        try:
+            return await job.future
+        finally:
+            self._jobs.pop(job_id, None)
+
+    async def transcribe(self, audio_file: str) -> dict:
+        """Submit an audio file, wait for its job and fetch the transcript"""
+        job_id = await self.submit(audio_file)
+        await self.wait(job_id)
+
+        print("Transcription completed. Fetching results...")
+        return await asyncio.to_thread(self.client.get_transcript_json, job_id)
+
+    def notify(self, job_id: str) -> None:
+        """Check a job's status right away, e.g. after its completion callback arrived"""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            job.next_poll = self._loop.time()
+            self._wakeup.set()
+
+    async def _poll_jobs(self) -> None:
+        """Shared poller: check due jobs, then sleep until the next one is due or a wakeup"""
+        while self._jobs:
+            self._wakeup.clear()
+            now = self._loop.time()
+            pending = [job for job in self._jobs.values() if not job.future.done()]
+            due = [job for job in pending if job.next_poll <= now]
+
+            if due:
+                await asyncio.gather(*[self._poll_job(job) for job in due])
+                continue
+
+            # With nothing pending, sleep until the next submission
+            timeout = min(job.next_poll for job in pending) - now if pending else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll_job(self, job: _PendingJob) -> None:
+        """Check one job's status and resolve it or schedule its next check"""
+        self.status_checks += 1
+        try:
+            job_details = await asyncio.to_thread(self.client.get_job_details, job.job_id)
+        except Exception as e:
+            job.errors += 1
+            if job.errors >= self.max_errors:
+                if not job.future.done():
+                    job.future.set_exception(
+                        ValueError(f"Could not retrieve transcription job status: {str(e)}"))
+                return
+            print(f"[WARNING] Status check of job {job.job_id} failed: {str(e)}")
+        else:
+            job.errors = 0
+            print(f"Job {job.job_id} status: {job_details.status}")
+
+            if job.future.done():
+                return
+            if job_details.status == JobStatus.TRANSCRIBED:
+                job.future.set_result(job_details)
+                return
+            if job_details.status == JobStatus.FAILED:
+                job.future.set_exception(
+                    ValueError(f"Transcription job failed: {job_details.failure_detail}"))
+                return
+
+        # Exponential backoff with jitter so concurrent jobs do not poll in lockstep
+        delay = job.interval * random.uniform(0.75, 1.25)
+        job.interval = min(job.interval * self.backoff, self.max_interval)
+        job.next_poll = self._loop.time() + delay
+
+    async def _handle_callback(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Accept a Rev AI job callback ({"job": {"id": ..., "status": ...}})"""
+        try:
+            method, _, _, body = await read_request(reader)
+            if method != "POST":
+                writer.write(build_response("405 Method Not Allowed", b"", "text/plain",
+                                            "Connection: close\r\n"))
+                return
+
+            job_id = json.loads(body or b"{}").get("job", {}).get("id")
+            if job_id:
+                self.callbacks_received += 1
+                print(f"[INFO] Received completion callback for job {job_id}")
+                # Confirm through the API rather than trusting the unauthenticated payload
+                self.notify(job_id)
+            writer.write(build_response("200 OK", b"", "text/plain", "Connection: close\r\n"))
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError, AttributeError):
+            writer.write(build_response("400 Bad Request", b"", "text/plain", "Connection: close\r\n"))
+        finally:
+            await writer.drain()
+            writer.close()
+
+    async def close(self) -> None:
+        """Stop the poller and the callback receiver, failing any outstanding waits"""
+        if self._poller:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+            self._poller = None
+        for job in self._jobs.values():
+            if not job.future.done():
+                job.future.cancel()
+        self._jobs.clear()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+_manager: Optional[TranscriptionJobManager] = None
+
+
+def get_transcription_job_manager() -> TranscriptionJobManager:
+    """
+    Get the transcription job manager of the running event loop.
+
+    Raises:
+        ValueError: If Rev AI token is missing
+    """
+    global _manager
+    if _manager is None or _manager._loop is not asyncio.get_running_loop():
+        load_dotenv()
+        _manager = TranscriptionJobManager(
+            _get_client(),
+            initial_interval=float(os.getenv('REV_POLL_INITIAL_SECONDS', 2)),
+            max_interval=float(os.getenv('REV_POLL_MAX_SECONDS', 30)),
+            max_errors=int(os.getenv('REV_POLL_MAX_ERRORS', 5)),
+            callback_url=os.getenv('REV_CALLBACK_URL') or None,
+            callback_host=os.getenv('REV_CALLBACK_HOST', "0.0.0.0"),
+            callback_port=int(os.getenv('REV_CALLBACK_PORT', 8091))
+        )
+    return _manager
+
+
+async def close_transcription_job_manager() -> None:
+    """Close the transcription job manager if one was started"""
+    global _manager
+    if _manager is not None:
+        await _manager.close()
+        _manager = None
@@ -1,16 +1,72 @@
 import os
 import asyncio
-from dotenv import load_dotenv
+import tempfile
+from typing import List, Tuple
 
-from rev_ai import apiclient
-from rev_ai.models import JobStatus
+from .media_executor import detect_silences_async, split_audio_async
+from .transcription_job_manager import get_transcription_job_manager
 
-async def process_transcription(audio_file: str) -> dict:
+
+def choose_split_points(silences: List[Tuple[float, float]], segment_seconds: float) -> List[float]:
+    """
+    Pick cut points in the middle of silences so that segments are about segment_seconds long.
+
+    Each cut is made at the silence closest to the target length, so segments can run
+    shorter or longer than segment_seconds depending on where the speaker pauses.
+    """
+    split_points = []
+    last_cut = 0.0
+    previous_midpoint = None
+    for silence_start, silence_end in silences:
+        midpoint = (silence_start + silence_end) / 2
+        target = last_cut + segment_seconds
+        if midpoint >= target:
+            # Cut at whichever silence lies closer to the target length
+            if previous_midpoint is not None and previous_midpoint > last_cut and \
+                    target - previous_midpoint < midpoint - target:
+                midpoint = previous_midpoint
+            split_points.append(midpoint)
+            last_cut = midpoint
+        previous_midpoint = (silence_start + silence_end) / 2
+    return split_points
+
+
+def stitch_transcripts(transcripts: List[Tuple[dict, float]]) -> dict:
+    """
+    Join segment transcripts into one transcript with the same schema as a single Rev AI job.
+
+    Args:
+        transcripts (List[Tuple[dict, float]]): (transcript, segment offset in seconds) pairs in order
+
+    Returns:
+        dict: Transcript whose element timestamps are relative to the start of the full audio
+    """
+    monologues = []
+    for transcript, offset in transcripts:
+        for monologue in transcript.get('monologues', []):
+            elements = []
+            for element in monologue.get('elements', []):
+                element = dict(element)
+                for key in ('ts', 'end_ts'):
+                    if key in element:
+                        element[key] = round(element[key] + offset, 3)
+                elements.append(element)
+            monologues.append({**monologue, 'elements': elements})
+    return {'monologues': monologues}
+
+
+async def process_transcription(audio_file: str, chunked: bool = False) -> dict:
     """
     Process audio file transcription using Rev AI service.
 
+    Jobs are tracked by the shared transcription job manager, which polls them with
+    backoff and, if REV_CALLBACK_URL is set, is woken by Rev AI's completion callbacks.
+
     Args:
         audio_file (str): Path to the audio file
+        chunked (bool): Split the audio at silences into segments of about
+            TRANSCRIPTION_SEGMENT_SECONDS (default: 600), transcribe them concurrently
+            and stitch the results back together
 
     Returns:
         dict: Transcription result
@@ -18,39 +74,29 @@ async def process_transcription(audio_file: str) -> dict:
     Raises:
         ValueError: If Rev AI token is missing or transcription fails
     """
-    # Load environment variables
-    load_dotenv()
+    job_manager = get_transcription_job_manager()
 
-    # Get Rev AI access token
-    rev_access_token = os.getenv('REV_ACCESS_TOKEN')
-    if not rev_access_token:
-        raise ValueError("REV_ACCESS_TOKEN not found in environment variables")
+    try:
+        if not chunked:
+            return await job_manager.transcribe(audio_file)
 
-    # Initialize Rev AI client
-    client = apiclient.RevAiAPIClient(rev_access_token)
+        segment_seconds = float(os.getenv('TRANSCRIPTION_SEGMENT_SECONDS', 600))
+        silences = await detect_silences_async(audio_file)
+        split_points = choose_split_points(silences, segment_seconds)
 
-    try:
-        print("Submitting audio file for transcription...")
-        job = client.submit_job_local_file(audio_file)
-        print(f"Transcription job submitted. Job ID: {job.id}")
-
-        # Wait for job completion
-        while True:
-            job_details = client.get_job_details(job.id)
-            print(f"Job status: {job_details.status}")
-            
-            if job_details.status == JobStatus.TRANSCRIBED:
-                break
-            elif job_details.status == JobStatus.FAILED:
-                raise ValueError(f"Transcription job failed: {job_details.failure_detail}")
-            
-            await asyncio.sleep(10)  # Wait for 10 seconds before checking again
-
-        print("Transcription completed. Fetching results...")
-        transcript = client.get_transcript_json(job.id)
-        
-        return transcript
+        if not split_points:
+            return await job_manager.transcribe(audio_file)
+
+        with tempfile.TemporaryDirectory(prefix="transcription_segments_") as segment_dir:
+            segments = await split_audio_async(audio_file, split_points, segment_dir)
+            print(f"Transcribing {len(segments)} audio segments concurrently...")
+            transcripts = await asyncio.gather(*[
+                job_manager.transcribe(segment_path) for segment_path, _ in segments
+            ])
+
+        return stitch_transcripts([
+            (transcript, offset) for transcript, (_, offset) in zip(transcripts, segments)
+        ])
 
     except Exception as e:
         raise ValueError(f"Transcription processing failed: {str(e)}") from e
-    
\ No newline at end of file
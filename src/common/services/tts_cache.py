@@ -0,0 +1,138 @@
+"""
+Service module for caching synthesized speech on disk.
+Entries are content-addressed by narration text, voice and model, written atomically and
+evicted least-recently-used first once the cache grows past its size cap. The cache size is
+tracked as entries are stored, so the directory is only scanned once at startup and when
+an eviction is due; an eviction frees space down to 90% of the cap.
+
+Configuration (environment variables):
+    TTS_CACHE_DIR: Cache directory (default: <BASE_DIR>/tts_cache)
+    TTS_CACHE_MAX_BYTES: Size cap in bytes (default: 1 GiB)
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from dotenv import load_dotenv
+
+
+class TTSCache:
+    def __init__(self, cache_dir: Path, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        # Bytes in the cache, counted on first put (None until then)
+        self._total_bytes: Optional[int] = None
+
+    @staticmethod
+    def make_key(text: str, voice: str, model: str) -> str:
+        """Build the content address of a synthesized narration"""
+        payload = json.dumps({"text": text, "voice": voice, "model": model}, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.mp3"
+
+    @staticmethod
+    def _atomic_copy(source: Path, destination: Path) -> None:
+        """Copy a file so readers never observe a partially written destination"""
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=destination.parent, suffix='.tmp')
+        os.close(fd)
+        try:
+            shutil.copyfile(source, tmp_path)
+            os.replace(tmp_path, destination)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def get(self, key: str, output_path: Path) -> bool:
+        """Copy a cached entry to output_path; returns False on a miss"""
+        entry_path = self._entry_path(key)
+        try:
+            self._atomic_copy(entry_path, Path(output_path))
+            # Refresh the entry's recency for LRU eviction
+            os.utime(entry_path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return False
+
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def put(self, key: str, source_path: Path) -> None:
+        """Store a synthesized file under key and evict old entries if over the cap"""
+        entry_path = self._entry_path(key)
+        try:
+            replaced_bytes = entry_path.stat().st_size
+        except FileNotFoundError:
+            replaced_bytes = 0
+        self._atomic_copy(Path(source_path), entry_path)
+
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = sum(size for _, size, _ in self._scan())
+            else:
+                self._total_bytes += os.path.getsize(entry_path) - replaced_bytes
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _scan(self) -> List[Tuple[float, int, Path]]:
+        """List (mtime, size, path) of every cache entry"""
+        entries = []
+        for entry_path in self.cache_dir.glob('*/*.mp3'):
+            try:
+                stat = entry_path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry_path))
+        return entries
+
+    def _evict(self) -> None:
+        """Remove least-recently-used entries until the cache fits 90% of its size cap"""
+        entries = self._scan()
+        # Re-counted here, so entries written or removed by other processes are accounted for
+        total_bytes = sum(size for _, size, _ in entries)
+        target_bytes = self.max_bytes * 0.9
+
+        for _, size, entry_path in sorted(entries):
+            if total_bytes <= target_bytes:
+                break
+            try:
+                entry_path.unlink()
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+            total_bytes -= size
+        self._total_bytes = total_bytes
+
+    def stats(self) -> Dict[str, int]:
+        """Get hit/miss/eviction counters"""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+_cache: Optional[TTSCache] = None
+
+
+def get_tts_cache() -> TTSCache:
+    """Get the shared TTS cache instance"""
+    global _cache
+    if _cache is None:
+        load_dotenv()
+        cache_dir = os.getenv('TTS_CACHE_DIR') or Path(os.getenv('BASE_DIR', '')) / "tts_cache"
+        _cache = TTSCache(cache_dir, int(os.getenv('TTS_CACHE_MAX_BYTES', 1024 ** 3)))
+    return _cache
@@ -1,9 +1,186 @@
+"""
+Service module for handling OpenAI Text-to-Speech operations.
+Provides a shared async client and a concurrency- and rate-limit-aware TTS engine.
+
+Configuration (environment variables):
+    TTS_CONCURRENCY: Maximum number of TTS requests in flight (default: 8)
+    TTS_REQUESTS_PER_MINUTE: Requests-per-minute budget (default: 50)
+    TTS_MAX_RETRIES: Retries on 429 responses before giving up (default: 6)
+    OPENAI_BASE_URL: Optional API base URL, e.g. a local fake TTS server
+    TTS_CACHE_DIR / TTS_CACHE_MAX_BYTES: See tts_cache
+"""
+
+import asyncio
 import os
+import random
+import time
 from pathlib import Path
+from typing import Optional
 
-from openai import OpenAI
+from openai import AsyncOpenAI, RateLimitError
 from dotenv import load_dotenv
 
+from .tts_cache import TTSCache, get_tts_cache
+
+_client: Optional[AsyncOpenAI] = None
+_engine: Optional['TTSEngine'] = None
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """
+    Get the shared AsyncOpenAI client, creating it on first use.
+
+    The client keeps a single pooled HTTP connection pool for the whole process.
+
+    Raises:
+        ValueError: If API key or organization ID is missing
+    """
+    global _client
+
+    if _client is None:
+        load_dotenv()
+        open_ai_key = os.getenv('OPEN_AI_KEY')
+        organization_id = os.getenv('OPENAI_ORGANIZATION_ID')
+
+        if not open_ai_key:
+            raise ValueError("OpenAI API key not found in environment variables")
+
+        if not organization_id:
+            raise ValueError("OpenAI organization ID not found in environment variables")
+
+        _client = AsyncOpenAI(
+            api_key=open_ai_key,
+            organization=organization_id,
+            base_url=os.getenv('OPENAI_BASE_URL') or None,
+            # Retries are handled by TTSEngine so 429s feed the adaptive limiter
+            max_retries=0
+        )
+
+    return _client
+
+
+class RateLimiter:
+    """
+    Requests-per-minute limiter that spaces request starts evenly.
+
+    The effective rate is halved on every throttle signal and recovers
+    gradually towards the configured budget on each success.
+    """
+
+    def __init__(self, requests_per_minute: float):
+        self.max_rate = requests_per_minute / 60.0
+        self.rate = self.max_rate
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until the next request slot is available"""
+        async with self._lock:
+            now = time.monotonic()
+            wait = self._next_slot - now
+            self._next_slot = max(now, self._next_slot) + 1.0 / self.rate
+
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def throttle(self, retry_after: Optional[float] = None) -> None:
+        """Reduce the rate after a 429 and push back the next slot"""
+        self.rate = max(self.max_rate / 16, self.rate / 2)
+        if retry_after:
+            self._next_slot = max(self._next_slot, time.monotonic() + retry_after)
+
+    def recover(self) -> None:
+        """Step the rate back up towards the configured budget"""
+        self.rate = min(self.max_rate, self.rate * 1.1)
+
+
+class TTSEngine:
+    def __init__(self,
+                 concurrency: Optional[int] = None,
+                 requests_per_minute: Optional[float] = None,
+                 max_retries: Optional[int] = None,
+                 model: str = "tts-1",
+                 use_cache: bool = True):
+        load_dotenv()
+        self.model = model
+        self.use_cache = use_cache
+        self.max_retries = max_retries if max_retries is not None else int(
+            os.getenv('TTS_MAX_RETRIES', 6))
+        self._semaphore = asyncio.Semaphore(
+            concurrency or int(os.getenv('TTS_CONCURRENCY', 8)))
+        self._limiter = RateLimiter(
+            requests_per_minute or float(os.getenv('TTS_REQUESTS_PER_MINUTE', 50)))
+
+    @staticmethod
+    def _retry_after(error: RateLimitError) -> Optional[float]:
+        """Read the Retry-After header of a 429 response, if present"""
+        try:
+            return float(error.response.headers.get('retry-after'))
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+    async def synthesize(self, text: str, output_path: Path, voice: str = "alloy") -> str:
+        """
+        Synthesize text to an audio file, retrying with backoff on 429s.
+
+        Identical text, voice and model are served from the TTS cache without a request.
+
+        Args:
+            text (str): Text content to convert to speech
+            output_path (Path): Path where the audio file should be saved
+            voice (str): Voice model to use for TTS
+
+        Returns:
+            str: Path to the generated audio file
+        """
+        client = get_openai_client()
+
+        # Serve repeated narrations from the on-disk cache
+        cache = get_tts_cache() if self.use_cache else None
+        cache_key = TTSCache.make_key(text, voice, self.model)
+        if cache and await asyncio.to_thread(cache.get, cache_key, output_path):
+            return str(output_path)
+
+        for attempt in range(self.max_retries + 1):
+            async with self._semaphore:
+                await self._limiter.acquire()
+                try:
+                    async with client.audio.speech.with_streaming_response.create(
+                        model=self.model,
+                        voice=voice,
+                        input=text
+                    ) as response:
+                        await response.stream_to_file(str(output_path))
+                    self._limiter.recover()
+                    break
+                except RateLimitError as e:
+                    if attempt == self.max_retries:
+                        raise
+                    retry_after = self._retry_after(e)
+                    self._limiter.throttle(retry_after)
+
+            # Back off outside the semaphore so other scenes can proceed
+            delay = retry_after or min(60.0, 2 ** attempt) * random.uniform(0.5, 1.5)
+            print(f"[WARNING] TTS rate limited, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+        # The speech is already on disk; a cache that cannot store it only costs a future request
+        if cache:
+            try:
+                await asyncio.to_thread(cache.put, cache_key, output_path)
+            except OSError as e:
+                print(f"[WARNING] Could not cache speech for {output_path}: {str(e)}")
+        return str(output_path)
+
+
+def get_tts_engine() -> TTSEngine:
+    """Get the shared TTS engine instance"""
+    global _engine
+    if _engine is None:
+        _engine = TTSEngine()
+    return _engine
+
+
 async def generate_speech(text: str,
                           output_path: Path,
                           voice: str = "alloy"
@@ -20,36 +197,14 @@ async def generate_speech(text: str,
         str: Path to the generated audio file
 
     Raises:
+        ValueError: If OpenAI credentials are missing
         RuntimeError: If audio generation fails
     """
-    # Load environment variables
-    load_dotenv()
-    open_ai_key = os.getenv('OPEN_AI_KEY')
-    organization_id = os.getenv('OPENAI_ORGANIZATION_ID')
-
-    if not open_ai_key:
-        raise ValueError("OpenAI API key not found in environment variables")
-    
-    if not organization_id:
-        raise ValueError("OpenAI organization ID not found in environment variables")
-
-    # Initialize OpenAI client
-    client = OpenAI(
-        api_key=open_ai_key,
-        organization=organization_id
-    )
+    # Fail fast on missing credentials
+    get_openai_client()
 
     try:
-        # Generate the audio using OpenAI's TTS
-        response = client.audio.speech.create(
-            model="tts-1",
-            voice=voice,
-            input=text
-        )
-
-        # Save the audio file
-        response.stream_to_file(str(output_path))
-        return str(output_path)
+        return await get_tts_engine().synthesize(text, output_path, voice)
 
     except Exception as e:
         raise RuntimeError(f"Failed to generate audio: {str(e)}") from e
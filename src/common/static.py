@@ -3,38 +3,70 @@ STEP_DEPENDENCIES = {
     "step_20_00_transcribe_video": ["step_10_00_preprocess_video"],
     "step_30_00_make_scenes": ["step_20_00_transcribe_video"],
     "step_40_00_extract_clips": ["step_30_00_make_scenes"],
-    "step_50_00_tts": ["step_30_00_make_scenes"],
-    "step_60_00_add_voiceover": ["step_40_00_extract_clips", "step_50_00_tts"],
+    "step_50_00_generate_audio": ["step_30_00_make_scenes"],
+    "step_60_00_add_voiceover": ["step_40_00_extract_clips", "step_50_00_generate_audio"],
     "step_70_00_assemble_video": ["step_60_00_add_voiceover"],
 }
 
-prompt_template = '''
-You are a video transcription analysis expert. I will provide you with a JSON object containing the transcription of a video. The JSON will have a structure like this:
-{
-  "monologues": [
-    {
-      "speaker": 0,
-      "elements": [
-        {
-          "type": "text",
-          "value": "Let's",
-          "ts": 0.175,
-          "end_ts": 0.525,
-          "confidence": 0.81
-        },
-        // ... other elements
-      ]
-    }
-  ]
+# Per-scene streaming mode: step_45 consumes scenes while step_30 is still storing them
+# and runs each scene's clip, TTS and voiceover chain independently. It records steps
+# 40, 50 and 60 as completed, so step_70 keeps its regular dependency check.
+STREAMING_COVERED_STEPS = [
+    "step_40_00_extract_clips",
+    "step_50_00_generate_audio",
+    "step_60_00_add_voiceover",
+]
+
+STREAMING_STEP_DEPENDENCIES = {
+    "step_10_00_preprocess_video": [],
+    "step_20_00_transcribe_video": ["step_10_00_preprocess_video"],
+    "step_30_00_make_scenes": ["step_20_00_transcribe_video"],
+    "step_45_00_stream_scenes": ["step_20_00_transcribe_video"],
+    "step_70_00_assemble_video": ["step_30_00_make_scenes", "step_45_00_stream_scenes"],
 }
 
+# Single-pass render mode: step_70_10 renders the output straight from the source video
+# and the scene narrations, replacing the clip, voiceover and assembly steps.
+RENDER_PLAN_STEP_DEPENDENCIES = {
+    "step_10_00_preprocess_video": [],
+    "step_20_00_transcribe_video": ["step_10_00_preprocess_video"],
+    "step_30_00_make_scenes": ["step_20_00_transcribe_video"],
+    "step_50_00_generate_audio": ["step_30_00_make_scenes"],
+    "step_70_10_render_video": ["step_30_00_make_scenes", "step_50_00_generate_audio"],
+}
+
+# Resource class of every step, used for admission control when several videos run at once:
+# "cpu" steps keep the media process pool busy, "api" steps mostly wait on external services
+STEP_RESOURCE_CLASSES = {
+    "step_10_00_preprocess_video": "cpu",
+    "step_20_00_transcribe_video": "api",
+    "step_30_00_make_scenes": "api",
+    "step_40_00_extract_clips": "cpu",
+    "step_45_00_stream_scenes": "cpu",
+    "step_50_00_generate_audio": "api",
+    "step_60_00_add_voiceover": "cpu",
+    "step_70_00_assemble_video": "cpu",
+    "step_70_10_render_video": "cpu",
+}
+
+# Bump whenever prompt_template changes so cached scene generations are not reused
+PROMPT_TEMPLATE_VERSION = "2"
+
+prompt_template = '''
+You are a video transcription analysis expert. I will provide you with the transcription of a video, one sentence per line. Each line starts with the start and end timestamps of the sentence in seconds, like this:
+
+[0.175-2.410] Let's see.
+[2.980-6.120] You can add a button on, um, notion.
+
+A line may be followed by an indented "words:" line listing word@start_timestamp pairs for finer timing.
+
 Please analyze the transcription and break it down into small granular steps. 
 
 E.g, if you have "Let's see. You can add a button on, um, notion. So here I'm on welcome, uh, page. I can click here. Then I can put a slash, let me write button and then select button."
 
 This can be broken down to three steps (1) showing welcome page, (2) clicking on the '+' sign, and (3) adding a button.
 
-Based on the timestamps (ts and end_ts), provide a JSON response with the following structure:
+Based on the timestamps, provide a JSON response with the following structure:
 
 {
   "steps": [
@@ -50,6 +82,7 @@ Based on the timestamps (ts and end_ts), provide a JSON response with the follow
 
 The steps should be granular and aim to synchronize the narration with specific visual cues. The "polished_narration" should sound professional.
 
-transcription_dict = {transcription_dict}
+transcript:
+{transcript}
 
 '''
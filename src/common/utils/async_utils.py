@@ -0,0 +1,32 @@
+"""
+Utility functions for running coroutines concurrently.
+"""
+
+import asyncio
+from typing import Any, Awaitable, List
+
+
+async def gather_all(*aws: Awaitable[Any], description: str = "tasks") -> List[Any]:
+    """
+    Run awaitables concurrently and wait for all of them, even if some fail.
+
+    Unlike a plain asyncio.gather, a failure does not leave the other tasks running
+    unobserved: every task finishes (and persists its work) before the first failure is
+    raised, so a resumed run only has to redo what actually failed.
+
+    Args:
+        aws (Awaitable[Any]): Awaitables to run
+        description (str): What the awaitables are, for the error message (e.g. "scenes")
+
+    Returns:
+        List[Any]: Results in the order of the awaitables
+
+    Raises:
+        RuntimeError: If any awaitable failed, chained to the first failure
+    """
+    results = await asyncio.gather(*aws, return_exceptions=True)
+    failures = [result for result in results if isinstance(result, BaseException)]
+    if failures:
+        raise RuntimeError(
+            f"{len(failures)} of {len(results)} {description} failed: {str(failures[0])}") from failures[0]
+    return results
@@ -0,0 +1,40 @@
+"""
+Utility functions for content hashing.
+"""
+
+import asyncio
+import hashlib
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+
+
+def compute_file_hash(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    """
+    Compute the SHA-256 digest of a file by streaming it in fixed-size chunks.
+
+    Args:
+        file_path (str): Path to the file to hash
+        chunk_size (int): Number of bytes read per chunk
+
+    Returns:
+        str: Hex-encoded SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        while chunk := file.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+async def compute_file_hash_async(file_path: str, chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    """
+    Compute the SHA-256 digest of a file in a worker thread so the event loop stays free.
+
+    Args:
+        file_path (str): Path to the file to hash
+        chunk_size (int): Number of bytes read per chunk
+
+    Returns:
+        str: Hex-encoded SHA-256 digest
+    """
+    return await asyncio.to_thread(compute_file_hash, file_path, chunk_size)
@@ -0,0 +1,32 @@
+"""
+Minimal HTTP/1.1 helpers shared by the transcription callback receiver and the local fake API servers.
+"""
+
+import asyncio
+from typing import Dict, Tuple
+
+
+async def read_request(reader: asyncio.StreamReader) -> Tuple[str, str, Dict[str, str], bytes]:
+    """Read one HTTP request and return (method, path, headers, body)"""
+    header = await reader.readuntil(b"\r\n\r\n")
+    lines = header.decode("latin-1").split("\r\n")
+    method, path, _ = lines[0].split(" ", 2)
+
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name:
+            headers[name.strip().lower()] = value.strip()
+
+    content_length = int(headers.get("content-length", 0))
+    body = await reader.readexactly(content_length) if content_length else b""
+    return method, path, headers, body
+
+
+def build_response(status: str, body: bytes, content_type: str, extra_headers: str = "") -> bytes:
+    """Build a raw HTTP/1.1 response"""
+    return (f"HTTP/1.1 {status}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"{extra_headers}"
+            "\r\n").encode("latin-1") + body
@@ -0,0 +1,179 @@
+"""
+Utility functions for compacting and chunking Rev AI transcripts before they are sent to the LLM.
+"""
+
+from typing import Any, Dict, List
+
+SENTENCE_END_PUNCTUATION = {".", "?", "!"}
+
+# Rough characters-per-token ratio for English text, used when no tokenizer is available
+CHARS_PER_TOKEN = 4
+
+
+def extract_sentences(transcription: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Group the elements of a Rev AI transcript into sentences.
+
+    Args:
+        transcription (Dict[str, Any]): Rev AI transcript JSON with "monologues"
+
+    Returns:
+        List[Dict[str, Any]]: Sentences with "speaker", "start", "end", "text" and
+            "words" (list of (value, ts) tuples), in transcript order
+    """
+    sentences = []
+
+    for monologue in transcription.get('monologues', []):
+        current = None
+        for element in monologue.get('elements', []):
+            value = element.get('value', '')
+
+            if element.get('type') == 'text':
+                if current is None:
+                    current = {"speaker": monologue.get('speaker'), "start": element['ts'],
+                               "end": element['end_ts'], "text": "", "words": []}
+                current['end'] = element['end_ts']
+                current['words'].append((value, element['ts']))
+
+            if current is not None:
+                current['text'] += value
+                if element.get('type') == 'punct' and value.strip() in SENTENCE_END_PUNCTUATION:
+                    current['text'] = current['text'].strip()
+                    sentences.append(current)
+                    current = None
+
+        # Flush a trailing sentence without closing punctuation
+        if current is not None:
+            current['text'] = current['text'].strip()
+            sentences.append(current)
+
+    return sentences
+
+
+def format_sentences(sentences: List[Dict[str, Any]], word_level: bool = False) -> str:
+    """
+    Render sentences as one "[start-end] sentence" line each.
+
+    Args:
+        sentences (List[Dict[str, Any]]): Sentences as returned by extract_sentences
+        word_level (bool): Add an indented "words:" line with word@start pairs under each sentence
+
+    Returns:
+        str: Compact transcript text
+    """
+    lines = []
+    for sentence in sentences:
+        lines.append(f"[{sentence['start']:.3f}-{sentence['end']:.3f}] {sentence['text']}")
+        if word_level:
+            words = " ".join(f"{value}@{ts:.2f}" for value, ts in sentence['words'])
+            lines.append(f"  words: {words}")
+    return "\n".join(lines)
+
+
+def compact_transcript(transcription: Dict[str, Any], word_level: bool = False) -> str:
+    """
+    Render a Rev AI transcript as one "[start-end] sentence" line per sentence.
+
+    Confidence values, element types and speaker wrappers are dropped.
+
+    Args:
+        transcription (Dict[str, Any]): Rev AI transcript JSON with "monologues"
+        word_level (bool): Add an indented "words:" line with word@start pairs under each sentence
+
+    Returns:
+        str: Compact transcript text
+    """
+    return format_sentences(extract_sentences(transcription), word_level)
+
+
+def chunk_sentences(sentences: List[Dict[str, Any]],
+                    max_chunk_seconds: float,
+                    overlap_sentences: int = 2) -> List[Dict[str, Any]]:
+    """
+    Split sentences into chunks of at most max_chunk_seconds, cutting only at sentence boundaries.
+
+    Each chunk after the first is prefixed with the last overlap_sentences sentences of the
+    previous chunk for context. A chunk "owns" the time range from its first new sentence to
+    the first new sentence of the next chunk, which is what merge_chunk_scenes uses to
+    decide which chunk a boundary scene belongs to.
+
+    Returns:
+        List[Dict[str, Any]]: Chunks with "sentences", "owned_start" and "owned_end"
+    """
+    groups: List[List[Dict[str, Any]]] = []
+    for sentence in sentences:
+        if groups and sentence['end'] - groups[-1][0]['start'] <= max_chunk_seconds:
+            groups[-1].append(sentence)
+        else:
+            groups.append([sentence])
+
+    chunks = []
+    for index, group in enumerate(groups):
+        context = groups[index - 1][-overlap_sentences:] if index > 0 and overlap_sentences > 0 else []
+        chunks.append({
+            "sentences": context + group,
+            "owned_start": group[0]['start'] if index > 0 else float('-inf'),
+            "owned_end": groups[index + 1][0]['start'] if index + 1 < len(groups) else float('inf'),
+        })
+    return chunks
+
+
+def merge_chunk_scenes(chunks: List[Dict[str, Any]],
+                       chunk_scenes: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Merge per-chunk scene lists into one ordered, de-duplicated list.
+
+    A scene is kept only from the chunk that owns its midpoint, which drops the duplicates
+    generated from overlap context. Remaining scenes that still overlap their predecessor by
+    more than half of the shorter one are dropped as well.
+
+    Args:
+        chunks (List[Dict[str, Any]]): Chunks as returned by chunk_sentences
+        chunk_scenes (List[List[Dict[str, Any]]]): Scenes generated for each chunk
+
+    Returns:
+        List[Dict[str, Any]]: Scenes ordered by time_start
+    """
+    owned = []
+    for chunk, scenes in zip(chunks, chunk_scenes):
+        for scene in scenes:
+            midpoint = (scene['time_start'] + scene['time_end']) / 2
+            if chunk['owned_start'] <= midpoint < chunk['owned_end']:
+                owned.append(scene)
+
+    merged: List[Dict[str, Any]] = []
+    for scene in sorted(owned, key=lambda scene: (scene['time_start'], scene['time_end'])):
+        if merged:
+            previous = merged[-1]
+            overlap = min(previous['time_end'], scene['time_end']) - scene['time_start']
+            shorter = min(previous['time_end'] - previous['time_start'],
+                          scene['time_end'] - scene['time_start'])
+            if shorter > 0 and overlap > shorter / 2:
+                continue
+        merged.append(scene)
+    return merged
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text from its length"""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def measure_compaction(transcription: Dict[str, Any]) -> Dict[str, int]:
+    """
+    Compare the size of the raw transcript repr with its compact encodings.
+
+    Returns:
+        Dict[str, int]: Character and estimated token counts for the "raw", "compact"
+            and "compact_words" encodings
+    """
+    encodings = {
+        "raw": str(transcription),
+        "compact": compact_transcript(transcription),
+        "compact_words": compact_transcript(transcription, word_level=True),
+    }
+    measurements = {}
+    for name, text in encodings.items():
+        measurements[f"{name}_chars"] = len(text)
+        measurements[f"{name}_tokens"] = estimate_tokens(text)
+    return measurements
@@ -0,0 +1,83 @@
+from typing import Any, Dict, List, Optional
+import asyncio
+
+from motor.motor_asyncio import AsyncIOMotorCollection, AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+
+class BulkUpdateBuffer:
+    """
+    Buffer per-document updates and write them with unordered bulk_write calls.
+
+    The buffer is flushed when it reaches max_batch_size operations, every flush_interval
+    seconds while used as an async context manager, and on exit from the context. Operations
+    of a failed write stay buffered for the next flush, and a failed periodic flush is raised
+    on exit, so updates are never dropped silently.
+    """
+
+    def __init__(self,
+                 collection: AsyncIOMotorCollection,
+                 max_batch_size: int = 500,
+                 flush_interval: float = 1.0):
+        self.collection = collection
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self._operations: List[UpdateOne] = []
+        self._lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> 'BulkUpdateBuffer':
+        self._flush_task = asyncio.create_task(self._flush_periodically())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        flush_task, self._flush_task = self._flush_task, None
+        flush_error = None
+        if flush_task:
+            if flush_task.done():
+                # The periodic flush stopped on a write error; its operations are back in the buffer
+                flush_error = None if flush_task.cancelled() else flush_task.exception()
+            else:
+                # Stop the timer without interrupting a flush that is already writing
+                async with self._lock:
+                    flush_task.cancel()
+                try:
+                    await flush_task
+                except asyncio.CancelledError:
+                    pass
+
+        # Persist whatever completed, also when the block failed
+        await self.flush()
+        if flush_error is not None and exc_type is None:
+            raise flush_error
+
+    async def _flush_periodically(self) -> None:
+        """Flush the buffer on a fixed interval"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def update_one(self, filter: Dict[str, Any], update: Dict[str, Any]) -> None:
+        """Queue an update, flushing if the batch is full"""
+        self._operations.append(UpdateOne(filter, update))
+        if len(self._operations) >= self.max_batch_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write all buffered updates in one unordered bulk_write"""
+        async with self._lock:
+            if not self._operations:
+                return
+            operations, self._operations = self._operations, []
+            try:
+                await self.collection.bulk_write(operations, ordered=False)
+            except BaseException:
+                # Put the operations back so a later flush retries them (updates are idempotent $sets)
+                self._operations = operations + self._operations
+                raise
+
+
+async def insert_scenes(db: AsyncIOMotorDatabase, scene_records: List[Dict[str, Any]]) -> None:
+    """Insert scene documents in a single insert_many; each record receives its _id"""
+    if scene_records:
+        await db.scenes.insert_many(scene_records)
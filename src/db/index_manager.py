@@ -0,0 +1,61 @@
+from typing import Dict, List
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ASCENDING, DESCENDING, IndexModel
+
+from .scene_cache import SCENE_CACHE_TTL_SECONDS
+
+# Indexes required by the pipeline queries, keyed by collection name
+INDEX_SPECS: Dict[str, List[IndexModel]] = {
+    "scenes": [
+        IndexModel([("video_id", ASCENDING), ("scene_index", ASCENDING)],
+                   name="video_id_1_scene_index_1"),
+    ],
+    "transcriptions": [
+        IndexModel([("video_id", ASCENDING)], name="video_id_1"),
+    ],
+    "media_fingerprints": [
+        IndexModel([("content_hash", ASCENDING)], name="content_hash_1", unique=True),
+    ],
+    "scene_generation_cache": [
+        IndexModel([("created_at", ASCENDING)], name="created_at_1",
+                   expireAfterSeconds=SCENE_CACHE_TTL_SECONDS),
+    ],
+    "pipeline_jobs": [
+        IndexModel([("video_id", ASCENDING), ("step_name", ASCENDING)],
+                   name="video_id_1_step_name_1", unique=True),
+        IndexModel([("step_name", ASCENDING), ("status", ASCENDING), ("available_at", ASCENDING)],
+                   name="step_name_1_status_1_available_at_1"),
+        IndexModel([("status", ASCENDING), ("lease_expires_at", ASCENDING)],
+                   name="status_1_lease_expires_at_1"),
+    ],
+    "pipeline_errors": [
+        IndexModel([("video_id", ASCENDING), ("error_timestamp", DESCENDING)],
+                   name="video_id_1_error_timestamp_-1"),
+    ],
+}
+
+
+async def ensure_indexes(db: AsyncIOMotorDatabase) -> None:
+    """
+    Create the indexes in INDEX_SPECS and verify that they exist with the expected keys.
+
+    create_indexes is a no-op for indexes that already exist with the same definition.
+
+    Raises:
+        RuntimeError: If an index exists under the expected name with different keys
+    """
+    for collection_name, index_models in INDEX_SPECS.items():
+        collection = db[collection_name]
+        await collection.create_indexes(index_models)
+
+        index_information = await collection.index_information()
+        for index_model in index_models:
+            name = index_model.document["name"]
+            expected_keys = list(index_model.document["key"].items())
+            actual_keys = [tuple(key) for key in index_information.get(name, {}).get("key", [])]
+            if actual_keys != expected_keys:
+                raise RuntimeError(
+                    f"Index '{name}' on '{collection_name}' has keys {actual_keys}, expected {expected_keys}")
+
+    print("Verified MongoDB indexes")
@@ -0,0 +1,274 @@
+"""
+MongoDB-backed job queue for running pipeline steps across several worker nodes.
+
+Every runnable step of a video is one job document in `pipeline_jobs`. Workers lease jobs
+for the step types they subscribe to; a lease is kept alive with heartbeats and expires
+after the visibility timeout, so a job held by a crashed worker becomes available again.
+Failed attempts are retried with backoff until max_attempts is reached.
+
+Job document:
+{
+    "video_id": ObjectId(...),
+    "step_name": "step_40_00_extract_clips",
+    "pipeline": "default",                   # dependency table, see PIPELINE_DEPENDENCIES
+    "status": "queued" | "leased" | "completed" | "failed",
+    "attempts": 1,                           # leases handed out so far
+    "max_attempts": 3,
+    "available_at": datetime,                # not leased before this time (retry backoff)
+    "lease_owner": "host:pid:uuid",
+    "lease_expires_at": datetime,            # visibility timeout of the current lease
+    "heartbeat_at": datetime,
+    "last_error": "...",
+    "created_at": datetime,
+    "updated_at": datetime
+}
+
+Configuration (environment variables):
+    JOB_LEASE_SECONDS: Visibility timeout of a lease (default: 120)
+    JOB_MAX_ATTEMPTS: Leases per job before it is failed (default: 3)
+    JOB_RETRY_BACKOFF_SECONDS: Base delay before a failed job is retried, doubled per attempt (default: 30)
+"""
+
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+import pytz
+from bson import ObjectId
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from ..common.static import STEP_DEPENDENCIES, RENDER_PLAN_STEP_DEPENDENCIES
+
+# Dependency tables a queued pipeline can follow; the streaming mode hands scenes between
+# steps in memory and therefore only runs inside a single process
+PIPELINE_DEPENDENCIES = {
+    "default": STEP_DEPENDENCIES,
+    "render_plan": RENDER_PLAN_STEP_DEPENDENCIES,
+}
+
+
+def _now() -> datetime:
+    return datetime.now(pytz.timezone("Asia/Kolkata"))
+
+
+class JobQueue:
+    def __init__(self,
+                 db: AsyncIOMotorDatabase,
+                 worker_id: Optional[str] = None,
+                 lease_seconds: Optional[float] = None,
+                 max_attempts: Optional[int] = None,
+                 retry_backoff_seconds: Optional[float] = None,
+                 clock: Callable[[], datetime] = _now):
+        load_dotenv()
+        self.collection = db.pipeline_jobs
+        self.db = db
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.lease_seconds = lease_seconds or float(os.getenv('JOB_LEASE_SECONDS', 120))
+        self.max_attempts = max_attempts or int(os.getenv('JOB_MAX_ATTEMPTS', 3))
+        self.retry_backoff_seconds = retry_backoff_seconds if retry_backoff_seconds is not None else float(
+            os.getenv('JOB_RETRY_BACKOFF_SECONDS', 30))
+        # Injectable so lease expiry can be tested against a local mongod without waiting
+        self.clock = clock
+
+    async def enqueue(self,
+                      video_id: str,
+                      step_name: str,
+                      pipeline: str = "default",
+                      reset: bool = False) -> bool:
+        """
+        Queue a step of a video unless it is already queued, leased or done.
+
+        Args:
+            video_id (str): MongoDB ObjectId of the video document as string
+            step_name (str): Step to run
+            pipeline (str): Dependency table the video follows (see PIPELINE_DEPENDENCIES)
+            reset (bool): Requeue a completed or failed job, e.g. to re-run a step
+
+        Returns:
+            bool: True if a job was queued
+        """
+        if pipeline not in PIPELINE_DEPENDENCIES:
+            raise ValueError(f"Unknown pipeline: {pipeline}")
+
+        now = self.clock()
+        job_filter = {"video_id": ObjectId(video_id), "step_name": step_name}
+        queued_fields = {
+            "pipeline": pipeline,
+            "status": "queued",
+            "attempts": 0,
+            "max_attempts": self.max_attempts,
+            "available_at": now,
+            "updated_at": now
+        }
+
+        if reset:
+            result = await self.collection.update_one(
+                {**job_filter, "status": {"$in": ["completed", "failed"]}},
+                {"$set": queued_fields, "$unset": {"last_error": "", "lease_owner": ""}}
+            )
+            if result.modified_count:
+                return True
+
+        try:
+            result = await self.collection.update_one(
+                job_filter,
+                {"$setOnInsert": {**job_filter, **queued_fields, "created_at": now}},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            # A concurrent enqueue of the same step won
+            return False
+        return result.upserted_id is not None
+
+    async def get_pipeline(self, video_id: str) -> Optional[str]:
+        """Get the pipeline a video was queued with, or None if it has never been queued"""
+        job = await self.collection.find_one({"video_id": ObjectId(video_id)}, {"pipeline": 1})
+        return job.get("pipeline", "default") if job else None
+
+    async def enqueue_ready_steps(self, video_id: str, pipeline: str = "default") -> List[str]:
+        """
+        Queue the steps of a video that have all dependencies completed and are not completed yet.
+
+        Returns:
+            List[str]: Names of the newly queued steps
+        """
+        dependencies = PIPELINE_DEPENDENCIES[pipeline]
+        video_record = await self.db.videos.find_one({"_id": ObjectId(video_id)}, {"steps_status": 1})
+        steps_status = (video_record or {}).get("steps_status", {})
+
+        queued = []
+        for step_name, dep_steps in dependencies.items():
+            if steps_status.get(f"{step_name}_completed"):
+                continue
+            if all(steps_status.get(f"{dep_step}_completed") for dep_step in dep_steps):
+                if await self.enqueue(video_id, step_name, pipeline):
+                    queued.append(step_name)
+        return queued
+
+    async def lease(self, step_names: List[str]) -> Optional[Dict[str, Any]]:
+        """
+        Lease the oldest available job of the given step types.
+
+        A job is available if it is queued and its retry delay has passed, or if it is leased
+        but the lease expired without a heartbeat (its worker is presumed dead).
+
+        Returns:
+            Optional[Dict[str, Any]]: The leased job, or None if nothing is available
+        """
+        now = self.clock()
+        return await self.collection.find_one_and_update(
+            {
+                "step_name": {"$in": list(step_names)},
+                "$or": [
+                    {"status": "queued", "available_at": {"$lte": now}},
+                    {"status": "leased", "lease_expires_at": {"$lte": now}},
+                ],
+                "$expr": {"$lt": ["$attempts", "$max_attempts"]}
+            },
+            {
+                "$set": {
+                    "status": "leased",
+                    "lease_owner": self.worker_id,
+                    "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                    "heartbeat_at": now,
+                    "updated_at": now
+                },
+                "$inc": {"attempts": 1}
+            },
+            sort=[("available_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def heartbeat(self, job: Dict[str, Any]) -> bool:
+        """
+        Extend the lease of a job held by this worker.
+
+        Returns:
+            bool: False if the lease was lost (it expired and another worker took the job)
+        """
+        now = self.clock()
+        result = await self.collection.update_one(
+            {"_id": job["_id"], "status": "leased", "lease_owner": self.worker_id},
+            {"$set": {
+                "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                "heartbeat_at": now,
+                "updated_at": now
+            }}
+        )
+        return result.matched_count == 1
+
+    async def complete(self, job: Dict[str, Any]) -> List[str]:
+        """
+        Mark a leased job completed and queue the steps that became runnable.
+
+        Returns:
+            List[str]: Names of the newly queued steps
+        """
+        await self.collection.update_one(
+            {"_id": job["_id"], "lease_owner": self.worker_id},
+            {"$set": {"status": "completed", "updated_at": self.clock()},
+             "$unset": {"lease_expires_at": ""}}
+        )
+        return await self.enqueue_ready_steps(str(job["video_id"]), job.get("pipeline", "default"))
+
+    async def fail(self, job: Dict[str, Any], error: str) -> bool:
+        """
+        Record a failed attempt; the job is retried with exponential backoff until it
+        has used max_attempts leases, then marked failed.
+
+        Returns:
+            bool: True if the job will be retried
+        """
+        now = self.clock()
+        retry = job["attempts"] < job.get("max_attempts", self.max_attempts)
+        update = {"last_error": error[-2000:], "updated_at": now}
+        if retry:
+            delay = self.retry_backoff_seconds * 2 ** (job["attempts"] - 1)
+            update.update({"status": "queued", "available_at": now + timedelta(seconds=delay)})
+        else:
+            update["status"] = "failed"
+
+        await self.collection.update_one(
+            {"_id": job["_id"], "lease_owner": self.worker_id},
+            {"$set": update, "$unset": {"lease_expires_at": ""}}
+        )
+        return retry
+
+    async def release(self, job: Dict[str, Any], delay_seconds: float = 0) -> None:
+        """
+        Hand a leased job back without counting the attempt, e.g. on graceful shutdown.
+
+        Args:
+            delay_seconds (float): Keep the job from being leased again for this long
+        """
+        now = self.clock()
+        await self.collection.update_one(
+            {"_id": job["_id"], "status": "leased", "lease_owner": self.worker_id},
+            {"$set": {"status": "queued", "available_at": now + timedelta(seconds=delay_seconds), "updated_at": now},
+             "$inc": {"attempts": -1},
+             "$unset": {"lease_expires_at": ""}}
+        )
+
+    async def fail_exhausted(self) -> int:
+        """
+        Mark jobs failed whose last lease expired with no attempts left.
+
+        Returns:
+            int: Number of jobs marked failed
+        """
+        now = self.clock()
+        result = await self.collection.update_many(
+            {
+                "status": "leased",
+                "lease_expires_at": {"$lte": now},
+                "$expr": {"$gte": ["$attempts", "$max_attempts"]}
+            },
+            {"$set": {"status": "failed", "last_error": "Lease expired on the last attempt", "updated_at": now},
+             "$unset": {"lease_expires_at": ""}}
+        )
+        return result.modified_count
@@ -0,0 +1,70 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import pytz
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+# One document per distinct source video content, unique on content_hash:
+# {
+#     "content_hash": "<sha256>",
+#     "owner_video_id": ObjectId(...),        # first video that claimed the hash
+#     "metadata": {...},                      # set once preprocessing finished
+#     "audio_file": "/path/to/audio.mp3",     # set once preprocessing finished
+#     "transcription_video_id": ObjectId(...) # set once a transcription is stored
+# }
+
+
+async def claim_fingerprint(db: AsyncIOMotorDatabase, content_hash: str, video_id: str) -> Dict[str, Any]:
+    """
+    Get the fingerprint document for a content hash, creating it with this video as owner if new.
+
+    Concurrent claims are safe: the unique index on content_hash lets exactly one upsert
+    insert the document, and a racer that hits the duplicate key simply reads the winner's.
+
+    Returns:
+        Dict[str, Any]: The fingerprint document
+    """
+    try:
+        return await db.media_fingerprints.find_one_and_update(
+            {"content_hash": content_hash},
+            {
+                "$setOnInsert": {
+                    "content_hash": content_hash,
+                    "owner_video_id": ObjectId(video_id),
+                    "created_at": datetime.now(pytz.timezone("Asia/Kolkata"))
+                }
+            },
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        return await db.media_fingerprints.find_one({"content_hash": content_hash})
+
+
+async def record_preprocessing(db: AsyncIOMotorDatabase,
+                               content_hash: str,
+                               metadata: Dict[str, Any],
+                               audio_file: str) -> None:
+    """Store preprocessing results for a content hash unless another upload already did"""
+    await db.media_fingerprints.update_one(
+        {"content_hash": content_hash, "audio_file": {"$exists": False}},
+        {"$set": {"metadata": metadata, "audio_file": audio_file}}
+    )
+
+
+async def record_transcription(db: AsyncIOMotorDatabase, content_hash: str, video_id: str) -> None:
+    """Store which video's transcription document covers a content hash unless one is already recorded"""
+    await db.media_fingerprints.update_one(
+        {"content_hash": content_hash, "transcription_video_id": {"$exists": False}},
+        {"$set": {"transcription_video_id": ObjectId(video_id)}}
+    )
+
+
+async def find_fingerprint(db: AsyncIOMotorDatabase, content_hash: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Fetch the fingerprint document for a content hash"""
+    if not content_hash:
+        return None
+    return await db.media_fingerprints.find_one({"content_hash": content_hash})
@@ -4,6 +4,8 @@ from dotenv import load_dotenv
 import os
 from typing import Optional
 
+from .index_manager import ensure_indexes
+
 
 class MongoDBManager:
     _instance: Optional['MongoDBManager'] = None
@@ -33,8 +35,15 @@ class MongoDBManager:
 
                 await self._client.admin.command('ping')
                 print("Successfully connected to MongoDB")
+
+                await ensure_indexes(self._db)
             except Exception as e:
                 print(f"Failed to connect to MongoDB: {e}")
+                # Leave the manager uninitialized so the next call retries
+                if self._client is not None:
+                    self._client.close()
+                self._client = None
+                self._db = None
                 raise
 
     async def close(self):
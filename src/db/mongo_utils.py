@@ -7,3 +7,8 @@ async def get_mongodb():
     if mongo_manager._client is None:
         await mongo_manager.initialize()
     return mongo_manager
+
+
+async def close_mongodb():
+    """Close the shared MongoDB connection so a later get_mongodb() reconnects"""
+    await MongoDBManager().close()
@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import pytz
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+# One document per watched change stream, keyed by stream name:
+# {
+#     "_id": "videos",
+#     "resume_token": {"_data": "..."},   # last change the watcher has fully handled
+#     "updated_at": datetime
+# }
+
+
+async def load_resume_token(db: AsyncIOMotorDatabase, stream_name: str) -> Optional[Dict[str, Any]]:
+    """Get the stored resume token of a change stream, if any"""
+    state = await db.change_stream_tokens.find_one({"_id": stream_name}, {"resume_token": 1})
+    return state.get("resume_token") if state else None
+
+
+async def save_resume_token(db: AsyncIOMotorDatabase, stream_name: str, resume_token: Dict[str, Any]) -> None:
+    """Store the resume token of a change stream, replacing the previous one"""
+    await db.change_stream_tokens.update_one(
+        {"_id": stream_name},
+        {"$set": {"resume_token": resume_token, "updated_at": datetime.now(pytz.timezone("Asia/Kolkata"))}},
+        upsert=True
+    )
+
+
+async def clear_resume_token(db: AsyncIOMotorDatabase, stream_name: str) -> None:
+    """Forget the resume token of a change stream, e.g. after its oplog history was lost"""
+    await db.change_stream_tokens.delete_one({"_id": stream_name})
@@ -0,0 +1,43 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+# Cached scene generations expire this long after they were stored (TTL index on created_at)
+SCENE_CACHE_TTL_SECONDS = 30 * 24 * 60 * 60
+
+
+def make_scene_cache_key(transcription: Any,
+                         prompt_version: str,
+                         model: str,
+                         generation_config: Dict[str, Any]) -> str:
+    """
+    Build the cache key of a scene generation.
+
+    The key covers everything that determines the LLM output: the transcript content,
+    the prompt template version, the model name and the generation config.
+    """
+    payload = json.dumps({
+        "transcription": transcription,
+        "prompt_version": prompt_version,
+        "model": model,
+        "generation_config": generation_config,
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+async def get_cached_scenes(db: AsyncIOMotorDatabase, cache_key: str) -> Optional[Dict[str, Any]]:
+    """Fetch the parsed scene JSON stored under cache_key, if any"""
+    cached = await db.scene_generation_cache.find_one({"_id": cache_key}, {"scenes_data": 1})
+    return cached['scenes_data'] if cached else None
+
+
+async def store_cached_scenes(db: AsyncIOMotorDatabase, cache_key: str, scenes_data: Dict[str, Any]) -> None:
+    """Store parsed scene JSON under cache_key, replacing any previous entry"""
+    await db.scene_generation_cache.replace_one(
+        {"_id": cache_key},
+        {"scenes_data": scenes_data, "created_at": datetime.now(timezone.utc)},
+        upsert=True
+    )
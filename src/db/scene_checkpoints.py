@@ -0,0 +1,74 @@
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict
+
+import pytz
+
+# Per-scene artifact checkpoints, stored on the scene document next to the artifact path:
+# {
+#     "checkpoints": {
+#         "clip": {
+#             "path": "/base/<video_id>/clips/scene_12.5_18.0.mp4",
+#             "size": 1048576,                 # bytes on disk when the artifact was finished
+#             "inputs": "<sha256>",            # fingerprint of everything that produced it
+#             "completed_at": datetime
+#         },
+#         "audio": {...},
+#         "voiceover": {...}
+#     }
+# }
+#
+# A checkpoint is only written after its artifact is complete, so a scene whose checkpoint
+# matches the file on disk and the current inputs can be skipped when a step is resumed.
+
+
+def fingerprint_inputs(**inputs: Any) -> str:
+    """Hash the inputs that determine an artifact, e.g. a clip's source and time range"""
+    payload = json.dumps(inputs, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def checkpoint_fields(artifact: str, path: str, inputs: str) -> Dict[str, Any]:
+    """
+    Build the $set fields recording a finished artifact of a scene.
+
+    Args:
+        artifact (str): Artifact name, e.g. "clip", "audio" or "voiceover"
+        path (str): Path of the finished artifact
+        inputs (str): Fingerprint of its inputs (see fingerprint_inputs)
+
+    Returns:
+        Dict[str, Any]: Fields to $set on the scene document
+    """
+    return {
+        f"checkpoints.{artifact}": {
+            "path": str(path),
+            "size": os.path.getsize(path),
+            "inputs": inputs,
+            "completed_at": datetime.now(pytz.timezone("Asia/Kolkata"))
+        }
+    }
+
+
+def set_checkpoint(scene: Dict[str, Any], fields: Dict[str, Any]) -> None:
+    """Apply checkpoint fields built by checkpoint_fields to an in-memory scene"""
+    for key, checkpoint in fields.items():
+        scene.setdefault("checkpoints", {})[key.split(".", 1)[1]] = checkpoint
+
+
+def is_checkpoint_valid(scene: Dict[str, Any], artifact: str, inputs: str) -> bool:
+    """
+    Check whether a scene's artifact is finished for the given inputs.
+
+    The artifact must exist with the size recorded when it was finished, so files truncated
+    or replaced by an interrupted re-run are not trusted.
+    """
+    checkpoint = scene.get("checkpoints", {}).get(artifact)
+    if not checkpoint or checkpoint.get("inputs") != inputs:
+        return False
+    try:
+        return os.path.getsize(checkpoint["path"]) == checkpoint["size"] > 0
+    except OSError:
+        return False
@@ -0,0 +1,32 @@
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+# Scene fields read by each step; _id is always returned
+CLIP_FIELDS = {"scene_index": 1, "time_start": 1, "time_end": 1, "checkpoints": 1}
+AUDIO_FIELDS = {"scene_index": 1, "polished_narration": 1, "checkpoints": 1}
+VOICEOVER_FIELDS = {"scene_index": 1, "clip_file_path": 1, "audio_file_path": 1, "checkpoints": 1}
+ASSEMBLY_FIELDS = {"scene_index": 1, "clip_with_voiceover": 1, "checkpoints": 1}
+STREAMING_FIELDS = {**CLIP_FIELDS, **AUDIO_FIELDS}
+RENDER_FIELDS = {**CLIP_FIELDS, "audio_file_path": 1}
+REFRESH_FIELDS = {**CLIP_FIELDS, **AUDIO_FIELDS, **VOICEOVER_FIELDS, **ASSEMBLY_FIELDS}
+
+
+async def get_ordered_scenes(db: AsyncIOMotorDatabase,
+                             video_id: str,
+                             projection: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Fetch the scenes of a video ordered by scene_index.
+
+    The query is covered by the (video_id, scene_index) index for filtering and sorting.
+
+    Args:
+        video_id (str): MongoDB ObjectId of the video document as string
+        projection (Optional[Dict[str, Any]]): Fields to return, e.g. CLIP_FIELDS
+
+    Returns:
+        List[Dict[str, Any]]: Scene documents in scene order
+    """
+    cursor = db.scenes.find({"video_id": ObjectId(video_id)}, projection).sort("scene_index", 1)
+    return await cursor.to_list(length=None)
@@ -1,35 +1,114 @@
 import asyncio
+from typing import Optional
+
+from bson import ObjectId
+
+from src.common.static import STEP_DEPENDENCIES, STREAMING_STEP_DEPENDENCIES, RENDER_PLAN_STEP_DEPENDENCIES
 from src.db.mongo_utils import get_mongodb
+from src.pipeline.admission import AdmissionController
+from src.pipeline.dag_executor import DagExecutor
 
 from src.steps.step_10_00_preprocess_video import step_10_00_preprocess_video
 from src.steps.step_20_00_transcribe_video import step_20_00_transcribe_video
 from src.steps.step_30_00_make_scenes import step_30_00_make_scenes
 from src.steps.step_40_00_extract_clips import step_40_00_extract_clips
+from src.steps.step_45_00_stream_scenes import step_45_00_stream_scenes
 from src.steps.step_50_00_generate_audio import step_50_00_generate_audio
 from src.steps.step_60_00_add_voiceover import step_60_00_add_voiceover
 from src.steps.step_70_00_assemble_video import step_70_00_assemble_video
+from src.steps.step_70_10_render_video import step_70_10_render_video
+
+# Step functions keyed by the step names used in STEP_DEPENDENCIES
+STEP_FUNCTIONS = {
+    step.__name__: step for step in (
+        step_10_00_preprocess_video,
+        step_20_00_transcribe_video,
+        step_30_00_make_scenes,
+        step_40_00_extract_clips,
+        step_45_00_stream_scenes,
+        step_50_00_generate_audio,
+        step_60_00_add_voiceover,
+        step_70_00_assemble_video,
+        step_70_10_render_video,
+    )
+}
+
+
+def _feeding_scene_queue(step, scene_queue: asyncio.Queue):
+    """Wrap the scene-producing step so a failure also ends the scene stream"""
+    async def run(**kwargs):
+        try:
+            return await step(scene_queue=scene_queue, **kwargs)
+        except Exception as e:
+            await scene_queue.put(e)
+            raise
+    return run
+
+
+async def process_submitted_video(video_id: str,
+                                  streaming: bool = False,
+                                  render_plan: bool = False,
+                                  admission: Optional[AdmissionController] = None) -> bool:
+    """
+    Run the pipeline for a video.
+
+    Steps completed by an earlier run are skipped, so running a failed video again resumes
+    it; within the resumed steps, scenes with valid checkpoints are skipped as well.
 
+    Args:
+        video_id (str): MongoDB ObjectId of the video document as string
+        streaming (bool): Process each scene's clip, TTS and voiceover as soon as the scene
+            is stored instead of running steps 40, 50 and 60 as whole-video barriers
+        render_plan (bool): Render the output in a single ffmpeg pass from the source video
+            and the narrations instead of running steps 40, 60 and 70
+        admission (Optional[AdmissionController]): Caps shared with other pipelines running
+            in the same process; every step waits for a slot of its resource class
+
+    Returns:
+        bool: True if every step succeeded
+
+    The MongoDB client is shared and stays open; whoever owns the process closes it.
+    """
+    if streaming and render_plan:
+        raise ValueError("streaming and render_plan modes cannot be combined")
 
-async def process_submitted_video(video_id: str):
     # Initialize MongoDB connection
     mongodb = await get_mongodb()
 
+    if streaming:
+        dependencies = STREAMING_STEP_DEPENDENCIES
+    elif render_plan:
+        dependencies = RENDER_PLAN_STEP_DEPENDENCIES
+    else:
+        dependencies = STEP_DEPENDENCIES
+
+    # Resume after a failure: steps completed by an earlier run are not run again
+    video_status = await mongodb.db.videos.find_one({"_id": ObjectId(video_id)}, {"steps_status": 1})
+    steps_status = (video_status or {}).get("steps_status", {})
+    completed_steps = [step_name for step_name in dependencies if steps_status.get(f"{step_name}_completed")]
+    if completed_steps:
+        print(f"[INFO] Resuming video {video_id}, already completed: {', '.join(completed_steps)}")
+
+    step_functions = STEP_FUNCTIONS
+    per_step_kwargs = None
+    if streaming and "step_30_00_make_scenes" not in completed_steps:
+        scene_queue = asyncio.Queue()
+        step_functions = {
+            **STEP_FUNCTIONS,
+            "step_30_00_make_scenes": _feeding_scene_queue(step_30_00_make_scenes, scene_queue)
+        }
+        per_step_kwargs = {"step_45_00_stream_scenes": {"scene_queue": scene_queue}}
+
+    if admission is not None:
+        step_functions = admission.wrap_all(step_functions)
+    executor = DagExecutor(step_functions, dependencies)
+
     try:
-        # Execute pipeline steps
-        await step_10_00_preprocess_video(video_id=video_id, db=mongodb.db)
-        await step_20_00_transcribe_video(video_id=video_id, db=mongodb.db)
-        await step_30_00_make_scenes(video_id=video_id, db=mongodb.db)
-
-        # Run steps 40 and 50 in parallel using asyncio.gather
-        await asyncio.gather(
-            step_40_00_extract_clips(video_id=video_id, db=mongodb.db),
-            step_50_00_generate_audio(video_id=video_id, db=mongodb.db)
-        )
-
-        await step_60_00_add_voiceover(video_id=video_id, db=mongodb.db)
-        await step_70_00_assemble_video(video_id=video_id, db=mongodb.db)
+        # Execute pipeline steps as soon as their dependencies complete
+        await executor.run(per_step_kwargs, completed_steps, video_id=video_id, db=mongodb.db)
+        return True
     except Exception as e:
-        print(f"Pipeline failed: {str(e)}")
+        print(f"Pipeline failed for video {video_id}: {str(e)}")
+        return False
     finally:
-        mongodb.client.close()
-
+        executor.print_report()
@@ -0,0 +1,38 @@
+"""
+Admission control for running many pipelines in one process.
+
+Steps are admitted through one semaphore per resource class (STEP_RESOURCE_CLASSES), so
+CPU-bound media steps and network-bound API steps of different videos are capped
+independently: a burst of transcriptions never starves rendering of slots, and a
+render-heavy backlog does not hold up API calls that would otherwise just be waiting.
+"""
+
+import asyncio
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..common.static import STEP_RESOURCE_CLASSES
+
+
+class AdmissionController:
+    def __init__(self, slots: Dict[str, int]):
+        self.slots = dict(slots)
+        self._semaphores = {resource_class: asyncio.Semaphore(max(1, count))
+                            for resource_class, count in slots.items()}
+
+    def wrap(self, step_name: str, step: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        """Wrap a step function so it only runs while holding a slot of its resource class"""
+        semaphore: Optional[asyncio.Semaphore] = self._semaphores.get(STEP_RESOURCE_CLASSES.get(step_name))
+        if semaphore is None:
+            return step
+
+        @wraps(step)
+        async def admitted(*args, **kwargs):
+            async with semaphore:
+                return await step(*args, **kwargs)
+
+        return admitted
+
+    def wrap_all(self, step_functions: Dict[str, Callable[..., Awaitable[Any]]]) -> Dict[str, Callable[..., Awaitable[Any]]]:
+        """Wrap every step function of a step table"""
+        return {step_name: self.wrap(step_name, step) for step_name, step in step_functions.items()}
@@ -0,0 +1,185 @@
+"""
+Dependency-graph executor for pipeline steps.
+
+Reads a step dependency table (STEP_DEPENDENCIES by default), starts every step as soon as
+all of its dependencies have finished and runs independent branches concurrently. After a
+run it exposes the critical path and the slack of every step, computed from measured durations.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Collection, Dict, List, Optional, Set
+
+from ..common.static import STEP_DEPENDENCIES
+
+
+class DagCycleError(Exception):
+    """Custom exception for cyclic or inconsistent dependency tables"""
+    pass
+
+
+class DagStepSkippedError(Exception):
+    """Custom exception for steps skipped because a dependency failed"""
+    pass
+
+
+@dataclass
+class StepTiming:
+    start: float
+    end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class DagExecutor:
+    def __init__(self,
+                 step_functions: Dict[str, Callable[..., Awaitable[Any]]],
+                 dependencies: Optional[Dict[str, List[str]]] = None):
+        self.dependencies = dependencies if dependencies is not None else STEP_DEPENDENCIES
+        self.step_functions = step_functions
+        self.order = self._topological_order()
+        self.timings: Dict[str, StepTiming] = {}
+        self.errors: Dict[str, BaseException] = {}
+        self.completed: Set[str] = set()
+
+    def _topological_order(self) -> List[str]:
+        """Validate the dependency table and return the steps in topological order"""
+        for step_name, deps in self.dependencies.items():
+            if step_name not in self.step_functions:
+                raise DagCycleError(f"No step function registered for '{step_name}'")
+            for dep_step in deps:
+                if dep_step not in self.dependencies:
+                    raise DagCycleError(f"Step '{step_name}' depends on unknown step '{dep_step}'")
+
+        order: List[str] = []
+        remaining = {step_name: set(deps) for step_name, deps in self.dependencies.items()}
+        while remaining:
+            ready = sorted(step_name for step_name, deps in remaining.items() if not deps)
+            if not ready:
+                raise DagCycleError(f"Dependency cycle between steps: {sorted(remaining)}")
+            for step_name in ready:
+                order.append(step_name)
+                del remaining[step_name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+        return order
+
+    async def run(self,
+                  per_step_kwargs: Optional[Dict[str, Dict[str, Any]]] = None,
+                  completed_steps: Collection[str] = (),
+                  **step_kwargs) -> Dict[str, Any]:
+        """
+        Run every step in the graph, each as soon as its dependencies finish.
+
+        Args:
+            per_step_kwargs (Optional[Dict[str, Dict[str, Any]]]): Extra keyword arguments for individual steps
+            completed_steps (Collection[str]): Steps finished by an earlier run; they are not run
+                again and count as succeeded for their dependents (result None)
+            **step_kwargs: Keyword arguments passed to every step (e.g. video_id, db)
+
+        Returns:
+            Dict[str, Any]: Result of every step keyed by step name
+
+        Raises:
+            Exception: The first step failure, after all running branches have settled
+        """
+        self.timings = {}
+        self.errors = {}
+        self.completed = set(completed_steps)
+        run_start = time.perf_counter()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_step(step_name: str) -> Any:
+            if step_name in self.completed:
+                return None
+
+            dep_results = await asyncio.gather(
+                *[tasks[dep_step] for dep_step in self.dependencies[step_name]],
+                return_exceptions=True)
+            if any(isinstance(result, BaseException) for result in dep_results):
+                raise DagStepSkippedError(f"Step '{step_name}' skipped because a dependency failed")
+
+            start = time.perf_counter() - run_start
+            print(f"[INFO] Starting {step_name} at +{start:.2f}s")
+            try:
+                return await self.step_functions[step_name](
+                    **step_kwargs, **(per_step_kwargs or {}).get(step_name, {}))
+            finally:
+                self.timings[step_name] = StepTiming(start, time.perf_counter() - run_start)
+
+        for step_name in self.order:
+            tasks[step_name] = asyncio.create_task(run_step(step_name), name=step_name)
+
+        results = await asyncio.gather(*tasks.values(), return_exceptions=True)
+
+        for step_name, result in zip(tasks, results):
+            if isinstance(result, BaseException) and not isinstance(result, DagStepSkippedError):
+                self.errors[step_name] = result
+
+        if self.errors:
+            raise next(iter(self.errors.values()))
+
+        return dict(zip(tasks, results))
+
+    def critical_path(self) -> List[str]:
+        """Return the chain of steps that determined the total run time of the last run"""
+        earliest_finish = self._earliest_finish()
+        if not earliest_finish:
+            return []
+
+        path = [max(earliest_finish, key=earliest_finish.get)]
+        while True:
+            deps = [dep_step for dep_step in self.dependencies[path[-1]] if dep_step in earliest_finish]
+            if not deps:
+                break
+            path.append(max(deps, key=earliest_finish.get))
+        return list(reversed(path))
+
+    def slack(self) -> Dict[str, float]:
+        """Return how long each step of the last run could have been delayed without extending the run"""
+        earliest_finish = self._earliest_finish()
+        if not earliest_finish:
+            return {}
+
+        makespan = max(earliest_finish.values())
+        latest_finish: Dict[str, float] = {}
+        for step_name in reversed(self.order):
+            if step_name not in earliest_finish:
+                continue
+            successors = [succ for succ, deps in self.dependencies.items()
+                          if step_name in deps and succ in latest_finish]
+            latest_finish[step_name] = min(
+                (latest_finish[succ] - self.timings[succ].duration for succ in successors),
+                default=makespan)
+
+        return {step_name: latest_finish[step_name] - earliest_finish[step_name]
+                for step_name in self.order if step_name in earliest_finish}
+
+    def _earliest_finish(self) -> Dict[str, float]:
+        """Earliest finish time of each timed step given measured durations and unlimited parallelism"""
+        earliest_finish: Dict[str, float] = {}
+        for step_name in self.order:
+            if step_name not in self.timings:
+                continue
+            earliest_start = max((earliest_finish[dep_step] for dep_step in self.dependencies[step_name]
+                                  if dep_step in earliest_finish), default=0.0)
+            earliest_finish[step_name] = earliest_start + self.timings[step_name].duration
+        return earliest_finish
+
+    def print_report(self) -> None:
+        """Print per-step durations, slack and the critical path of the last run"""
+        slack = self.slack()
+        for step_name in self.order:
+            timing = self.timings.get(step_name)
+            if step_name in self.completed:
+                print(f"[INFO] {step_name}: completed earlier")
+                continue
+            if timing is None:
+                print(f"[INFO] {step_name}: not run")
+                continue
+            print(f"[INFO] {step_name}: {timing.duration:.2f}s "
+                  f"(+{timing.start:.2f}s -> +{timing.end:.2f}s, slack {slack.get(step_name, 0.0):.2f}s)")
+        print(f"[INFO] Critical path: {' -> '.join(self.critical_path())}")
@@ -0,0 +1,120 @@
+"""
+Worker node that runs pipeline steps leased from the MongoDB job queue.
+
+A node subscribes to a set of step types, typically one resource class from
+STEP_RESOURCE_CLASSES (render-heavy "cpu" nodes for steps 10/40/60/70, "api" nodes for
+steps 20/30/50), so each node class can be sized independently. While a step runs, its
+lease is renewed every third of the visibility timeout; if the lease is lost the step is
+cancelled, since another node may already be running it. Completing a step queues the
+steps that became runnable, so pipelines advance across nodes without a coordinator.
+
+Configuration (environment variables):
+    JOB_WORKER_CONCURRENCY: Jobs run at once by this node (default: 2)
+    JOB_POLL_SECONDS: Idle delay between lease attempts when the queue is empty (default: 2)
+"""
+
+import asyncio
+import os
+import random
+import traceback
+from typing import Any, Dict, List, Optional
+
+from ..common.decorators.step_tracker import StepTracker, StepInProgressError
+from ..common.static import STEP_RESOURCE_CLASSES
+from ..db.job_queue import JobQueue
+from ..db.mongo_utils import get_mongodb
+from ..orchestrator import STEP_FUNCTIONS
+from .worker import BaseWorker
+
+
+def steps_for_resource_class(resource_class: str) -> List[str]:
+    """Get the steps of a resource class, e.g. "cpu" or "api" """
+    return [step_name for step_name, step_class in STEP_RESOURCE_CLASSES.items() if step_class == resource_class]
+
+
+class JobWorker(BaseWorker):
+    def __init__(self,
+                 step_names: List[str],
+                 concurrency: Optional[int] = None,
+                 poll_seconds: Optional[float] = None,
+                 shutdown_timeout: Optional[float] = None):
+        super().__init__(shutdown_timeout)
+        unknown = [step_name for step_name in step_names if step_name not in STEP_FUNCTIONS]
+        if unknown:
+            raise ValueError(f"Unknown steps: {unknown}")
+
+        self.step_names = list(step_names)
+        self.concurrency = concurrency or int(os.getenv('JOB_WORKER_CONCURRENCY', 2))
+        self.poll_seconds = poll_seconds or float(os.getenv('JOB_POLL_SECONDS', 2))
+        self.queue: Optional[JobQueue] = None
+
+    async def _keep_lease(self, job: Dict[str, Any], step_task: asyncio.Task) -> None:
+        """Renew the lease while the step runs; cancel the step if the lease is lost"""
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds / 3)
+            if not await self.queue.heartbeat(job):
+                print(f"[WARNING] Lost lease of {job['step_name']} for video {job['video_id']}, cancelling")
+                step_task.cancel()
+                return
+
+    async def _run_job(self, job: Dict[str, Any], db, job_slots: asyncio.Semaphore) -> None:
+        video_id = str(job['video_id'])
+        step_name = job['step_name']
+        tracker = StepTracker(db)
+        try:
+            print(f"[INFO] Running {step_name} for video {video_id} (attempt {job['attempts']})")
+            step_task = asyncio.create_task(STEP_FUNCTIONS[step_name](video_id=video_id, db=db))
+            lease_keeper = asyncio.create_task(self._keep_lease(job, step_task))
+            try:
+                await step_task
+            finally:
+                lease_keeper.cancel()
+
+            queued = await self.queue.complete(job)
+            print(f"[INFO] Completed {step_name} for video {video_id}; queued {queued or 'nothing'}")
+
+        except StepInProgressError:
+            if await tracker.is_step_completed(video_id, step_name):
+                await self.queue.complete(job)
+            else:
+                # Another run holds the step, e.g. a crashed attempt whose claim has not
+                # expired yet; check again once its lease could have run out
+                await self.queue.release(job, delay_seconds=tracker.lease_seconds / 3)
+        except asyncio.CancelledError:
+            if self._stopping.is_set():
+                # Shutting down: the step released its claim, hand the job back for another node
+                await self.queue.release(job)
+            raise
+        except Exception as e:
+            retry = await self.queue.fail(job, f"{str(e)}\n{traceback.format_exc()}")
+            print(f"[WARNING] {step_name} failed for video {video_id}"
+                  f"{', will retry' if retry else ', giving up'}: {str(e)}")
+        finally:
+            job_slots.release()
+
+    async def run(self) -> None:
+        """Lease and run jobs until shutdown is requested"""
+        mongodb = await get_mongodb()
+        self.queue = JobQueue(mongodb.db)
+        print(f"[INFO] Job worker {self.queue.worker_id} subscribed to {', '.join(self.step_names)}")
+
+        job_slots = asyncio.Semaphore(self.concurrency)
+        try:
+            while not self._stopping.is_set():
+                if not await self._until_stopping(job_slots.acquire()):
+                    break
+
+                job = await self.queue.lease(self.step_names)
+                if job is None:
+                    job_slots.release()
+                    await self.queue.fail_exhausted()
+                    # Jitter keeps idle nodes from polling in lockstep
+                    await self._until_stopping(asyncio.sleep(self.poll_seconds * random.uniform(0.5, 1.5)))
+                    continue
+
+                self._start(self._run_job(job, mongodb.db, job_slots),
+                            f"{job['step_name']} of video {job['video_id']}")
+
+            await self._drain()
+        finally:
+            await self.close()
@@ -0,0 +1,165 @@
+"""
+Incremental refresh of a rendered video after scenes were edited.
+
+Every scene artifact carries a checkpoint with a fingerprint of the inputs it was made from
+(see src/db/scene_checkpoints.py), and the output video carries one over its scenes. After
+an editor changes a scene's `polished_narration`, `time_start` or `time_end`, comparing those
+fingerprints with the current scene documents tells exactly which artifacts are stale:
+    - clip: time range or source changed
+    - narration audio: narration text or voice changed
+    - voiceover: its clip or narration is stale
+    - output: any voiceover (or, in render-plan mode, any scene range or narration) changed
+
+A refresh resets only the steps that own stale artifacts and runs the pipeline again. The
+resumed steps skip every scene whose checkpoint is still valid, so an edit to one scene costs
+one TTS call, one clip cut, one voiceover mux and a stream-copy concatenation.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..common.decorators.step_tracker import StepTracker
+from ..db.mongo_utils import get_mongodb
+from ..db.scene_checkpoints import is_checkpoint_valid
+from ..db.scene_queries import get_ordered_scenes, REFRESH_FIELDS
+from ..orchestrator import process_submitted_video
+from ..steps.step_40_00_extract_clips import clip_inputs, get_stored_keyframe_index, smart_cut_enabled
+from ..steps.step_50_00_generate_audio import audio_inputs
+from ..steps.step_60_00_add_voiceover import voiceover_inputs
+from ..steps.step_70_00_assemble_video import assembly_inputs
+from ..steps.step_70_10_render_video import render_inputs, get_render_fps
+
+
+@dataclass
+class StaleArtifacts:
+    """Scene indexes whose artifacts no longer match their inputs"""
+    render_plan: bool
+    clips: List[int] = field(default_factory=list)
+    narrations: List[int] = field(default_factory=list)
+    voiceovers: List[int] = field(default_factory=list)
+    output: bool = False
+
+    def steps(self) -> List[str]:
+        """Steps that have to run again to bring the output up to date"""
+        if self.render_plan:
+            owners = [(self.narrations, "step_50_00_generate_audio"),
+                      (self.output, "step_70_10_render_video")]
+        else:
+            owners = [(self.clips, "step_40_00_extract_clips"),
+                      (self.narrations, "step_50_00_generate_audio"),
+                      (self.voiceovers, "step_60_00_add_voiceover"),
+                      (self.output, "step_70_00_assemble_video")]
+        return [step_name for stale, step_name in owners if stale]
+
+    def describe(self) -> str:
+        parts = [f"{name} of scenes {scenes}"
+                 for name, scenes in (("clips", self.clips),
+                                      ("narrations", self.narrations),
+                                      ("voiceovers", self.voiceovers)) if scenes]
+        if self.output:
+            parts.append("the output")
+        return ", ".join(parts) or "nothing"
+
+
+async def find_stale_artifacts(db: AsyncIOMotorDatabase,
+                               video_id: str,
+                               video_record: Dict[str, Any],
+                               render_plan: bool,
+                               voice: str = "alloy") -> StaleArtifacts:
+    """
+    Compare the checkpoints of a video's scenes and output with their current inputs.
+
+    Args:
+        video_id (str): MongoDB ObjectId of the video document as string
+        video_record (Dict[str, Any]): Video document with `files`, `metadata` and `checkpoints`
+        render_plan (bool): Whether the video was rendered in single-pass render mode
+        voice (str): Voice the narrations are generated with (default: "alloy")
+
+    Returns:
+        StaleArtifacts: The stale artifacts by scene index
+    """
+    scenes = await get_ordered_scenes(db, video_id, REFRESH_FIELDS)
+    if not scenes:
+        raise ValueError(f"No scenes found for video ID: {video_id}")
+
+    video_file_path = video_record['files']['video_file']
+    stale = StaleArtifacts(render_plan=render_plan)
+
+    # Only a stored keyframe index is consulted: building one runs ffprobe over the whole
+    # source and stores it, which a dry run must not do. Without one the cut mode is unknown,
+    # so a clip cut either way is accepted.
+    if render_plan or not smart_cut_enabled():
+        smart_cut_modes = [False]
+    elif await get_stored_keyframe_index(db, video_id, video_record):
+        smart_cut_modes = [True]
+    else:
+        smart_cut_modes = [True, False]
+
+    for scene in scenes:
+        scene_index = scene.get('scene_index', 0)
+        narration_stale = bool(scene.get('polished_narration')) and not is_checkpoint_valid(
+            scene, "audio", audio_inputs(scene['polished_narration'], voice))
+        if narration_stale:
+            stale.narrations.append(scene_index)
+        if render_plan:
+            continue
+
+        clip_stale = not any(
+            is_checkpoint_valid(scene, "clip", clip_inputs(scene, video_file_path, smart_cut))
+            for smart_cut in smart_cut_modes)
+        if clip_stale:
+            stale.clips.append(scene_index)
+        if clip_stale or narration_stale or not is_checkpoint_valid(scene, "voiceover", voiceover_inputs(scene)):
+            stale.voiceovers.append(scene_index)
+
+    if render_plan:
+        output_inputs = render_inputs(video_file_path, scenes, get_render_fps(video_record))
+    else:
+        output_inputs = assembly_inputs(scenes)
+    stale.output = bool(stale.narrations or stale.voiceovers) or not is_checkpoint_valid(
+        video_record, "output", output_inputs)
+
+    return stale
+
+
+async def refresh_video(video_id: str, dry_run: bool = False) -> Optional[StaleArtifacts]:
+    """
+    Re-render only what scene edits made stale in an already rendered video.
+
+    Args:
+        video_id (str): MongoDB ObjectId of the video document as string
+        dry_run (bool): Only report the stale artifacts
+
+    Returns:
+        Optional[StaleArtifacts]: What was (or would be) regenerated, None if the pipeline failed
+
+    Raises:
+        ValueError: If the video does not exist or was never rendered
+        StepInProgressError: If a step of the video is running
+    """
+    mongodb = await get_mongodb()
+    db = mongodb.db
+
+    video_record = await db.videos.find_one(
+        {"_id": ObjectId(video_id)}, {"files": 1, "metadata": 1, "steps_status": 1, "checkpoints": 1})
+    if not video_record:
+        raise ValueError(f"Video record not found for ID: {video_id}")
+
+    steps_status = video_record.get('steps_status', {})
+    render_plan = bool(steps_status.get("step_70_10_render_video_completed"))
+    if not render_plan and not steps_status.get("step_70_00_assemble_video_completed"):
+        raise ValueError(f"Video {video_id} has not been rendered yet; run the pipeline first")
+
+    stale = await find_stale_artifacts(db, video_id, video_record, render_plan)
+    print(f"[INFO] Video {video_id}: stale {stale.describe()}")
+    if dry_run or not stale.steps():
+        return stale
+
+    # Only the owners of stale artifacts run again; the completed steps before them are skipped
+    await StepTracker(db).reset_steps(video_id, stale.steps())
+    print(f"[INFO] Refreshing {', '.join(stale.steps())}")
+    succeeded = await process_submitted_video(video_id, render_plan=render_plan)
+    return stale if succeeded else None
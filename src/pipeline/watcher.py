@@ -0,0 +1,215 @@
+"""
+Watcher service that advances job-queue pipelines as soon as MongoDB reports a change.
+
+Two change streams are watched:
+    - `videos`: an inserted video is submitted to the job queue (following the pipeline
+      named in its optional `pipeline` field, "default" otherwise), and an update that sets
+      a `steps_status.<step>_completed` flag queues the steps that became runnable
+    - `scenes`: an inserted or edited scene re-checks the runnable steps of its video
+
+Only videos that are managed by the job queue are advanced on updates, so pipelines run by
+run_orchestrator.py or run_worker.py are left alone. Changes arriving within
+WATCH_BATCH_SECONDS of each other are coalesced per video, so storing 120 scenes costs one
+check rather than 120. Dispatching is idempotent (one job per video and step), so the
+watcher can run next to the successor queueing of the job workers and in several copies.
+
+The resume token of each stream is stored in `change_stream_tokens` after the changes up to
+it have been dispatched, so a restarted watcher continues where it stopped. If the oplog no
+longer holds that position, the stream restarts from the present and every queue-managed
+video is re-checked once instead. Change streams need a replica set; a local `mongod` must
+be started with `--replSet` and initiated once.
+
+Configuration (environment variables):
+    WATCH_BATCH_SECONDS: How long changes are coalesced before dispatching (default: 1)
+    WATCH_MAX_BATCH: Videos per dispatch when changes keep arriving (default: 100)
+"""
+
+import asyncio
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from ..db.job_queue import JobQueue
+from ..db.mongo_utils import get_mongodb
+from ..db.resume_tokens import load_resume_token, save_resume_token, clear_resume_token
+from .worker import BaseWorker
+
+# Server errors meaning a stored resume token can no longer be resumed from
+# (InvalidResumeToken, ChangeStreamFatalError, ChangeStreamHistoryLost)
+RESUME_TOKEN_LOST_CODES = {260, 280, 286}
+
+# Resume tokens of quiet streams are refreshed this often, so they stay inside the oplog window
+TOKEN_SAVE_INTERVAL_SECONDS = 60
+
+# Maps a change event to {video_id: pipeline}; pipeline None means "as already queued"
+ChangeHandler = Callable[[Dict[str, Any]], Dict[str, Optional[str]]]
+
+
+def _videos_from_video_change(change: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """Videos to advance for a change on `videos`"""
+    video_id = str(change["documentKey"]["_id"])
+    if change["operationType"] == "insert":
+        return {video_id: change.get("fullDocument", {}).get("pipeline", "default")}
+    if change["operationType"] == "replace":
+        return {video_id: None}
+
+    updated_fields = change.get("updateDescription", {}).get("updatedFields", {})
+    for field in updated_fields:
+        if field == "steps_status" or (field.startswith("steps_status.") and field.endswith("_completed")):
+            return {video_id: None}
+    return {}
+
+
+def _videos_from_scene_change(change: Dict[str, Any]) -> Dict[str, Optional[str]]:
+    """Videos to advance for a change on `scenes`"""
+    video_id = (change.get("fullDocument") or {}).get("video_id")
+    return {str(video_id): None} if video_id else {}
+
+
+class PipelineWatcher(BaseWorker):
+    def __init__(self,
+                 batch_seconds: Optional[float] = None,
+                 max_batch: Optional[int] = None,
+                 shutdown_timeout: Optional[float] = None):
+        super().__init__(shutdown_timeout)
+        self.batch_seconds = batch_seconds or float(os.getenv('WATCH_BATCH_SECONDS', 1))
+        self.max_batch = max_batch or int(os.getenv('WATCH_MAX_BATCH', 100))
+        self.db = None
+        self.queue: Optional[JobQueue] = None
+
+    async def _dispatch(self, videos: Dict[str, Optional[str]]) -> None:
+        """Queue the runnable steps of each video"""
+        for video_id, pipeline in videos.items():
+            if pipeline is None:
+                pipeline = await self.queue.get_pipeline(video_id)
+                if pipeline is None:
+                    # Not a job-queue pipeline
+                    continue
+            try:
+                queued = await self.queue.enqueue_ready_steps(video_id, pipeline)
+            except ValueError as e:
+                print(f"[WARNING] Not dispatching video {video_id}: {str(e)}")
+                continue
+            if queued:
+                print(f"[INFO] Video {video_id}: queued {queued}")
+
+    async def _sweep(self) -> None:
+        """Re-check every queue-managed video and start videos that never started"""
+        video_ids = await self.queue.collection.distinct("video_id")
+        await self._dispatch({str(video_id): None for video_id in video_ids})
+
+        not_started = {}
+        async for video in self.db.videos.find({"steps_status": {"$exists": False}}, {"pipeline": 1}):
+            not_started[str(video["_id"])] = video.get("pipeline", "default")
+        await self._dispatch(not_started)
+        print(f"[INFO] Re-checked {len(video_ids)} queued and {len(not_started)} unstarted videos")
+
+    async def _consume(self, stream, stream_name: str, handler: ChangeHandler) -> None:
+        """Dispatch coalesced changes and store the resume token once they are handled"""
+        loop = asyncio.get_running_loop()
+        pending: Dict[str, Optional[str]] = {}
+        batch_started = None
+        last_saved = loop.time()
+
+        while not self._stopping.is_set():
+            change = await self._until_stopping(stream.try_next())
+            if self._stopping.is_set():
+                break
+
+            if change is not None:
+                for video_id, pipeline in handler(change).items():
+                    # A known pipeline (from an insert) wins over "as already queued"
+                    if pending.get(video_id) is None:
+                        pending[video_id] = pipeline
+                if pending and batch_started is None:
+                    batch_started = loop.time()
+
+            if pending and (change is None
+                            or len(pending) >= self.max_batch
+                            or loop.time() - batch_started >= self.batch_seconds):
+                await self._dispatch(pending)
+                pending, batch_started = {}, None
+                await save_resume_token(self.db, stream_name, stream.resume_token)
+                last_saved = loop.time()
+            elif not pending and loop.time() - last_saved >= TOKEN_SAVE_INTERVAL_SECONDS:
+                await save_resume_token(self.db, stream_name, stream.resume_token)
+                last_saved = loop.time()
+
+        if pending:
+            await self._dispatch(pending)
+            await save_resume_token(self.db, stream_name, stream.resume_token)
+
+    async def _watch(self,
+                     stream_name: str,
+                     pipeline: List[Dict[str, Any]],
+                     handler: ChangeHandler,
+                     full_document: Optional[str] = None) -> None:
+        """Watch one collection until shutdown, resuming from the stored token after errors"""
+        failures = 0
+        sweep_needed = False
+        while not self._stopping.is_set():
+            resume_token = await load_resume_token(self.db, stream_name)
+            try:
+                async with self.db[stream_name].watch(
+                        pipeline,
+                        full_document=full_document,
+                        start_after=resume_token,
+                        max_await_time_ms=int(self.batch_seconds * 1000)) as stream:
+                    if resume_token is None:
+                        await save_resume_token(self.db, stream_name, stream.resume_token)
+                    print(f"[INFO] Watching {stream_name}"
+                          f"{' from the stored resume token' if resume_token else ''}")
+                    failures = 0
+                    if sweep_needed:
+                        # Only once the new stream is open, so changes made during the sweep
+                        # are still delivered by it rather than falling between the two
+                        await self._sweep()
+                        sweep_needed = False
+                    await self._consume(stream, stream_name, handler)
+
+            except OperationFailure as e:
+                if resume_token is None or e.code not in RESUME_TOKEN_LOST_CODES:
+                    raise
+                print(f"[WARNING] Cannot resume {stream_name} ({str(e)}), re-checking all videos")
+                await clear_resume_token(self.db, stream_name)
+                sweep_needed = True
+
+            except PyMongoError as e:
+                failures += 1
+                delay = min(2 ** failures, 60)
+                print(f"[WARNING] Change stream on {stream_name} failed ({str(e)}), reconnecting in {delay}s")
+                await self._until_stopping(asyncio.sleep(delay))
+
+    async def run(self) -> None:
+        """Watch videos and scenes until shutdown is requested"""
+        mongodb = await get_mongodb()
+        self.db = mongodb.db
+        self.queue = JobQueue(self.db)
+
+        operation_types = {"$match": {"operationType": {"$in": ["insert", "update", "replace"]}}}
+        watches = [
+            self._start(self._watch(
+                "videos",
+                [operation_types, {"$project": {"operationType": 1, "documentKey": 1,
+                                                "updateDescription.updatedFields": 1,
+                                                "fullDocument.pipeline": 1}}],
+                _videos_from_video_change), "videos watch"),
+            self._start(self._watch(
+                "scenes",
+                [operation_types, {"$project": {"operationType": 1, "documentKey": 1,
+                                                "fullDocument.video_id": 1}}],
+                _videos_from_scene_change,
+                full_document="updateLookup"), "scenes watch"),
+        ]
+
+        try:
+            # A watch only returns early if it failed; stop the other one too
+            await self._until_stopping(asyncio.wait(watches, return_when=asyncio.FIRST_COMPLETED))
+            self.request_shutdown()
+            await self._drain()
+            for watch in watches:
+                if not watch.cancelled() and watch.exception():
+                    raise watch.exception()
+        finally:
+            await self.close()
@@ -0,0 +1,142 @@
+"""
+Long-running worker that processes many videos concurrently in one process.
+
+Video IDs are taken from an asyncio queue (fed from the command line, stdin or any other
+source) and each runs through process_submitted_video. Concurrency is bounded at two levels:
+    - WORKER_MAX_VIDEOS pipelines run at once; further IDs stay in the queue
+    - within them, steps are admitted per resource class: WORKER_CPU_SLOTS for media steps
+      and WORKER_API_SLOTS for steps waiting on Rev AI, Gemini or OpenAI
+
+All pipelines share one MongoDB client, media process pool and transcription job manager
+for the lifetime of the worker. On shutdown no new videos are started; running pipelines
+get WORKER_SHUTDOWN_TIMEOUT seconds to finish before they are cancelled, and the shared
+resources are closed afterwards.
+"""
+
+import asyncio
+import os
+from typing import Dict, Optional, Set
+
+from dotenv import load_dotenv
+
+from ..common.services.media_executor import MediaExecutor, get_media_executor
+from ..common.services.transcription_job_manager import close_transcription_job_manager
+from ..db.mongo_utils import get_mongodb, close_mongodb
+from ..orchestrator import process_submitted_video
+from .admission import AdmissionController
+
+
+class BaseWorker:
+    """Shutdown handling shared by the workers: stop intake, drain, then close shared resources"""
+
+    def __init__(self, shutdown_timeout: Optional[float] = None):
+        load_dotenv()
+        self.shutdown_timeout = shutdown_timeout if shutdown_timeout is not None else float(
+            os.getenv('WORKER_SHUTDOWN_TIMEOUT', 300))
+        self._stopping = asyncio.Event()
+        self._tasks: Set[asyncio.Task] = set()
+
+    def request_shutdown(self) -> None:
+        """Stop taking new work; running work is allowed to finish"""
+        if not self._stopping.is_set():
+            print("[INFO] Shutdown requested, no new work will be started")
+            self._stopping.set()
+
+    async def _until_stopping(self, awaitable) -> Optional[object]:
+        """Await something unless shutdown is requested first; returns None on shutdown"""
+        task = asyncio.ensure_future(awaitable)
+        stop = asyncio.create_task(self._stopping.wait())
+        await asyncio.wait({task, stop}, return_when=asyncio.FIRST_COMPLETED)
+        stop.cancel()
+        if task.done():
+            return task.result()
+        task.cancel()
+        return None
+
+    def _start(self, coroutine, name: str) -> asyncio.Task:
+        """Start tracked work that shutdown waits for"""
+        task = asyncio.create_task(coroutine, name=name)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _drain(self) -> None:
+        """Wait for running work, cancelling what still runs after the shutdown timeout"""
+        if self._tasks and not self._stopping.is_set():
+            print(f"[INFO] Waiting for {len(self._tasks)} running tasks...")
+            await self._until_stopping(asyncio.wait(set(self._tasks)))
+
+        if not self._tasks:
+            return
+        print(f"[INFO] Giving {len(self._tasks)} running tasks {self.shutdown_timeout:g}s to finish...")
+        _, pending = await asyncio.wait(set(self._tasks), timeout=self.shutdown_timeout)
+        for task in pending:
+            print(f"[WARNING] Cancelling {task.get_name()}")
+            task.cancel()
+        if pending:
+            await asyncio.wait(pending)
+
+    async def close(self) -> None:
+        """Close the resources shared by all pipelines"""
+        await close_transcription_job_manager()
+        await close_mongodb()
+        # Not get_media_executor(), which would start a pool just to shut it down
+        MediaExecutor().shutdown()
+
+
+class PipelineWorker(BaseWorker):
+    def __init__(self,
+                 max_videos: Optional[int] = None,
+                 cpu_slots: Optional[int] = None,
+                 api_slots: Optional[int] = None,
+                 shutdown_timeout: Optional[float] = None,
+                 streaming: bool = False,
+                 render_plan: bool = False):
+        super().__init__(shutdown_timeout)
+        self.max_videos = max_videos or int(os.getenv('WORKER_MAX_VIDEOS', 4))
+        self.admission = AdmissionController({
+            "cpu": cpu_slots or int(os.getenv('WORKER_CPU_SLOTS', 2)),
+            "api": api_slots or int(os.getenv('WORKER_API_SLOTS', 8)),
+        })
+        self.streaming = streaming
+        self.render_plan = render_plan
+        self.results: Dict[str, bool] = {}
+
+    async def _process(self, video_id: str, video_slots: asyncio.Semaphore) -> None:
+        try:
+            print(f"[INFO] Processing video ID: {video_id}")
+            self.results[video_id] = await process_submitted_video(
+                video_id, streaming=self.streaming, render_plan=self.render_plan, admission=self.admission)
+        finally:
+            video_slots.release()
+
+    async def run(self, video_ids: asyncio.Queue) -> Dict[str, bool]:
+        """
+        Process video IDs from the queue until it yields None or shutdown is requested.
+
+        Returns:
+            Dict[str, bool]: Whether each started video's pipeline succeeded
+        """
+        # Open the shared resources once, up front
+        await get_mongodb()
+        get_media_executor()
+
+        video_slots = asyncio.Semaphore(self.max_videos)
+        try:
+            while not self._stopping.is_set():
+                # Take a video ID only once a pipeline slot is free, so queued IDs stay
+                # available to other consumers in the meantime
+                if not await self._until_stopping(video_slots.acquire()):
+                    break
+                video_id = await self._until_stopping(video_ids.get())
+                if video_id is None:
+                    video_slots.release()
+                    break
+
+                self._start(self._process(video_id, video_slots), f"pipeline of video {video_id}")
+
+            await self._drain()
+        finally:
+            await self.close()
+
+        return self.results
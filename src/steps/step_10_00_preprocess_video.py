@@ -6,30 +6,39 @@ a MongoDB database, extract video metadata, and generate audio files from videos
 Functions:
     step_10_00_preprocess_video(video_id: str, db: AsyncIOMotorDatabase) -> None:
         Preprocess a video by extracting metadata and generating an audio file.
-    _extract_video_metadata(video_file: str) -> Dict[str, Optional[float]]:
-        Extract basic metadata from the video file.
-    _generate_audio_from_video(video_file: str, audio_path: Path) -> None:
-        Generate audio from the given video file and save it.
+
+Metadata and audio come from media_manager.preprocess_media: one ffprobe call and one
+ffmpeg pass. AUDIO_EXTRACTION_MODE selects a compact speech encode ("speech", default)
+or a stream copy of the source audio track ("copy").
 """
 import os
 from pathlib import Path
+from typing import Optional
 
 from bson import ObjectId
 from dotenv import load_dotenv
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
-from ..common.services.media_manager import extract_video_metadata, generate_audio_from_video
+from ..common.services.media_executor import preprocess_media_async
 from ..common.decorators.step_tracker import track_step
+from ..common.utils.hash_utils import compute_file_hash_async
+from ..db.media_fingerprints import claim_fingerprint, record_preprocessing
 
 
 @track_step
-async def step_10_00_preprocess_video(video_id: str, db: AsyncIOMotorDatabase) -> None:
+async def step_10_00_preprocess_video(video_id: str,
+                                      db: AsyncIOMotorDatabase,
+                                      video_record: Optional[dict] = None) -> None:
     """
     Preprocess a video by extracting metadata and generating audio file.
 
+    The source file is content-hashed first; if the same content was preprocessed for an
+    earlier upload, its metadata and extracted audio are reused instead.
+
     Args:
         video_id (str): MongoDB ObjectId of the video document as string
         db (AsyncIOMotorDatabase): MongoDB database connection
+        video_record (Optional[dict]): Video document provided by the step tracker claim
 
     Raises:
         ValueError: If video record is not found or video processing fails
@@ -39,8 +48,9 @@ async def step_10_00_preprocess_video(video_id: str, db: AsyncIOMotorDatabase) -
         # Load environment variables
         load_dotenv()
 
-        # Fetch video record
-        video_record = await db.videos.find_one({"_id": ObjectId(video_id)})
+        # Fetch video record unless the step tracker already provided it
+        if video_record is None:
+            video_record = await db.videos.find_one({"_id": ObjectId(video_id)})
         if not video_record:
             raise ValueError(f"Video record not found for ID: {video_id}")
 
@@ -48,17 +58,27 @@ async def step_10_00_preprocess_video(video_id: str, db: AsyncIOMotorDatabase) -
 
         print("Starting video preprocessing...")
 
-        # Extract video metadata
-        video_metadata = extract_video_metadata(video_file)
+        # Look up earlier uploads of the same content
+        content_hash = await compute_file_hash_async(video_file)
+        fingerprint = await claim_fingerprint(db, content_hash, video_id)
+        reused_audio = fingerprint.get('audio_file')
+
+        if reused_audio and os.path.exists(reused_audio):
+            print(f"[INFO] Reusing preprocessing of video {fingerprint['owner_video_id']}")
+            video_metadata = fingerprint['metadata']
+            audio_path = reused_audio
+        else:
+            # Setup audio file path
+            base_dir = Path(os.getenv('BASE_DIR', ''))
+            audio_dir = base_dir / f"{video_id}/audio_files"
+            audio_dir.mkdir(parents=True, exist_ok=True)
+            audio_path = audio_dir / f"{video_id}_audio.mp3"
 
-        # Setup audio file path
-        base_dir = Path(os.getenv('BASE_DIR', ''))
-        audio_dir = base_dir / f"{video_id}/audio_files"
-        audio_dir.mkdir(parents=True, exist_ok=True)
-        audio_path = audio_dir / f"{video_id}_audio.mp3"
+            # Extract metadata and audio file in a single probe and a single ffmpeg pass
+            video_metadata, audio_path = await preprocess_media_async(
+                video_file, audio_path, os.getenv('AUDIO_EXTRACTION_MODE', 'speech'))
 
-        # Generate audio file
-        generate_audio_from_video(video_file, audio_path)
+            await record_preprocessing(db, content_hash, video_metadata, str(audio_path))
 
         # Update database with metadata and audio file path
         await db.videos.update_one(
@@ -66,7 +86,8 @@ async def step_10_00_preprocess_video(video_id: str, db: AsyncIOMotorDatabase) -
             {
                 "$set": {
                     "metadata": video_metadata,
-                    "files.audio_file": str(audio_path)
+                    "files.audio_file": str(audio_path),
+                    "files.content_hash": content_hash
                 }
             }
         )
@@ -7,6 +7,9 @@ Functions:
         Fetch transcription for a video's audio file using Rev AI service.
 """
 
+import os
+from typing import Optional
+
 from bson import ObjectId
 from dotenv import load_dotenv
 from motor.motor_asyncio import AsyncIOMotorDatabase
@@ -14,15 +17,22 @@ from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from ..common.decorators.step_tracker import track_step
 from ..common.services.transcription_manager import process_transcription
+from ..db.media_fingerprints import find_fingerprint, record_transcription
 
 @track_step
-async def step_20_00_transcribe_video(video_id: str, db: AsyncIOMotorDatabase) -> None:
+async def step_20_00_transcribe_video(video_id: str,
+                                      db: AsyncIOMotorDatabase,
+                                      video_record: Optional[dict] = None,
+                                      chunked: Optional[bool] = None) -> None:
     """
     Fetch transcription for a video's audio file using Rev AI service.
 
     Args:
         video_id (str): MongoDB ObjectId of the video document as string
         db (AsyncIOMotorDatabase): MongoDB database connection
+        video_record (Optional[dict]): Video document provided by the step tracker claim
+        chunked (Optional[bool]): Transcribe silence-split segments of the audio concurrently
+            (default: TRANSCRIPTION_CHUNKED environment variable)
 
     Raises:
         ValueError: If audio file not found or Rev AI token is missing
@@ -32,8 +42,9 @@ async def step_20_00_transcribe_video(video_id: str, db: AsyncIOMotorDatabase) -
         # Load environment variables
         load_dotenv()
 
-        # Fetch video record
-        video_record = await db.videos.find_one({"_id": ObjectId(video_id)})
+        # Fetch video record unless the step tracker already provided it
+        if video_record is None:
+            video_record = await db.videos.find_one({"_id": ObjectId(video_id)})
         if not video_record:
             raise ValueError(f"Video record not found for ID: {video_id}")
 
@@ -41,8 +52,24 @@ async def step_20_00_transcribe_video(video_id: str, db: AsyncIOMotorDatabase) -
         if not audio_file:
             raise ValueError(f"Audio file not found for video ID: {video_id}")
 
-        # Initialize Rev AI client and submit job
-        transcription_result = await process_transcription(audio_file)
+        # Reuse the transcription of an earlier upload with the same content
+        content_hash = video_record.get('files', {}).get('content_hash')
+        fingerprint = await find_fingerprint(db, content_hash)
+        source_record = None
+        if fingerprint and fingerprint.get('transcription_video_id'):
+            source_record = await db.transcriptions.find_one(
+                {"video_id": fingerprint['transcription_video_id']},
+                {"transcription": 1}
+            )
+
+        if source_record:
+            print(f"[INFO] Reusing transcription of video {fingerprint['transcription_video_id']}")
+            transcription_result = source_record['transcription']
+        else:
+            # Initialize Rev AI client and submit job
+            if chunked is None:
+                chunked = os.getenv('TRANSCRIPTION_CHUNKED', 'false').lower() == 'true'
+            transcription_result = await process_transcription(audio_file, chunked=chunked)
 
         # Update database with transcription
         await db.transcriptions.insert_one(
@@ -52,6 +79,9 @@ async def step_20_00_transcribe_video(video_id: str, db: AsyncIOMotorDatabase) -
             }
         )
 
+        if content_hash and not source_record:
+            await record_transcription(db, content_hash, video_id)
+
         print("Transcription process completed successfully")
 
     except Exception as e:
@@ -3,24 +3,59 @@ This file provides functionality to generate scene breakdowns from video transcr
 It includes functions to process transcriptions and create structured scene data.
 """
 
+import asyncio
+import os
+from typing import Any, Dict, List, Optional
+
 from bson import ObjectId
 from dotenv import load_dotenv
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from ..db.bulk_writer import insert_scenes
 from ..common.utils.json_utils import load_json_from_string
-from ..common.services.content_generation_manager import generate_content
+from ..common.utils.transcript_utils import (
+    extract_sentences, format_sentences, chunk_sentences, merge_chunk_scenes)
+from ..common.services.content_generation_manager import (
+    generate_content_async, DEFAULT_MODEL, DEFAULT_GENERATION_CONFIG)
 from ..common.decorators.step_tracker import track_step
-from ..common.static import prompt_template
+from ..common.static import prompt_template, PROMPT_TEMPLATE_VERSION
+from ..db.scene_cache import make_scene_cache_key, get_cached_scenes, store_cached_scenes
+
+
+async def _generate_chunk_scenes(chunk: Dict[str, Any],
+                                 word_level: bool,
+                                 semaphore: asyncio.Semaphore) -> List[Dict[str, Any]]:
+    """Generate the scenes of a single transcript chunk"""
+    transcript = format_sentences(chunk['sentences'], word_level)
+    revised_prompt = prompt_template.replace('{transcript}', transcript)
+
+    async with semaphore:
+        response = await generate_content_async(revised_prompt, DEFAULT_MODEL, DEFAULT_GENERATION_CONFIG)
+
+    return load_json_from_string(response.text)['steps']
 
 
 @track_step
-async def step_30_00_make_scenes(video_id: str, db: AsyncIOMotorDatabase) -> str:
+async def step_30_00_make_scenes(video_id: str,
+                                 db: AsyncIOMotorDatabase,
+                                 scene_queue: Optional[asyncio.Queue] = None,
+                                 use_cache: bool = True,
+                                 word_level: bool = False,
+                                 chunked: Optional[bool] = None) -> str:
     """
     Generate scene breakdowns from video transcription using Gemini AI service.
 
     Args:
         video_id (str): MongoDB ObjectId of the video document as string
         db (AsyncIOMotorDatabase): MongoDB database connection
+        scene_queue (Optional[asyncio.Queue]): If given, every stored scene is put on the
+            queue once it is inserted, followed by None once all scenes are stored
+        use_cache (bool): Reuse a cached generation for the same transcript, prompt version,
+            model and generation config; False bypasses the cache and regenerates
+        word_level (bool): Include word-level timestamps in the compact transcript sent to the LLM
+        chunked (Optional[bool]): Split the transcript into overlapping chunks, generate their
+            scenes concurrently and merge them. None enables it for transcripts longer than
+            SCENE_CHUNK_THRESHOLD_SECONDS (default: 1800)
 
     Returns:
         str: Video ID of the processed document
@@ -35,26 +70,60 @@ async def step_30_00_make_scenes(video_id: str, db: AsyncIOMotorDatabase) -> str
 
         # Fetch transcription record
         transcription_record = await db.transcriptions.find_one(
-            {"video_id": ObjectId(video_id)}
+            {"video_id": ObjectId(video_id)},
+            {"transcription": 1}
         )
 
         if not transcription_record:
             raise ValueError(f"Transcription record not found for video ID: {video_id}")
 
-        # Prepare and send prompt to Content Generation Service
-        print("[INFO] Preparing prompt for scene generation...")
-        transcript_dict = str(transcription_record['transcription'])
-        revised_prompt = prompt_template.replace('{transcription_dict}', transcript_dict)
+        # Decide between a single prompt and map-reduce over transcript chunks
+        sentences = extract_sentences(transcription_record['transcription'])
+        duration = sentences[-1]['end'] - sentences[0]['start'] if sentences else 0.0
+        if chunked is None:
+            chunked = duration > float(os.getenv('SCENE_CHUNK_THRESHOLD_SECONDS', 1800))
+        chunk_seconds = float(os.getenv('SCENE_CHUNK_SECONDS', 600))
+        overlap_sentences = int(os.getenv('SCENE_CHUNK_OVERLAP_SENTENCES', 2))
 
-        print("[INFO] Generating scenes...")
-        response = generate_content(revised_prompt)
+        # Serve re-runs from the scene generation cache unless bypassed
+        prompt_version = f"{PROMPT_TEMPLATE_VERSION}-words" if word_level else PROMPT_TEMPLATE_VERSION
+        if chunked:
+            prompt_version = f"{prompt_version}-chunked-{chunk_seconds:g}-{overlap_sentences}"
+        cache_key = make_scene_cache_key(transcription_record['transcription'],
+                                         prompt_version,
+                                         DEFAULT_MODEL,
+                                         DEFAULT_GENERATION_CONFIG)
+        scenes_data = await get_cached_scenes(db, cache_key) if use_cache else None
 
-        print("[INFO] Scene generation completed successfully")
-        scenes_data = load_json_from_string(response.text)
+        if scenes_data:
+            print("[INFO] Reusing cached scene generation")
+        elif chunked:
+            chunks = chunk_sentences(sentences, chunk_seconds, overlap_sentences)
+            print(f"[INFO] Generating scenes for {len(chunks)} transcript chunks...")
+            semaphore = asyncio.Semaphore(int(os.getenv('SCENE_CHUNK_CONCURRENCY', 4)))
+            chunk_scenes = await asyncio.gather(*[
+                _generate_chunk_scenes(chunk, word_level, semaphore) for chunk in chunks
+            ])
+
+            print("[INFO] Scene generation completed successfully")
+            scenes_data = {"steps": merge_chunk_scenes(chunks, chunk_scenes)}
+            await store_cached_scenes(db, cache_key, scenes_data)
+        else:
+            # Prepare and send prompt to Content Generation Service
+            print("[INFO] Preparing prompt for scene generation...")
+            transcript = format_sentences(sentences, word_level)
+            revised_prompt = prompt_template.replace('{transcript}', transcript)
+
+            print("[INFO] Generating scenes...")
+            response = await generate_content_async(revised_prompt, DEFAULT_MODEL, DEFAULT_GENERATION_CONFIG)
+
+            print("[INFO] Scene generation completed successfully")
+            scenes_data = load_json_from_string(response.text)
+            await store_cached_scenes(db, cache_key, scenes_data)
 
         # Process and store scene data
-        for index, scene in enumerate(scenes_data['steps']):
-            await db.scenes.insert_one({
+        scene_records = [
+            {
                 "video_id": ObjectId(video_id),
                 "scene_index": index,
                 "title": scene['title'],
@@ -62,7 +131,15 @@ async def step_30_00_make_scenes(video_id: str, db: AsyncIOMotorDatabase) -> str
                 "time_end": scene['time_end'],
                 "original_narration": scene['original_narration'],
                 "polished_narration": scene['polished_narration']
-            })
+            }
+            for index, scene in enumerate(scenes_data['steps'])
+        ]
+        await insert_scenes(db, scene_records)
+
+        if scene_queue is not None:
+            for scene_record in scene_records:
+                await scene_queue.put(scene_record)
+            await scene_queue.put(None)
 
     except Exception as e:
         raise RuntimeError(f"Scene generation process failed: {str(e)}") from e
@@ -1,26 +1,143 @@
 """
-This function handles the extraction of video clips based on scene timestamps using moviepy.
+This function handles the extraction of video clips based on scene timestamps.
 It processes scenes from the database and creates corresponding video clips.
+
+Clips are cut frame-accurately with a smart cut (whole GOPs stream-copied, boundary GOPs
+re-encoded) driven by a keyframe index that is built once per video and stored on the
+video record. CLIP_SMART_CUT=false restores plain keyframe-aligned stream-copy cuts.
 """
 
+import asyncio
 import os
+import time
 from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
 from bson import ObjectId
 
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from ..common.decorators.step_tracker import track_step
-from ..common.services.media_manager import trim_video
+from ..db.scene_queries import get_ordered_scenes, CLIP_FIELDS
+from ..db.bulk_writer import BulkUpdateBuffer
+from ..db.scene_checkpoints import fingerprint_inputs, checkpoint_fields, set_checkpoint, is_checkpoint_valid
+from ..common.utils.async_utils import gather_all
+from ..common.services.media_executor import get_media_executor, trim_video_async, build_keyframe_index_async
+
+
+def smart_cut_enabled() -> bool:
+    """Whether clips are cut frame-accurately (CLIP_SMART_CUT, default: true)"""
+    return os.getenv('CLIP_SMART_CUT', 'true').lower() == 'true'
+
+
+async def get_stored_keyframe_index(db: AsyncIOMotorDatabase,
+                                    video_id: str,
+                                    video_record: dict) -> Optional[Dict[str, Any]]:
+    """Load the stored keyframe index of a video if it was built from the current source"""
+    content_hash = video_record.get('files', {}).get('content_hash')
+    stored = await db.videos.find_one({"_id": ObjectId(video_id)}, {"keyframe_index": 1})
+    keyframe_index = (stored or {}).get('keyframe_index')
+    if keyframe_index and keyframe_index.get('content_hash') == content_hash:
+        return keyframe_index
+    return None
+
+
+async def get_keyframe_index(db: AsyncIOMotorDatabase,
+                             video_id: str,
+                             video_record: dict) -> Optional[Dict[str, Any]]:
+    """
+    Load the keyframe index of a video, building and storing it on first use.
+
+    Returns:
+        Optional[Dict[str, Any]]: The index, or None if smart cuts are disabled or the
+            index cannot be built (e.g. ffprobe is unavailable)
+    """
+    if not smart_cut_enabled():
+        return None
+
+    keyframe_index = await get_stored_keyframe_index(db, video_id, video_record)
+    if keyframe_index:
+        return keyframe_index
+
+    content_hash = video_record.get('files', {}).get('content_hash')
+
+    try:
+        keyframe_index = await build_keyframe_index_async(video_record['files']['video_file'])
+    except (ValueError, FileNotFoundError) as e:
+        print(f"[WARNING] Keyframe index unavailable, cutting at keyframes: {str(e)}")
+        return None
+
+    keyframe_index['content_hash'] = content_hash
+    await db.videos.update_one({"_id": ObjectId(video_id)}, {"$set": {"keyframe_index": keyframe_index}})
+    print(f"[INFO] Indexed {len(keyframe_index['keyframes'])} keyframes")
+    return keyframe_index
+
+
+def clip_inputs(scene: dict, video_file_path: str, smart_cut: bool) -> str:
+    """Fingerprint of what determines a scene clip: source, time range and cut mode"""
+    return fingerprint_inputs(video_file=video_file_path,
+                              time_start=scene['time_start'],
+                              time_end=scene['time_end'],
+                              smart_cut=smart_cut)
+
+
+async def extract_scene_clip(scene_writer: BulkUpdateBuffer,
+                             scene: dict,
+                             video_file_path: str,
+                             clips_dir: Path,
+                             semaphore: asyncio.Semaphore,
+                             keyframe_index: Optional[Dict[str, Any]] = None) -> Optional[Tuple[int, float]]:
+    """
+    Cut a single scene clip, persist its path and return (scene_index, seconds taken).
+
+    Returns None without cutting if the scene's clip checkpoint is valid for its time range.
+    """
+    time_start = scene['time_start']
+    time_end = scene['time_end']
+    inputs = clip_inputs(scene, video_file_path, keyframe_index is not None)
+    if is_checkpoint_valid(scene, "clip", inputs):
+        print(f"[INFO] Clip of scene {scene['_id']} is up to date, skipping")
+        scene['clip_file_path'] = scene['checkpoints']['clip']['path']
+        return None
+
+    async with semaphore:
+        scene_start = time.perf_counter()
+
+        # Generate output path for the clip
+        clip_filename = f"scene_{time_start}_{time_end}.mp4"
+        clip_file_path = os.path.join(clips_dir, clip_filename)
+
+        await trim_video_async(video_file_path,
+                               time_start,
+                               time_end,
+                               clip_file_path,
+                               keyframe_index)
+        elapsed = time.perf_counter() - scene_start
+
+    checkpoint = checkpoint_fields("clip", clip_file_path, inputs)
+    await scene_writer.update_one(
+        {"_id": ObjectId(scene['_id'])},
+        {"$set": {"clip_file_path": clip_file_path, "clip_extraction_time": elapsed, **checkpoint}}
+    )
+    scene['clip_file_path'] = clip_file_path
+    set_checkpoint(scene, checkpoint)
+
+    return scene.get('scene_index', 0), elapsed
 
 
 @track_step
-async def step_40_00_extract_clips(video_id: str, db: AsyncIOMotorDatabase) -> str:
+async def step_40_00_extract_clips(video_id: str,
+                                   db: AsyncIOMotorDatabase,
+                                   concurrency: Optional[int] = None,
+                                   video_record: Optional[dict] = None) -> str:
     """
-    Extract video clips based on scene timestamps using moviepy and update scene records.
+    Extract video clips based on scene timestamps and update scene records.
 
     Args:
         video_id (str): MongoDB ObjectId of the video document as string
         db (AsyncIOMotorDatabase): MongoDB database connection
+        concurrency (Optional[int]): Number of scene cuts to run at once
+            (default: CLIP_EXTRACTION_CONCURRENCY or the media worker count)
+        video_record (Optional[dict]): Video document provided by the step tracker claim
 
     Returns:
         str: Video ID of the processed document
@@ -30,8 +147,9 @@ async def step_40_00_extract_clips(video_id: str, db: AsyncIOMotorDatabase) -> s
         RuntimeError: If clip extraction process fails
     """
     try:
-         # Fetch video record
-        video_record = await db.videos.find_one({"_id": ObjectId(video_id)})
+        # Fetch video record unless the step tracker already provided it
+        if video_record is None:
+            video_record = await db.videos.find_one({"_id": ObjectId(video_id)})
         if not video_record:
             raise ValueError(f"Video record not found for ID: {video_id}")
 
@@ -45,8 +163,8 @@ async def step_40_00_extract_clips(video_id: str, db: AsyncIOMotorDatabase) -> s
         # Ensure clips directory exists
         os.makedirs(clips_dir, exist_ok=True)
 
-        # Fetch all scenes for the video
-        scenes = await db.scenes.find({"video_id": ObjectId(video_id)}).to_list(length=None)
+        # Fetch all scenes for the video in scene order
+        scenes = await get_ordered_scenes(db, video_id, CLIP_FIELDS)
 
         if not scenes:
             raise ValueError(f"No scenes found for video ID: {video_id}")
@@ -54,26 +172,33 @@ async def step_40_00_extract_clips(video_id: str, db: AsyncIOMotorDatabase) -> s
         if not os.path.exists(video_file_path):
             raise ValueError(f"Video file not found at path: {video_file_path}")
 
-        # Process each scene and create clips
-        print("[INFO] Extracting clips...")
-        for scene in scenes:
-            scene_id = scene['_id']
-            time_start = scene['time_start']
-            time_end = scene['time_end']
-
-            # Generate output path for the clip
-            clip_filename = f"scene_{time_start}_{time_end}.mp4"
-            clip_file_path = os.path.join(clips_dir, clip_filename)
-
-            trim_video(video_file_path,
-                       time_start,
-                       time_end,
-                       clip_file_path)
-            
-            db.scenes.update_one(
-                {"_id": ObjectId(scene_id)},
-                {"$set": {"clip_file_path": clip_file_path}}
-            )
+        # Cut scenes concurrently, bounded by the configured limit
+        if concurrency is None:
+            concurrency = int(os.getenv('CLIP_EXTRACTION_CONCURRENCY',
+                                        get_media_executor().max_workers))
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        keyframe_index = await get_keyframe_index(db, video_id, video_record)
+
+        print(f"[INFO] Extracting {len(scenes)} clips with concurrency {concurrency}...")
+        step_start = time.perf_counter()
+
+        # Scenes that fail do not stop the others; every finished clip is checkpointed,
+        # so a re-run only cuts what is missing
+        async with BulkUpdateBuffer(db.scenes) as scene_writer:
+            results = await gather_all(*[
+                extract_scene_clip(scene_writer, scene, video_file_path, clips_dir, semaphore, keyframe_index)
+                for scene in scenes
+            ], description="scene clips")
+        timings = [result for result in results if result is not None]
+
+        # Report per-scene timing
+        for scene_index, elapsed in sorted(timings):
+            print(f"[INFO] Scene {scene_index} clip extracted in {elapsed:.2f}s")
+
+        print(f"[INFO] Extracted {len(timings)} clips in {time.perf_counter() - step_start:.2f}s "
+              f"(sum of cuts {sum(elapsed for _, elapsed in timings):.2f}s, "
+              f"{len(scenes) - len(timings)} up to date)")
 
     except Exception as e:
         raise RuntimeError(f"Clip extraction process failed: {str(e)}") from e
@@ -0,0 +1,130 @@
+"""
+This file contains the per-scene streaming mode of steps 40, 50 and 60.
+Each scene is picked up as soon as step 30 stores it, and its clip cut and TTS run
+concurrently, followed by the voiceover render, independently of the other scenes.
+"""
+import asyncio
+import os
+from pathlib import Path
+from typing import Optional
+
+from bson import ObjectId
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..common.decorators.step_tracker import track_step, StepTracker
+from ..db.scene_queries import get_ordered_scenes, STREAMING_FIELDS
+from ..common.services.media_executor import get_media_executor
+from ..common.static import STREAMING_COVERED_STEPS
+from ..db.bulk_writer import BulkUpdateBuffer
+from ..common.utils.async_utils import gather_all
+from .step_40_00_extract_clips import extract_scene_clip, get_keyframe_index
+from .step_50_00_generate_audio import generate_scene_audio
+from .step_60_00_add_voiceover import add_scene_voiceover
+
+
+async def _process_scene(scene_writer: BulkUpdateBuffer,
+                         scene: dict,
+                         video_file_path: str,
+                         clips_dir: Path,
+                         audio_dir: Path,
+                         voice: str,
+                         clip_semaphore: asyncio.Semaphore,
+                         keyframe_index: Optional[dict]) -> None:
+    """Run the clip, TTS and voiceover chain for a single scene"""
+    await asyncio.gather(
+        extract_scene_clip(scene_writer, scene, video_file_path, clips_dir, clip_semaphore, keyframe_index),
+        generate_scene_audio(scene_writer, scene, audio_dir, voice)
+    )
+    await add_scene_voiceover(scene_writer, scene)
+
+
+@track_step
+async def step_45_00_stream_scenes(video_id: str,
+                                   db: AsyncIOMotorDatabase,
+                                   scene_queue: Optional[asyncio.Queue] = None,
+                                   voice: str = "alloy",
+                                   video_record: Optional[dict] = None) -> str:
+    """
+    Extract clips, generate audio and add voiceovers scene by scene as scenes become available.
+
+    Args:
+        video_id (str): MongoDB ObjectId of the video document as string
+        db (AsyncIOMotorDatabase): MongoDB database connection
+        scene_queue (Optional[asyncio.Queue]): Queue fed by step_30_00_make_scenes; None ends
+            the stream and an exception aborts it. If not given, the stored scenes are used.
+        voice (str): Voice model to use for TTS (default: "alloy")
+        video_record (Optional[dict]): Video document provided by the step tracker claim
+
+    Returns:
+        str: Video ID of the processed document
+
+    Raises:
+        ValueError: If scenes not found or video file is inaccessible
+        RuntimeError: If any scene chain fails
+    """
+    try:
+        # Load environment variables
+        load_dotenv()
+
+        # Fetch video record unless the step tracker already provided it
+        if video_record is None:
+            video_record = await db.videos.find_one({"_id": ObjectId(video_id)})
+        if not video_record:
+            raise ValueError(f"Video record not found for ID: {video_id}")
+
+        video_file_path = video_record['files']['video_file']
+        if not os.path.exists(video_file_path):
+            raise ValueError(f"Video file not found at path: {video_file_path}")
+
+        # Setup output directories
+        base_dir = Path(os.getenv('BASE_DIR', ''))
+        clips_dir = base_dir / f"{video_id}/clips"
+        clips_dir.mkdir(parents=True, exist_ok=True)
+        audio_dir = base_dir / f"{video_id}/gen_audio"
+        audio_dir.mkdir(parents=True, exist_ok=True)
+
+        if scene_queue is None:
+            # Replay the stored scenes through a local queue
+            scenes = await get_ordered_scenes(db, video_id, STREAMING_FIELDS)
+            scene_queue = asyncio.Queue()
+            for scene in scenes:
+                scene_queue.put_nowait(scene)
+            scene_queue.put_nowait(None)
+
+        clip_semaphore = asyncio.Semaphore(max(1, int(os.getenv(
+            'CLIP_EXTRACTION_CONCURRENCY', get_media_executor().max_workers))))
+
+        keyframe_index = await get_keyframe_index(db, video_id, video_record)
+
+        print("[INFO] Streaming scenes...")
+        scene_tasks = []
+        async with BulkUpdateBuffer(db.scenes) as scene_writer:
+            try:
+                while True:
+                    scene = await scene_queue.get()
+                    if scene is None:
+                        break
+                    if isinstance(scene, BaseException):
+                        raise RuntimeError(f"Scene stream aborted: {str(scene)}")
+
+                    scene_tasks.append(asyncio.create_task(_process_scene(
+                        scene_writer, scene, video_file_path, clips_dir, audio_dir, voice, clip_semaphore,
+                        keyframe_index)))
+            except BaseException:
+                for task in scene_tasks:
+                    task.cancel()
+                raise
+
+            await gather_all(*scene_tasks, description="scene chains")
+
+        if not scene_tasks:
+            raise ValueError(f"No scenes found for video ID: {video_id}")
+
+        # The per-scene chains did the work of steps 40, 50 and 60
+        await StepTracker(db).mark_steps_completed(video_id, STREAMING_COVERED_STEPS)
+
+        print(f"[INFO] Streamed {len(scene_tasks)} scenes successfully")
+
+    except Exception as e:
+        raise RuntimeError(f"Scene streaming failed: {str(e)}") from e
@@ -8,7 +8,58 @@ from dotenv import load_dotenv
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from ..common.decorators.step_tracker import track_step
-from ..common.services.voice_generation_manager import generate_speech
+from ..db.scene_queries import get_ordered_scenes, AUDIO_FIELDS
+from ..db.bulk_writer import BulkUpdateBuffer
+from ..db.scene_checkpoints import fingerprint_inputs, checkpoint_fields, set_checkpoint, is_checkpoint_valid
+from ..common.services.voice_generation_manager import generate_speech, get_tts_engine
+from ..common.utils.async_utils import gather_all
+from ..common.services.tts_cache import get_tts_cache
+
+
+def audio_inputs(polished_narration: str, voice: str) -> str:
+    """Fingerprint of what determines a scene's narration audio: text, voice and TTS model"""
+    return fingerprint_inputs(text=polished_narration, voice=voice, model=get_tts_engine().model)
+
+
+async def generate_scene_audio(scene_writer: BulkUpdateBuffer,
+                               scene: dict,
+                               audio_dir: Path,
+                               voice: str) -> None:
+    """Generate the narration audio for a single scene and persist its path"""
+    scene_id = scene['_id']
+    polished_narration = scene.get('polished_narration')
+
+    if not polished_narration:
+        print(f"[WARNING] No narration found for scene {scene_id}")
+        return
+
+    inputs = audio_inputs(polished_narration, voice)
+    if is_checkpoint_valid(scene, "audio", inputs):
+        print(f"[INFO] Audio of scene {scene_id} is up to date, skipping")
+        scene['audio_file_path'] = scene['checkpoints']['audio']['path']
+        return
+
+    print(f"[INFO] Generating audio for scene {scene_id}")
+
+    # Generate audio file path
+    audio_filename = f"scene_{scene_id}.mp3"
+    audio_file_path = os.path.join(audio_dir, audio_filename)
+
+    await generate_speech(
+        polished_narration,
+        audio_file_path,
+        voice
+    )
+
+    # Update scene record with audio file path
+    checkpoint = checkpoint_fields("audio", audio_file_path, inputs)
+    await scene_writer.update_one(
+        {"_id": ObjectId(scene_id)},
+        {"$set": {"audio_file_path": str(audio_file_path), **checkpoint}}
+    )
+    scene['audio_file_path'] = str(audio_file_path)
+    set_checkpoint(scene, checkpoint)
+
 
 @track_step
 async def step_50_00_generate_audio(video_id: str,
@@ -38,38 +89,25 @@ async def step_50_00_generate_audio(video_id: str,
         audio_dir = base_dir / f"{video_id}/gen_audio"
         audio_dir.mkdir(parents=True, exist_ok=True)
 
-        # Fetch all scenes for the video
-        scenes = await db.scenes.find({"video_id": ObjectId(video_id)}).to_list(length=None)
+        # Fetch all scenes for the video in scene order
+        scenes = await get_ordered_scenes(db, video_id, AUDIO_FIELDS)
 
         if not scenes:
             raise ValueError(f"No scenes found for video ID: {video_id}")
 
-        # Process each scene and generate audio
-        print("[INFO] Generating audio files...")
-        for scene in scenes:
-            print(f"[INFO] Generating audio for scene {scene['_id']}")
-            scene_id = scene['_id']
-            polished_narration = scene.get('polished_narration')
-            
-            if not polished_narration:
-                print(f"[WARNING] No narration found for scene {scene_id}")
-                continue
-
-            # Generate audio file path
-            audio_filename = f"scene_{scene_id}.mp3"
-            audio_file_path = os.path.join(audio_dir, audio_filename)
-
-            await generate_speech(
-                polished_narration,
-                audio_file_path,
-                voice
-            )
-
-            # Update scene record with audio file path
-            await db.scenes.update_one(
-                {"_id": ObjectId(scene_id)},
-                {"$set": {"audio_file_path": str(audio_file_path)}}
-            )
+        # Generate audio for all scenes concurrently; the TTS engine enforces
+        # the concurrency and requests-per-minute limits. Scenes that fail do not stop the
+        # others; every finished narration is checkpointed, so a re-run only synthesizes
+        # what is missing
+        print(f"[INFO] Generating audio files for {len(scenes)} scenes...")
+        async with BulkUpdateBuffer(db.scenes) as scene_writer:
+            await gather_all(*[
+                generate_scene_audio(scene_writer, scene, audio_dir, voice)
+                for scene in scenes
+            ], description="scene narrations")
+
+        cache_stats = get_tts_cache().stats()
+        print(f"[INFO] TTS cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
 
     except Exception as e:
         raise RuntimeError(f"Audio generation process failed: {str(e)}") from e
\ No newline at end of file
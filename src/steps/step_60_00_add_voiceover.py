@@ -1,16 +1,70 @@
 """
-This file contains the implementation for adding voiceover audio to video clips using moviepy and updating scene records.
+This file contains the implementation for adding voiceover audio to video clips and updating scene records.
 """
-from bson import ObjectId
+
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from ..common.decorators.step_tracker import track_step
-from ..common.services.media_manager import add_audio_to_video
+from ..db.scene_queries import get_ordered_scenes, VOICEOVER_FIELDS
+from ..db.bulk_writer import BulkUpdateBuffer
+from ..db.scene_checkpoints import fingerprint_inputs, checkpoint_fields, set_checkpoint, is_checkpoint_valid
+from ..common.utils.async_utils import gather_all
+from ..common.services.media_executor import add_audio_to_video_async
+
+
+def voiceover_inputs(scene: dict) -> str:
+    """Fingerprint of what determines a scene's voiceover: its clip and narration audio"""
+    checkpoints = scene.get('checkpoints', {})
+    return fingerprint_inputs(clip_file=scene.get('clip_file_path'),
+                              audio_file=scene.get('audio_file_path'),
+                              clip=checkpoints.get('clip', {}).get('inputs'),
+                              audio=checkpoints.get('audio', {}).get('inputs'))
+
+
+async def add_scene_voiceover(scene_writer: BulkUpdateBuffer, scene: dict) -> None:
+    """Render a single scene's clip with its narration audio and persist the output path"""
+    scene_id = scene['_id']
+    audio_file_path = scene.get('audio_file_path')
+
+    if not audio_file_path:
+        print(f"[WARNING] No audio file found for scene {scene_id}")
+        return
+
+    # Add voiceover to video clip
+    print(f"[INFO] Adding voiceover to scene {scene_id}")
+    video_file_path = scene.get('clip_file_path')
+
+    if not video_file_path:
+        print(f"[WARNING] No video file found for scene {scene_id}")
+        return
+
+    inputs = voiceover_inputs(scene)
+    if is_checkpoint_valid(scene, "voiceover", inputs):
+        print(f"[INFO] Voiceover of scene {scene_id} is up to date, skipping")
+        scene['clip_with_voiceover'] = scene['checkpoints']['voiceover']['path']
+        return
+
+    output_file_path = video_file_path.replace(".mp4", "_voiceover.mp4")
+
+    # Add voiceover to video clip
+    await add_audio_to_video_async(video_file_path, audio_file_path, output_file_path)
+
+    # Update scene record with voiceover file path
+    checkpoint = checkpoint_fields("voiceover", output_file_path, inputs)
+    await scene_writer.update_one(
+        {"_id": scene_id},
+        {"$set": {"clip_with_voiceover": output_file_path, **checkpoint}}
+    )
+    scene['clip_with_voiceover'] = output_file_path
+    set_checkpoint(scene, checkpoint)
+
+    print(f"[INFO] Voiceover added to scene {scene_id}")
+
 
 @track_step
 async def step_60_00_add_voiceover(video_id: str, db: AsyncIOMotorDatabase) -> str:
     """
-    Add voiceover audio to video clips using moviepy and update scene records.
+    Add voiceover audio to video clips and update scene records.
 
     Args:
         video_id (str): MongoDB ObjectId of the video document as string
@@ -24,42 +78,18 @@ async def step_60_00_add_voiceover(video_id: str, db: AsyncIOMotorDatabase) -> s
         RuntimeError: If voiceover addition process fails
     """
     try:
-        # Fetch all scenes for the video
-        scenes = await db.scenes.find({"video_id": ObjectId(video_id)}).to_list(length=None)
+        # Fetch all scenes for the video in scene order
+        scenes = await get_ordered_scenes(db, video_id, VOICEOVER_FIELDS)
 
         if not scenes:
             raise ValueError(f"No scenes found for video ID: {video_id}")
 
-        # Process each scene and generate audio
-        print("[INFO] Generating audio files...")
-        for scene in scenes:
-            scene_id = scene['_id']
-            audio_file_path = scene.get('audio_file_path')
-
-            if not audio_file_path:
-                print(f"[WARNING] No audio file found for scene {scene_id}")
-                continue
-
-            # Add voiceover to video clip
-            print(f"[INFO] Adding voiceover to scene {scene_id}")
-            video_file_path = scene.get('clip_file_path')
-
-            if not video_file_path:
-                print(f"[WARNING] No video file found for scene {scene_id}")
-                continue
-
-            output_file_path = video_file_path.replace(".mp4", "_voiceover.mp4")
-
-            # Add voiceover to video clip
-            add_audio_to_video(video_file_path, audio_file_path, output_file_path)
-
-            # Update scene record with voiceover file path
-            await db.scenes.update_one(
-                {"_id": scene_id},
-                {"$set": {"clip_with_voiceover": output_file_path}}
-            )
-
-            print(f"[INFO] Voiceover added to scene {scene_id}")
+        # Render voiceovers concurrently; the media process pool bounds the parallelism.
+        # Finished voiceovers are checkpointed, so a re-run only renders what is missing
+        print("[INFO] Adding voiceovers...")
+        async with BulkUpdateBuffer(db.scenes) as scene_writer:
+            await gather_all(*[add_scene_voiceover(scene_writer, scene) for scene in scenes],
+                             description="scene voiceovers")
 
     except Exception as e:
         raise RuntimeError(f"Failed to add voiceover: {str(e)}") from e
@@ -1,19 +1,35 @@
 import os
 from pathlib import Path
+from typing import Optional
+
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
 from ..common.decorators.step_tracker import track_step
-from ..common.services.media_manager import concatenate_video_clips
+from ..db.scene_queries import get_ordered_scenes, ASSEMBLY_FIELDS
+from ..db.scene_checkpoints import fingerprint_inputs, checkpoint_fields
+from ..common.services.media_executor import concatenate_video_clips_async
+
+
+def assembly_inputs(scenes: list) -> str:
+    """Fingerprint of what determines the assembled video: the scene voiceovers in order"""
+    return fingerprint_inputs(voiceovers=[
+        scene.get('checkpoints', {}).get('voiceover', {}).get('inputs') or scene.get('clip_with_voiceover')
+        for scene in scenes
+    ])
+
 
 @track_step
-async def step_70_00_assemble_video(video_id: str, db: AsyncIOMotorDatabase) -> str:
+async def step_70_00_assemble_video(video_id: str,
+                                    db: AsyncIOMotorDatabase,
+                                    video_record: Optional[dict] = None) -> str:
     """
-    Assemble video clips with voiceover into a single video file using moviepy and update video record.
+    Assemble video clips with voiceover into a single video file and update video record.
 
     Args:
         video_id (str): MongoDB ObjectId of the video document as string
         db (AsyncIOMotorDatabase): MongoDB database connection
+        video_record (Optional[dict]): Video document provided by the step tracker claim
 
     Returns:
         str: Video ID of the processed document
@@ -23,8 +39,9 @@ async def step_70_00_assemble_video(video_id: str, db: AsyncIOMotorDatabase) ->
         RuntimeError: If video assembly process fails
     """
     try:
-        # Fetch video record
-        video_record = await db.videos.find_one({"_id": ObjectId(video_id)})
+        # Fetch video record unless the step tracker already provided it
+        if video_record is None:
+            video_record = await db.videos.find_one({"_id": ObjectId(video_id)})
         if not video_record:
             raise ValueError(f"Video record not found for ID: {video_id}")
 
@@ -37,8 +54,8 @@ async def step_70_00_assemble_video(video_id: str, db: AsyncIOMotorDatabase) ->
         os.makedirs(output_dir, exist_ok=True)
         filename = f"{video_id}_output.mp4"
 
-        # Fetch all scenes for the video
-        scenes = await db.scenes.find({"video_id": ObjectId(video_id)}).to_list(length=None)
+        # Fetch all scenes for the video in scene order
+        scenes = await get_ordered_scenes(db, video_id, ASSEMBLY_FIELDS)
 
         if not scenes:
             raise ValueError(f"No scenes found for video ID: {video_id}")
@@ -56,12 +73,14 @@ async def step_70_00_assemble_video(video_id: str, db: AsyncIOMotorDatabase) ->
             clips.append(clip_with_voiceover)
 
         # Assemble video clips
-        concatenate_video_clips(clips, os.path.join(output_dir, filename))
+        await concatenate_video_clips_async(clips, os.path.join(output_dir, filename))
 
-        # Update video record with output file path
+        # Update video record with output file path; the checkpoint tells a refresh
+        # whether the output still matches the scenes
         await db.videos.update_one(
             {"_id": ObjectId(video_id)},
-            {"$set": {"files.output_file": str(output_dir / filename)}}
+            {"$set": {"files.output_file": str(output_dir / filename),
+                      **checkpoint_fields("output", output_dir / filename, assembly_inputs(scenes))}}
         )
 
         print(f"[INFO] Video assembled successfully: {output_dir / filename}")
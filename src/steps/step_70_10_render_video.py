@@ -0,0 +1,103 @@
+"""
+This file provides the single-pass render mode: instead of cutting clips (step 40), muxing
+each clip with its narration (step 60) and concatenating the results (step 70), the final
+video is rendered straight from the source video and the narration files with one
+ffmpeg filtergraph and a single encode.
+"""
+import os
+from pathlib import Path
+from typing import Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from ..common.decorators.step_tracker import track_step
+from ..db.scene_queries import get_ordered_scenes, RENDER_FIELDS
+from ..db.scene_checkpoints import fingerprint_inputs, checkpoint_fields
+from ..common.services.media_executor import render_scenes_async
+
+
+def get_render_fps(video_record: dict) -> float:
+    """
+    Get the frame rate the output is rendered at: the source frame rate found by step 10.
+
+    Raises:
+        ValueError: If the video record has no frame rate
+    """
+    fps = (video_record.get('metadata') or {}).get('fps')
+    if not fps:
+        raise ValueError(f"No frame rate in the metadata of video {video_record.get('_id')}; "
+                         f"run step_10_00_preprocess_video first")
+    return fps
+
+
+def render_inputs(video_file_path: str, scenes: list, fps: float) -> str:
+    """Fingerprint of what determines the rendered video: source, frame rate, scene ranges and narrations"""
+    return fingerprint_inputs(video_file=video_file_path, fps=fps, scenes=[
+        (scene['time_start'], scene['time_end'],
+         scene.get('checkpoints', {}).get('audio', {}).get('inputs') or scene.get('audio_file_path'))
+        for scene in scenes
+    ])
+
+
+@track_step
+async def step_70_10_render_video(video_id: str,
+                                  db: AsyncIOMotorDatabase,
+                                  video_record: Optional[dict] = None) -> str:
+    """
+    Render the final video from the source video and scene narrations in a single encode.
+
+    Args:
+        video_id (str): MongoDB ObjectId of the video document as string
+        db (AsyncIOMotorDatabase): MongoDB database connection
+        video_record (Optional[dict]): Video document provided by the step tracker claim
+
+    Returns:
+        str: Video ID of the processed document
+
+    Raises:
+        ValueError: If scenes or narration audio are missing
+        RuntimeError: If the render fails
+    """
+    try:
+        # Fetch video record unless the step tracker already provided it
+        if video_record is None:
+            video_record = await db.videos.find_one({"_id": ObjectId(video_id)})
+        if not video_record:
+            raise ValueError(f"Video record not found for ID: {video_id}")
+
+        video_file_path = video_record['files']['video_file']
+        fps = get_render_fps(video_record)
+
+        # Setup output directory
+        base_dir = Path(os.getenv('BASE_DIR', ''))
+        output_dir = base_dir / f"{video_id}/output"
+        output_dir.mkdir(parents=True, exist_ok=True)
+        output_file_path = output_dir / f"{video_id}_output.mp4"
+
+        # Fetch all scenes for the video in scene order
+        scenes = await get_ordered_scenes(db, video_id, RENDER_FIELDS)
+
+        if not scenes:
+            raise ValueError(f"No scenes found for video ID: {video_id}")
+
+        for scene in scenes:
+            if not scene.get('audio_file_path'):
+                raise ValueError(f"No audio file found for scene {scene['_id']}")
+
+        print(f"[INFO] Rendering {len(scenes)} scenes in a single pass...")
+        await render_scenes_async(video_file_path, scenes, str(output_file_path), fps)
+
+        # Update video record with output file path; the checkpoint tells a refresh
+        # whether the output still matches the scenes
+        await db.videos.update_one(
+            {"_id": ObjectId(video_id)},
+            {"$set": {"files.output_file": str(output_file_path),
+                      **checkpoint_fields("output", output_file_path,
+                                          render_inputs(video_file_path, scenes, fps))}}
+        )
+
+        print(f"[INFO] Video rendered successfully: {output_file_path}")
+
+    except Exception as e:
+        raise RuntimeError(f"Failed to render video: {str(e)}") from e
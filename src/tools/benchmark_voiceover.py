@@ -0,0 +1,84 @@
+"""
+Benchmark the ffmpeg and moviepy voiceover renderers of media_manager.add_audio_to_video.
+
+Synthetic clips (test pattern video, sine-tone narration) are generated with ffmpeg's lavfi
+sources, covering both fitting cases: narration longer than the clip (first frame held) and
+shorter than the clip (clip sped up). Every clip is rendered once per renderer and the
+wall-clock times are reported.
+
+Usage:
+    python -m src.tools.benchmark_voiceover --clips 4 --duration 10 --size 1280x720 --fps 30
+"""
+
+import argparse
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from ..common.services.media_manager import FFMPEG_BINARY, add_audio_to_video, get_media_duration
+
+RENDERERS = ("ffmpeg", "moviepy")
+
+
+def _make_clip(path: Path, duration: float, size: str, fps: int) -> None:
+    """Generate a synthetic H.264 clip"""
+    subprocess.run([
+        FFMPEG_BINARY, '-y', '-hide_banner', '-loglevel', 'error',
+        '-f', 'lavfi', '-i', f"testsrc2=size={size}:rate={fps}:duration={duration}",
+        '-c:v', 'libx264', '-pix_fmt', 'yuv420p', str(path)
+    ], check=True)
+
+
+def _make_narration(path: Path, duration: float) -> None:
+    """Generate a synthetic MP3 narration"""
+    subprocess.run([
+        FFMPEG_BINARY, '-y', '-hide_banner', '-loglevel', 'error',
+        '-f', 'lavfi', '-i', f"sine=frequency=440:duration={duration}",
+        '-c:a', 'libmp3lame', str(path)
+    ], check=True)
+
+
+def benchmark(clips: int, duration: float, size: str, fps: int) -> None:
+    """Render every synthetic clip with each renderer and print the timings"""
+    with tempfile.TemporaryDirectory(prefix="voiceover_benchmark_") as work_dir:
+        work_dir = Path(work_dir)
+        cases = []
+        for index in range(clips):
+            # Alternate between narration longer and shorter than the clip
+            narration_duration = duration * (1.5 if index % 2 == 0 else 0.6)
+            clip_path = work_dir / f"clip_{index}.mp4"
+            narration_path = work_dir / f"narration_{index}.mp3"
+            _make_clip(clip_path, duration, size, fps)
+            _make_narration(narration_path, narration_duration)
+            cases.append((clip_path, narration_path))
+
+        totals = {}
+        for renderer in RENDERERS:
+            totals[renderer] = 0.0
+            for index, (clip_path, narration_path) in enumerate(cases):
+                output_path = work_dir / f"clip_{index}_{renderer}_voiceover.mp4"
+                start = time.perf_counter()
+                add_audio_to_video(str(clip_path), str(narration_path), str(output_path), renderer=renderer)
+                elapsed = time.perf_counter() - start
+                totals[renderer] += elapsed
+                print(f"{renderer:>8} clip {index}: {elapsed:6.2f}s "
+                      f"(narration {get_media_duration(str(narration_path)):.1f}s, "
+                      f"output {get_media_duration(str(output_path)):.1f}s)")
+
+        print(f"Total for {clips} clips of {duration:g}s at {size}, {fps} fps:")
+        for renderer in RENDERERS:
+            print(f"  {renderer:>8}: {totals[renderer]:6.2f}s")
+        if totals["ffmpeg"]:
+            print(f"  speedup: {totals['moviepy'] / totals['ffmpeg']:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark voiceover renderers on synthetic clips")
+    parser.add_argument("--clips", type=int, default=4, help="Number of synthetic clips")
+    parser.add_argument("--duration", type=float, default=10.0, help="Clip duration in seconds")
+    parser.add_argument("--size", default="1280x720", help="Clip resolution")
+    parser.add_argument("--fps", type=int, default=30, help="Clip frame rate")
+    args = parser.parse_args()
+
+    benchmark(args.clips, args.duration, args.size, args.fps)
@@ -0,0 +1,146 @@
+"""
+Local fake of the Rev AI async speech-to-text API for exercising transcription without network access.
+
+Implements the endpoints used by the pipeline:
+    POST /speechtotext/v1/jobs                   submit a job (the uploaded media is ignored); if the
+                                                 options carry a callback_url, the job details are
+                                                 POSTed there as {"job": ...} once it is transcribed
+    GET  /speechtotext/v1/jobs/{id}              job details; "transcribed" once the latency has passed
+    GET  /speechtotext/v1/jobs/{id}/transcript   a synthetic transcript in Rev AI JSON format
+
+Usage:
+    python -m src.tools.fake_rev_server --port 8090 --latency 5 --words 40
+
+Then point the pipeline at it:
+    REV_BASE_URL=http://127.0.0.1:8090/speechtotext/v1/
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+from ..common.utils.http_utils import read_request, build_response
+
+JOBS_PATH = "/speechtotext/v1/jobs"
+
+
+def _fake_transcript(job_id: str, words: int) -> dict:
+    """Build a transcript with one word every half second and a sentence every eight words"""
+    elements = []
+    for index in range(words):
+        ts = round(0.5 * index + 0.1, 3)
+        elements.append({"type": "text", "value": f"word{index}", "ts": ts,
+                         "end_ts": round(ts + 0.4, 3), "confidence": 0.95})
+        elements.append({"type": "punct", "value": "." if index % 8 == 7 else " "})
+        if index % 8 == 7:
+            elements.append({"type": "punct", "value": " "})
+    return {"monologues": [{"speaker": 0, "elements": elements}], "job_id": job_id}
+
+
+def _submitted_options(headers: dict, body: bytes) -> dict:
+    """Extract the JSON "options" part of a multipart job submission"""
+    content_type = headers.get("content-type", "")
+    if "boundary=" not in content_type:
+        return {}
+    boundary = content_type.split("boundary=", 1)[1].strip('"').encode()
+    for part in body.split(b"--" + boundary):
+        part_headers, _, part_body = part.partition(b"\r\n\r\n")
+        if b'name="options"' in part_headers:
+            try:
+                return json.loads(part_body.rstrip(b"\r\n"))
+            except ValueError:
+                return {}
+    return {}
+
+
+async def _post_callback(callback_url: str, payload: dict) -> None:
+    """POST a job-completion callback"""
+    url = urlsplit(callback_url)
+    body = json.dumps(payload).encode()
+    try:
+        reader, writer = await asyncio.open_connection(url.hostname, url.port or 80)
+        writer.write((f"POST {url.path or '/'} HTTP/1.1\r\n"
+                      f"Host: {url.netloc}\r\n"
+                      "Content-Type: application/json\r\n"
+                      f"Content-Length: {len(body)}\r\n"
+                      "Connection: close\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+        await reader.read()
+        writer.close()
+        print(f"[INFO] Delivered callback for job {payload['job']['id']}")
+    except OSError as e:
+        print(f"[WARNING] Callback delivery to {callback_url} failed: {str(e)}")
+
+
+def make_handler(jobs: dict, latency: float, words: int):
+    """Create a connection handler sharing the given job table"""
+    def job_json(job_id: str) -> dict:
+        job = jobs[job_id]
+        done = time.monotonic() - job["submitted"] >= latency
+        details = {"id": job_id, "created_on": job["created_on"], "name": "fake",
+                   "type": "async", "language": "en",
+                   "status": "transcribed" if done else "in_progress"}
+        if done:
+            details["completed_on"] = job["created_on"]
+            details["duration_seconds"] = words * 0.5
+        return details
+
+    async def deliver_callback(job_id: str, callback_url: str) -> None:
+        await asyncio.sleep(latency)
+        await _post_callback(callback_url, {"job": job_json(job_id)})
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                method, path, headers, body = await read_request(reader)
+                path = path.split("?", 1)[0].rstrip("/")
+                parts = path[len(JOBS_PATH):].strip("/").split("/") if path.startswith(JOBS_PATH) else None
+
+                if method == "POST" and parts == [""]:
+                    job_id = uuid.uuid4().hex[:12]
+                    jobs[job_id] = {"submitted": time.monotonic(),
+                                    "created_on": datetime.now(timezone.utc).isoformat()}
+                    callback_url = _submitted_options(headers, body).get("callback_url")
+                    if callback_url:
+                        asyncio.create_task(deliver_callback(job_id, callback_url))
+                    response = build_response("200 OK", json.dumps(job_json(job_id)).encode(), "application/json")
+                elif method == "GET" and parts and parts[0] in jobs and len(parts) == 1:
+                    response = build_response("200 OK", json.dumps(job_json(parts[0])).encode(), "application/json")
+                elif method == "GET" and parts and parts[0] in jobs and parts[1:] == ["transcript"]:
+                    response = build_response("200 OK",
+                                              json.dumps(_fake_transcript(parts[0], words)).encode(),
+                                              "application/vnd.rev.transcript.v1.0+json")
+                else:
+                    response = build_response("404 Not Found", b'{"title": "not found"}', "application/json")
+
+                writer.write(response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def serve(host: str, port: int, latency: float, words: int) -> None:
+    """Run the fake Rev AI server until cancelled"""
+    server = await asyncio.start_server(make_handler({}, latency, words), host, port)
+    print(f"[INFO] Fake Rev AI server listening on http://{host}:{port}{JOBS_PATH}")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake Rev AI speech-to-text server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", type=float, default=5.0, help="Seconds until a job is transcribed")
+    parser.add_argument("--words", type=int, default=40, help="Number of words in each transcript")
+    args = parser.parse_args()
+
+    asyncio.run(serve(args.host, args.port, args.latency, args.words))
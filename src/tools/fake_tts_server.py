@@ -0,0 +1,69 @@
+"""
+Local fake of the OpenAI speech endpoint for exercising the TTS engine without network access.
+
+Responds to POST /v1/audio/speech with a short dummy MP3 payload after an injected latency,
+and answers a configurable fraction of requests with 429 to exercise the adaptive backoff.
+
+Usage:
+    python -m src.tools.fake_tts_server --port 8089 --latency 1.5 --jitter 0.5 --rate-limit-ratio 0.1
+
+Then point the pipeline at it:
+    OPENAI_BASE_URL=http://127.0.0.1:8089/v1
+"""
+
+import argparse
+import asyncio
+import random
+
+from ..common.utils.http_utils import read_request, build_response
+
+# Single silent MPEG-1 Layer III frame
+DUMMY_MP3 = bytes.fromhex("fffb9004") + bytes(413)
+
+
+def make_handler(latency: float, jitter: float, rate_limit_ratio: float):
+    """Create a connection handler with the given latency and 429 injection settings"""
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                method, path, _, _ = await read_request(reader)
+
+                if method != "POST" or not path.endswith("/audio/speech"):
+                    writer.write(build_response("404 Not Found", b'{"error": "not found"}', "application/json"))
+                elif random.random() < rate_limit_ratio:
+                    writer.write(build_response("429 Too Many Requests",
+                                                b'{"error": {"message": "rate limited", "type": "requests"}}',
+                                                "application/json",
+                                                "Retry-After: 1\r\n"))
+                else:
+                    await asyncio.sleep(max(0.0, latency + random.uniform(-jitter, jitter)))
+                    writer.write(build_response("200 OK", DUMMY_MP3, "audio/mpeg"))
+
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def serve(host: str, port: int, latency: float, jitter: float, rate_limit_ratio: float) -> None:
+    """Run the fake TTS server until cancelled"""
+    server = await asyncio.start_server(make_handler(latency, jitter, rate_limit_ratio), host, port)
+    print(f"[INFO] Fake TTS server listening on http://{host}:{port}/v1")
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fake OpenAI TTS server with injected latency")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--latency", type=float, default=1.0, help="Mean response latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform latency jitter in seconds")
+    parser.add_argument("--rate-limit-ratio", type=float, default=0.0,
+                        help="Fraction of requests answered with 429")
+    args = parser.parse_args()
+
+    asyncio.run(serve(args.host, args.port, args.latency, args.jitter, args.rate_limit_ratio))
@@ -0,0 +1,74 @@
+"""
+Report how much the compact transcript encoding shrinks the scene-generation prompt.
+
+For every given video, compares the old prompt input (Python repr of the Rev AI JSON) with
+the compact sentence-level encoding, with and without word-level detail.
+
+Usage:
+    python -m src.tools.measure_transcript_tokens <video_id> [<video_id> ...] [--gemini]
+
+Token counts are estimated from character counts unless --gemini is passed, in which case
+they are counted with the Gemini tokenizer (requires GEMINI_API_KEY).
+"""
+
+import argparse
+import asyncio
+import os
+
+from bson import ObjectId
+from dotenv import load_dotenv
+
+from ..common.services.content_generation_manager import DEFAULT_MODEL
+from ..common.utils.transcript_utils import compact_transcript, measure_compaction
+from ..db.mongo_utils import get_mongodb
+
+
+def _count_gemini_tokens(texts: dict) -> dict:
+    """Count tokens of each text with the Gemini tokenizer"""
+    import google.generativeai as genai
+
+    load_dotenv()
+    genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
+    model = genai.GenerativeModel(model_name=DEFAULT_MODEL)
+    return {name: model.count_tokens(text).total_tokens for name, text in texts.items()}
+
+
+async def measure(video_ids: list, use_gemini: bool) -> None:
+    """Print prompt input sizes for each video"""
+    mongodb = await get_mongodb()
+    try:
+        for video_id in video_ids:
+            record = await mongodb.db.transcriptions.find_one(
+                {"video_id": ObjectId(video_id)}, {"transcription": 1})
+            if not record:
+                print(f"[WARNING] No transcription found for video {video_id}")
+                continue
+
+            transcription = record['transcription']
+            measurements = measure_compaction(transcription)
+            if use_gemini:
+                tokens = await asyncio.to_thread(_count_gemini_tokens, {
+                    "raw": str(transcription),
+                    "compact": compact_transcript(transcription),
+                    "compact_words": compact_transcript(transcription, word_level=True),
+                })
+                for name, count in tokens.items():
+                    measurements[f"{name}_tokens"] = count
+
+            raw_tokens = measurements['raw_tokens'] or 1
+            print(f"Video {video_id}:")
+            for name in ("raw", "compact", "compact_words"):
+                tokens = measurements[f"{name}_tokens"]
+                print(f"  {name:<14} {measurements[f'{name}_chars']:>10} chars {tokens:>9} tokens "
+                      f"({100 * (1 - tokens / raw_tokens):5.1f}% saved)")
+    finally:
+        await mongodb.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure token savings of the compact transcript encoding")
+    parser.add_argument("video_ids", nargs="+")
+    parser.add_argument("--gemini", action="store_true", help="Count tokens with the Gemini tokenizer")
+    args = parser.parse_args()
+
+    asyncio.run(measure(args.video_ids, args.gemini))